@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Резервные копии базы записей (storage.BookingStore) без остановки бота.
+
+Снимок — SQLite backup API на отдельном соединении только для чтения, по pages_per_step страниц за шаг
+с паузой step_pause между шагами (в потоке: цикл событий не ждёт, а писатель бота между шагами пишет
+как обычно). Всё копирование идёт внутри одной читающей транзакции: в режиме WAL она видит базу на
+момент начала — копия согласована на этот момент, и запись в базу во время копирования не заставляет
+backup начинать заново. В той же транзакции считаются строки таблиц — с ними сверяется копия.
+
+Копия сжимается gzip (<база>-ГГГГММДД-ЧЧММСС.db.gz в каталоге backup_dir), проверяется пробным
+восстановлением (распаковать во временный файл, PRAGMA quick_check, те же числа строк; verify из командной
+строки и restore — полный integrity_check) и только после этого занимает место в ротации: хранятся keep
+последних, старые удаляются. Сжатие и распаковка — кусками с той же паузой: на одном ядре копия не
+отнимает процессор у обработчиков (замер — benchmarks/bench_backup.py).
+
+Фоновый сервис run_scheduler снимает копию раз в interval секунд (отсчёт — от последней копии на диске,
+перезапуск бота расписание не сбивает); в боте — команда админа /backup. Из командной строки:
+    python backup.py create bookings.db -d backups
+    python backup.py verify backups/bookings-20261019-030000.db.gz
+    python backup.py restore backups/bookings-20261019-030000.db.gz bookings.db   # бот остановлен
+"""
+
+import argparse
+import asyncio
+import datetime
+import glob
+import gzip
+import logging
+import os
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".db.gz"
+# Размер куска при сжатии и распаковке; между кусками сжатия — та же пауза, что между шагами копии
+_CHUNK = 256 * 1024
+
+
+class BackupError(Exception):
+    """Копию не удалось снять или она не прошла проверку."""
+
+
+class BackupResult(NamedTuple):
+    path: str
+    size: int  # байт в сжатом виде
+    pages: int  # страниц базы в копии
+    steps: int  # шагов backup API
+    rows: dict  # таблица → строк (на момент снимка, совпадает с проверкой)
+    seconds: float
+
+
+class BackupManager:
+    """Копии одной базы (клуба). Снимки идут по одному: второй вызов ждёт первый."""
+
+    def __init__(self, db_path: str, backup_dir: str, keep: int = 28, interval: float = 6 * 60 * 60.0,
+                 pages_per_step: int = 64, step_pause: float = 0.005):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.interval = interval
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+        self.last = None  # BackupResult последней копии этого процесса
+        self._name = pathlib.Path(db_path).name.removesuffix(".db")
+        self._lock = asyncio.Lock()
+        self._abort = threading.Event()
+        self._running = None  # поток текущей копии (asyncio.Future)
+
+    def list(self) -> list:
+        """Копии этой базы на диске, от новой к старой."""
+        pattern = os.path.join(glob.escape(self.backup_dir), f"{glob.escape(self._name)}-*{SUFFIX}")
+        return sorted(glob.glob(pattern), reverse=True)
+
+    async def snapshot(self) -> BackupResult:
+        async with self._lock:
+            # Отмена сервиса не бросает поток на полпути: его дожидается abort_on_stop
+            self._running = asyncio.ensure_future(asyncio.to_thread(self.snapshot_sync))
+            self.last = await asyncio.shield(self._running)
+            return self.last
+
+    def snapshot_sync(self) -> BackupResult:
+        """Снять, сжать, проверить копию и удалить лишние старые. Ошибка — BackupError."""
+        started = time.perf_counter()
+        os.makedirs(self.backup_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.backup_dir, f"{self._name}-{stamp}{SUFFIX}")
+        fd, raw = tempfile.mkstemp(suffix=".db", dir=self.backup_dir)
+        os.close(fd)
+        try:
+            pages, steps, rows = self._copy(raw)
+            _compress(raw, path + ".tmp", self.step_pause)
+            try:
+                verify(path + ".tmp", rows, self.step_pause, full=False)
+            except BackupError:
+                os.remove(path + ".tmp")
+                raise
+            os.replace(path + ".tmp", path)
+        finally:
+            os.remove(raw)
+        self._rotate()
+        result = BackupResult(path, os.path.getsize(path), pages, steps, rows, time.perf_counter() - started)
+        logger.info("Копия базы %s: %s, %d страниц за %d шагов, %.1f с",
+                    self.db_path, path, pages, steps, result.seconds)
+        return result
+
+    def _copy(self, dest_path: str) -> tuple:
+        """Копия базы в dest_path по шагам одной читающей транзакции → (страниц, шагов, строк по таблицам)."""
+        source = sqlite3.connect(pathlib.Path(self.db_path).absolute().as_uri() + "?mode=ro", uri=True)
+        dest = sqlite3.connect(dest_path)
+        progress = []
+
+        def on_step(status, remaining, total):
+            progress.append(total)
+            if self._abort.is_set():
+                raise BackupError("остановка бота")
+            # Пауза между шагами (sleep= у backup() ждёт только при занятой базе): процессор и GIL — боту
+            if remaining:
+                time.sleep(self.step_pause)
+
+        try:
+            # Транзакция держит снимок базы (WAL) до конца копирования
+            source.execute("BEGIN")
+            rows = _count_rows(source)
+            try:
+                source.backup(dest, pages=self.pages_per_step, progress=on_step)
+            except sqlite3.Error as e:
+                raise BackupError(f"не удалось скопировать {self.db_path}: {e}") from e
+            source.rollback()
+        finally:
+            dest.close()
+            source.close()
+        return (progress[-1] if progress else 0), len(progress), rows
+
+    def _rotate(self) -> None:
+        for old in self.list()[self.keep:]:
+            try:
+                os.remove(old)
+            except OSError as e:
+                logger.warning("Не удалось удалить старую копию %s: %s", old, e)
+
+    # --- Фоновый сервис (BotApplication.services) ---
+    def next_due(self) -> float:
+        """Секунд до следующей копии: interval от последней копии на диске (нет копий — сразу)."""
+        copies = self.list()
+        if not copies:
+            return 0.0
+        return max(os.path.getmtime(copies[0]) + self.interval - time.time(), 0.0)
+
+    async def run_scheduler(self, app) -> None:
+        while True:
+            await asyncio.sleep(self.next_due())
+            try:
+                await self.snapshot()
+            except (BackupError, OSError, sqlite3.Error) as e:
+                logger.warning("Не удалось снять копию базы %s: %s", self.db_path, e)
+                await asyncio.sleep(min(self.interval, 600.0))
+
+    async def abort_on_stop(self, app) -> None:
+        """Хук остановки: прервать копию, идущую в потоке (иначе выход ждёт её конца)."""
+        self._abort.set()
+        if self._running is not None and not self._running.done():
+            try:
+                await self._running
+            except BackupError:
+                pass
+
+
+def _count_rows(conn) -> dict:
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    return {table: conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0] for table in tables}
+
+
+def _compress(src: str, dest: str, pause: float = 0.0) -> None:
+    # Уровень 1: страницы SQLite сжимаются почти так же, как на 6, а быстрее в разы
+    with open(src, "rb") as f_in, gzip.open(dest, "wb", compresslevel=1) as f_out:
+        while chunk := f_in.read(_CHUNK):
+            f_out.write(chunk)
+            if pause:
+                time.sleep(pause)
+
+
+def _decompress(src: str, dest: str, pause: float = 0.0) -> None:
+    try:
+        with gzip.open(src, "rb") as f_in, open(dest, "wb") as f_out:
+            while chunk := f_in.read(_CHUNK):
+                f_out.write(chunk)
+                if pause:
+                    time.sleep(pause)
+    except (OSError, EOFError) as e:
+        raise BackupError(f"{src}: повреждённый архив ({e})") from e
+
+
+def verify(path: str, expected_rows: dict = None, pause: float = 0.0, full: bool = True) -> dict:
+    """Пробное восстановление: распаковать во временный файл, проверить структуру и строки по таблицам.
+
+    expected_rows — сверить числа строк (снятые в транзакции копирования); pause — между кусками распаковки.
+    full — integrity_check (ещё и индексы против таблиц), иначе quick_check: на порядок быстрее, его хватает
+    свежей копии (целостность архива и так проверяет CRC gzip). Ошибка — BackupError.
+    Возвращает таблица → строк.
+    """
+    fd, raw = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        _decompress(path, raw, pause)
+        conn = sqlite3.connect(pathlib.Path(raw).absolute().as_uri() + "?mode=ro", uri=True)
+        try:
+            problems = [row[0] for row in conn.execute("PRAGMA integrity_check" if full else "PRAGMA quick_check")]
+            rows = _count_rows(conn)
+        except sqlite3.DatabaseError as e:
+            raise BackupError(f"{path}: не база SQLite ({e})") from e
+        finally:
+            conn.close()
+    finally:
+        os.remove(raw)
+    if problems != ["ok"]:
+        raise BackupError(f"{path}: повреждена — {'; '.join(problems[:5])}")
+    if expected_rows is not None and rows != expected_rows:
+        raise BackupError(f"{path}: строки в копии {rows}, в базе {expected_rows}")
+    return rows
+
+
+def restore(path: str, db_path: str) -> dict:
+    """Восстановить базу из копии (бот должен быть остановлен). Копия сначала проверяется."""
+    rows = verify(path)
+    tmp = db_path + ".restore"
+    _decompress(path, tmp)
+    # Журнал WAL старой базы к восстановленной не относится
+    for leftover in (db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    os.replace(tmp, db_path)
+    return rows
+
+
+# --- Командная строка ---
+def _format_rows(rows: dict) -> str:
+    return ", ".join(f"{table}: {count}" for table, count in rows.items())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Резервные копии базы записей")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="снять копию работающей базы")
+    create.add_argument("db", help="файл базы записей (config.BOOKINGS_DB, у клубов — bookings.<клуб>.db)")
+    create.add_argument("-d", "--dir", default="backups", help="каталог копий (config.BACKUP_DIR)")
+    create.add_argument("--keep", type=int, default=28, help="сколько последних копий хранить")
+    check = commands.add_parser("verify", help="проверить копию пробным восстановлением")
+    check.add_argument("backup", help="файл копии .db.gz")
+    back = commands.add_parser("restore", help="восстановить базу из копии (бот остановлен)")
+    back.add_argument("backup", help="файл копии .db.gz")
+    back.add_argument("db", help="куда восстановить (файл базы будет заменён)")
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "create":
+            result = BackupManager(args.db, args.dir, keep=args.keep).snapshot_sync()
+            print(f"{result.path}: {result.size} байт, {_format_rows(result.rows)}", file=sys.stderr)
+        elif args.command == "verify":
+            print(f"{args.backup}: ok, {_format_rows(verify(args.backup))}", file=sys.stderr)
+        else:
+            rows = restore(args.backup, args.db)
+            print(f"{args.db} восстановлена: {_format_rows(rows)}", file=sys.stderr)
+    except BackupError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк резервной копии на ходу: насколько медленнее отвечают обработчики, пока идёт копия базы.
+
+База записей заполняется --rows строками, затем через настоящий Application (harness) идут апдейты, которые
+пишут в базу и читают из неё: подтверждение записи (reg_confirm — транзакция писателя) и /mybookings.
+Сначала — без копии, потом — пока backup.BackupManager снимает копию той же базы (копия в потоке,
+шагами по BACKUP_PAGES_PER_STEP страниц) — для каждого размера шага из --pages; -1 — вся база одним
+шагом, для сравнения. Время апдейта — медиана, p95, p99 и максимум; рост p95 на шаге по умолчанию
+(config.BACKUP_PAGES_PER_STEP) больше --max-slowdown раз — код выхода 1.
+
+Запуск:
+    python benchmarks/bench_backup.py
+    python benchmarks/bench_backup.py --rows 500000 --pages 16,64,256,-1
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from harness import build_app, callback, message
+
+import backup  # noqa: E402
+import settings  # noqa: E402
+import storage  # noqa: E402
+
+_REGISTER = [
+    (callback, "reg:day:mon"),
+    (callback, "reg:slot:mon_run"),
+    (callback, "reg:trainer:dasha"),
+    (callback, "reg:level:newbie"),
+    (message, "Иван +375 29 000-00-00"),
+]
+
+
+def _fill(db_path: str, rows: int) -> None:
+    """Записи разных пользователей за последний год — одной транзакцией, мимо бота."""
+    rng = random.Random(1)
+    today = datetime.date.today()
+    slots = [("mon", "mon_run", "19:00–20:30"), ("wed", "wed_gym", "19:00–20:30"), ("sat", "sat_long", "09:00–11:00")]
+    columns = storage.Booking._fields
+
+    def booking(i):
+        day, slot_id, time_range = rng.choice(slots)
+        date = (today - datetime.timedelta(days=rng.randrange(365))).isoformat()
+        return (f"{date}T10:00:00", date, day, slot_id, time_range, "Даша", "Новичок", "Стадион",
+                100000 + i % 5000, f"user{i % 5000}", f"Пользователь {i % 5000}", "+375 29 000-00-00", "ru")
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            f"INSERT INTO bookings ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            (booking(i) for i in range(rows)),
+        )
+    conn.close()
+
+
+async def _one_update(app, kind: str) -> float:
+    """Подготовка (шаги записи) не в замере; возвращает время самого апдейта, ms."""
+    if kind == "reg_confirm":
+        await app.process_update(message(app, "/register"))
+        for make, data in _REGISTER:
+            await app.process_update(make(app, data))
+        update = callback(app, "reg:confirm:yes")
+    else:
+        update = message(app, "/mybookings")
+    start = time.perf_counter()
+    await app.process_update(update)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _run_updates(app, runs: int = 0, until=None) -> list:
+    """runs апдейтов (поровну записи и чтения) или, с until, — пока не завершится задача until."""
+    timings = []
+    while (until is not None and not until.done()) or len(timings) < runs:
+        timings.append(await _one_update(app, "reg_confirm" if len(timings) % 2 == 0 else "mybookings"))
+        app.bot.request.calls.clear()
+    return timings
+
+
+def _stats(timings: list) -> dict:
+    timings = sorted(timings)
+
+    def pct(p):
+        return timings[min(int(len(timings) * p), len(timings) - 1)]
+
+    return {"n": len(timings), "median": pct(0.5), "p95": pct(0.95), "p99": pct(0.99), "max": timings[-1]}
+
+
+def _print_row(label: str, stats: dict, extra: str = "") -> None:
+    print(f"{label:<22} {stats['n']:>6} {stats['median']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f}"
+          f" {stats['max']:>8.2f}  {extra}")
+
+
+async def main() -> int:
+    defaults = settings.Settings()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="записей в базе перед замером")
+    parser.add_argument("--runs", type=int, default=300, help="апдейтов в замере без копии")
+    parser.add_argument("--pages", default=f"16,{defaults.BACKUP_PAGES_PER_STEP},256,-1",
+                        help="размеры шага копии через запятую (-1 — вся база за шаг)")
+    parser.add_argument("--pause", type=float, default=defaults.BACKUP_STEP_PAUSE_SECONDS,
+                        help="пауза между шагами копии, с")
+    parser.add_argument("--max-slowdown", type=float, default=2.0,
+                        help="допустимый рост p95 во время копии на шаге по умолчанию (во сколько раз)")
+    args = parser.parse_args()
+    pages_list = [int(value) for value in args.pages.split(",")]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = build_app(data_dir)
+        store = app.bot_data["bookings"]
+        _fill(store.path, args.rows)
+        size_mb = os.path.getsize(store.path) / 1024 / 1024
+        print(f"База: {args.rows} записей, {size_mb:.1f} МБ; шаг копии — страниц по 4 КБ, пауза {args.pause * 1000:.0f} ms\n")
+        print(f"{'Режим':<22} {'апд.':>6} {'медиана':>8} {'p95':>8} {'p99':>8} {'макс':>8}  (ms)")
+        async with app:
+            await _run_updates(app, runs=20)  # разогрев
+            idle = _stats(await _run_updates(app, runs=args.runs))
+            _print_row("без копии", idle)
+            slowdown = None
+            for pages in pages_list:
+                manager = backup.BackupManager(
+                    store.path, os.path.join(data_dir, f"backups{pages}"), keep=1,
+                    pages_per_step=pages, step_pause=args.pause,
+                )
+                task = asyncio.ensure_future(manager.snapshot())
+                during = _stats(await _run_updates(app, until=task))
+                result = task.result()
+                label = "копия, вся база" if pages < 0 else f"копия, шаг {pages}"
+                _print_row(label, during, f"копия {result.seconds:.2f} с, {result.steps} шагов, "
+                                          f"{result.size / 1024 / 1024:.1f} МБ")
+                if pages == defaults.BACKUP_PAGES_PER_STEP:
+                    slowdown = during["p95"] / idle["p95"]
+
+    if slowdown is None:
+        return 0
+    if slowdown > args.max_slowdown:
+        print(f"\np95 во время копии в {slowdown:.1f} раза больше, чем без неё (допустимо {args.max_slowdown}).")
+        return 1
+    print(f"\np95 во время копии (шаг {defaults.BACKUP_PAGES_PER_STEP}): ×{slowdown:.2f} к обычному.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк: задержка одного нажатия кнопки — answer() и правка последовательно vs answer_and_edit.
+Сеть имитируется: каждый запрос к Bot API «стоит» --delay секунд (по умолчанию 100 мс).
+
+Запуск: python benchmarks/bench_callback_reply.py [--delay 0.1] [--taps 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_cache import render_cache  # noqa: E402
+from replies import answer_and_edit  # noqa: E402
+
+
+class _Chat:
+    def __init__(self, chat_id):
+        self.id = chat_id
+
+
+class _Message:
+    def __init__(self, chat_id, message_id):
+        self.chat = _Chat(chat_id)
+        self.message_id = message_id
+
+
+class _Bot:
+    id = 1
+
+
+class FakeQuery:
+    """CallbackQuery с искусственной сетевой задержкой на answer и edit_message_text."""
+
+    def __init__(self, delay: float, message_id: int):
+        self.delay = delay
+        self.data = "menu:main"
+        self.message = _Message(1, message_id)
+        self.inline_message_id = None
+
+    def get_bot(self):
+        return _Bot()
+
+    async def answer(self, text=None):
+        await asyncio.sleep(self.delay)
+        return True
+
+    async def edit_message_text(self, text, reply_markup=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return True
+
+
+async def _sequential(query, text):
+    await query.answer()
+    await query.edit_message_text(text)
+
+
+async def _measure(name, fn, delay, taps):
+    timings = []
+    for i in range(taps):
+        render_cache.clear()
+        query = FakeQuery(delay, message_id=i)
+        start = time.perf_counter()
+        await fn(query, f"Экран {i}")
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"{name:<24} median {median * 1000:7.1f} ms   max {timings[-1] * 1000:7.1f} ms")
+    return median
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.1, help="задержка одного запроса, сек")
+    parser.add_argument("--taps", type=int, default=20, help="число нажатий")
+    args = parser.parse_args()
+    print(f"Задержка сети: {args.delay * 1000:.0f} ms, нажатий: {args.taps}")
+    before = await _measure("answer → edit", _sequential, args.delay, args.taps)
+    after = await _measure("answer_and_edit", answer_and_edit, args.delay, args.taps)
+    print(f"Экономия на нажатие: {(before - after) * 1000:.1f} ms ({(1 - after / before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк обработчиков bot.py: время и память на один апдейт, сравнение с сохранённым базовым уровнем.
+
+Каждый случай — апдейт, прогоняемый через настоящий Application (прослойки, диалоги, хранилище записей)
+с Bot API без сети (harness.RecordingRequest); подготовка (например, шаги записи до reg_confirm) в замер
+не входит. Прогоны идут --rounds сериями; время — медиана и p95 лучшей серии (фоновые задержки машины
+задевают отдельные серии, а не код — по лучшей сравнивать устойчивее). С базой время сравнивается
+с поправкой на эталонную нагрузку (_calibrate), замеренную до и после каждого случая: так сравнение
+не зависит от того, насколько быстра и загружена машина (или виртуалка) именно сейчас. Случай с
+регрессией перемеряется (--retries): настоящая регрессия повторяется, случайная задержка — нет. Память — пик выделений за один прогон (tracemalloc,
+отдельным проходом, чтобы трассировка не искажала время).
+
+Запуск:
+    python benchmarks/bench_handlers.py --save          # замерить и сохранить базовый уровень
+    python benchmarks/bench_handlers.py                 # сравнить; код выхода 1 — регрессия или нет базы
+    python benchmarks/bench_handlers.py -k reg_ --runs 500 --threshold 0.3
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from harness import bot, build_app, callback, message
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_handlers.json")
+_CALIBRATION_KEY = "_calibration_us"
+
+
+# --- Случаи: имя → (подготовка, замер); обе — корутины от app ---
+async def _register_until(app, stage: str) -> None:
+    steps = [
+        ("day", callback, "reg:day:mon"),
+        ("slot", callback, "reg:slot:mon_run"),
+        ("trainer", callback, "reg:trainer:dasha"),
+        ("level", callback, "reg:level:newbie"),
+        ("contact", message, "Иван +375 29 000-00-00"),
+    ]
+    await app.process_update(message(app, "/register"))
+    for name, make, data in steps:
+        if name == stage:
+            return
+        await app.process_update(make(app, data))
+
+
+def _update_case(make, data, stage=None):
+    async def setup(app):
+        if stage is not None:
+            await _register_until(app, stage)
+
+    async def run(app):
+        await app.process_update(make(app, data))
+
+    return setup, run
+
+
+_CHECK_REG = {"day": "mon", "slot_id": "mon_run", "trainer": "dasha", "level": "newbie", "contact": "Иван +375 29 000"}
+_check_user = None
+
+
+async def _check_message_setup(app):
+    global _check_user
+    if _check_user is None:
+        _check_user = message(app, "x").effective_user
+
+
+async def _check_message(app):
+    bot._build_check_message(_CHECK_REG, _check_user, app.bot_data["i18n"].default)
+
+
+CASES = {
+    "cmd_start": _update_case(message, "/start"),
+    "cmd_start[ref_site]": _update_case(message, "/start ref_site"),
+    "handle_text[trigger]": _update_case(message, "цена"),
+    "handle_text[unknown]": _update_case(message, "абракадабра"),
+    "menu_main": _update_case(callback, "menu:main"),
+    "menu_schedule": _update_case(callback, "menu:schedule"),
+    "menu_address": _update_case(callback, "menu:address"),
+    "address_transport": _update_case(callback, "addr:car"),
+    "location_show": _update_case(callback, "loc:run"),
+    "menu_form": _update_case(callback, "menu:form"),
+    "form_place": _update_case(callback, "form:street"),
+    "form_weather": _update_case(callback, "form:weather:cold"),
+    "price_maksim_dasha": _update_case(callback, "price:maksim_dasha"),
+    "question_how_type": _update_case(callback, "how:run"),
+    "reg_choose_day": _update_case(callback, "reg:day:mon", stage="day"),
+    "reg_choose_slot": _update_case(callback, "reg:slot:mon_run", stage="slot"),
+    "reg_choose_level": _update_case(callback, "reg:level:newbie", stage="level"),
+    "reg_contact": _update_case(message, "Иван +375 29 000-00-00", stage="contact"),
+    "reg_confirm": _update_case(callback, "reg:confirm:yes", stage="confirm"),
+    "cmd_balance": _update_case(message, "/balance"),
+    "cmd_mybookings": _update_case(message, "/mybookings"),
+    "_build_check_message": (_check_message_setup, _check_message),
+}
+
+
+# --- Замер ---
+def _calibrate(rounds: int = 5) -> float:
+    """Эталонная нагрузка (чистый Python, словари и строки — как в обработчиках), мкс; лучшая из rounds.
+
+    Скорость машины и её загрузка меняются от запуска к запуску; время случаев сравнивается с базой
+    в единицах эталона, а не в микросекундах.
+    """
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        data = {}
+        for i in range(20000):
+            key = f"user:{i % 512}"
+            data[key] = data.get(key, 0) + len(key)
+        "".join(sorted(data))
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / 1000
+
+
+async def _measure(app, setup, run, runs: int, warmup: int, rounds: int) -> dict:
+    calls = app.bot.request.calls
+    for _ in range(warmup):
+        await setup(app)
+        await run(app)
+    best = None
+    for _ in range(rounds):
+        timings = []
+        gc.disable()
+        try:
+            for _ in range(max(runs // rounds, 1)):
+                await setup(app)
+                calls.clear()
+                start = time.perf_counter_ns()
+                await run(app)
+                timings.append(time.perf_counter_ns() - start)
+        finally:
+            gc.enable()
+        timings.sort()
+        if best is None or timings[len(timings) // 2] < best[len(best) // 2]:
+            best = timings
+    # Память — отдельным проходом: tracemalloc замедляет выполнение в разы
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(max(runs // 10, 5)):
+            await setup(app)
+            calls.clear()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await run(app)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    peaks.sort()
+    return {
+        "median_us": round(best[len(best) // 2] / 1000, 1),
+        "p95_us": round(best[int(len(best) * 0.95)] / 1000, 1),
+        "peak_kib": round(peaks[len(peaks) // 2] / 1024, 1),
+    }
+
+
+def _compare(name: str, result: dict, baseline: dict, scale: float, threshold: float, mem_threshold: float) -> list:
+    """Регрессии случая: [(метрика, было, стало)]. Время — по медиане (база × scale — поправка на машину),
+    память — по пику."""
+    regressions = []
+    base = baseline.get(name)
+    if base is None:
+        return regressions
+    if result["median_us"] > base["median_us"] * scale * (1 + threshold):
+        regressions.append(("median_us", round(base["median_us"] * scale, 1), result["median_us"]))
+    if result["peak_kib"] > base["peak_kib"] * (1 + mem_threshold):
+        regressions.append(("peak_kib", base["peak_kib"], result["peak_kib"]))
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=300, help="прогонов на случай (всего, по всем сериям)")
+    parser.add_argument("--rounds", type=int, default=5, help="серий прогонов; сравнивается лучшая")
+    parser.add_argument("--warmup", type=int, default=20, help="прогонов для разогрева (не считаются)")
+    parser.add_argument("-k", dest="pattern", default="", help="только случаи, в имени которых есть подстрока")
+    parser.add_argument("--baseline", default=BASELINE, help="файл базового уровня (JSON)")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как базовый уровень")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимый рост медианы времени (0.25 = +25%%)")
+    parser.add_argument("--retries", type=int, default=2, help="сколько раз перемерить случай с регрессией")
+    parser.add_argument("--mem-threshold", type=float, default=0.10, help="допустимый рост пика памяти")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif not args.save:
+        # Без базы сравнивать не с чем — «регрессий нет» здесь было бы неправдой
+        print(f"Базового уровня нет ({args.baseline}) — запустите с --save.")
+        return 1
+    base_calibration = baseline.pop(_CALIBRATION_KEY, None) or _calibrate()
+    results, failed = {}, []
+    print(f"{'Случай':<24} {'медиана':>10} {'p95':>10} {'память':>10} {'эталон':>7}   база")
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = build_app(data_dir)
+        async with app:
+            for name, (setup, run) in CASES.items():
+                if args.pattern not in name:
+                    continue
+                for _attempt in range(args.retries + 1):
+                    calibration = _calibrate()
+                    result = await _measure(app, setup, run, args.runs, args.warmup, args.rounds)
+                    scale = min(calibration, _calibrate()) / base_calibration
+                    regressions = _compare(name, result, baseline, scale, args.threshold, args.mem_threshold)
+                    if not regressions or args.save:
+                        break
+                # В базу — время в масштабе её эталона (сравнимо между запусками)
+                results[name] = dict(
+                    result, median_us=round(result["median_us"] / scale, 1), p95_us=round(result["p95_us"] / scale, 1)
+                )
+                base = baseline.get(name)
+                note = f"{base['median_us'] * scale:.0f} µs / {base['peak_kib']:.0f} KiB" if base else "—"
+                if regressions:
+                    failed.append(name)
+                    note += "   РЕГРЕССИЯ: " + ", ".join(f"{m} {old} → {new}" for m, old, new in regressions)
+                print(
+                    f"{name:<24} {result['median_us']:>7.0f} µs {result['p95_us']:>7.0f} µs "
+                    f"{result['peak_kib']:>6.1f} KiB  ×{scale:.2f}   {note}"
+                )
+
+    if args.save:
+        baseline.update(results)
+        baseline[_CALIBRATION_KEY] = base_calibration
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"Базовый уровень сохранён: {args.baseline}")
+        return 0
+    if failed:
+        print(f"Регрессии ({len(failed)}): {', '.join(failed)}")
+        return 1
+    print("Регрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк: пропускная способность отправок при разных размерах пула соединений.
+
+Поднимает локальный «фейковый Bot API» (HTTP/1.1 с keep-alive, каждый ответ задерживается на --latency)
+и шлёт пачку одновременных sendMessage через http_pool.build_request. Параллельно, если задано --polling,
+одно соединение занято «long polling» — как get_updates в общем пуле по умолчанию.
+
+Запуск: python benchmarks/bench_http_pool.py [--requests 100] [--latency 0.1] [--pools 8,16,32,64]
+По умолчанию — условия, по которым выбран HTTP_POOL_SIZE = 32. Общий пул с long polling:
+    python benchmarks/bench_http_pool.py --pools 2 --polling
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_pool import build_request  # noqa: E402
+
+_RESPONSE_BODY = json.dumps({"ok": True, "result": True}).encode()
+
+
+async def _serve_client(reader, writer, latency: float):
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            # getUpdates «висит» дольше — имитация long polling
+            await asyncio.sleep(latency * 20 if b"/getUpdates" in head else latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(_RESPONSE_BODY)}\r\nConnection: keep-alive\r\n\r\n".encode()
+                + _RESPONSE_BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+        # Клиент закрыл соединение или сервер останавливается в конце бенчмарка
+        pass
+    finally:
+        writer.close()
+
+
+async def _run_case(base_url: str, pool_size: int, total: int, polling: bool) -> float:
+    request = build_request(pool_size=pool_size, read_timeout=30.0, pool_timeout=30.0)
+    await request.initialize()
+    stop = asyncio.Event()
+
+    async def long_poll():
+        while not stop.is_set():
+            await request.post(f"{base_url}/getUpdates")
+
+    poller = asyncio.create_task(long_poll()) if polling else None
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(request.post(f"{base_url}/sendMessage") for _ in range(total)))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        if poller:
+            poller.cancel()
+            await asyncio.gather(poller, return_exceptions=True)
+        await request.shutdown()
+    return total / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100, help="число одновременных sendMessage")
+    parser.add_argument("--latency", type=float, default=0.1, help="задержка ответа фейкового API, сек")
+    parser.add_argument("--pools", default="8,16,32,64", help="размеры пула через запятую")
+    parser.add_argument("--polling", action="store_true", help="держать одно соединение занятым long polling")
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(lambda r, w: _serve_client(r, w, args.latency), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/bot123:TEST"
+    print(f"Фейковый Bot API: {args.latency * 1000:.0f} ms на ответ, запросов: {args.requests}, polling: {args.polling}")
+    async with server:
+        for pool_size in (int(p) for p in args.pools.split(",")):
+            rps = await _run_case(base_url, pool_size, args.requests, args.polling)
+            print(f"пул {pool_size:>4}: {rps:8.1f} запросов/с")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк холодного старта: сколько занимает запуск бота до начала polling — в новых процессах Python.
+
+Этапы: import bot (со всеми модулями и PTB), settings.load() (config.py, окружение, проверка) и сборка
+Application клуба по умолчанию (bot.default_club + build_application: тексты, клавиатуры, обработчики,
+база записей во временном каталоге). Каждый прогон — отдельный процесс (кэши импорта и модулей пусты,
+байткод .pyc — как при обычном запуске). Время — медиана по --runs прогонам; сумма этапов больше
+--target-ms — код выхода 1.
+
+Запуск:
+    python benchmarks/bench_startup.py                    # 10 прогонов, цель 600 ms
+    python benchmarks/bench_startup.py --target-ms 500 --importtime   # + самые долгие импорты
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Выполняется в новом процессе; печатает JSON {этап: ms}
+_PROBE = r"""
+import json, sys, tempfile, time
+sys.path.insert(0, {benchmarks!r})
+timings = {{}}
+start = time.perf_counter()
+import bot
+timings["import bot"] = time.perf_counter() - start
+import harness, settings
+start = time.perf_counter()
+cfg = settings.load(BOT_TOKEN=harness.TOKEN, FUNNEL_FILE="", DEDUP_FILE="",
+                    BOOKINGS_DB=tempfile.mkdtemp() + "/bookings.db")
+timings["settings.load"] = time.perf_counter() - start
+start = time.perf_counter()
+bot.build_application(bot.default_club(cfg), harness.RecordingRequest(), harness.RecordingRequest())
+timings["build_application"] = time.perf_counter() - start
+print(json.dumps({{name: value * 1000 for name, value in timings.items()}}))
+"""
+
+
+def _run_once() -> dict:
+    code = _PROBE.format(benchmarks=os.path.join(ROOT, "benchmarks"))
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _importtime(top: int) -> list:
+    """Самые долгие импорты (собственное время модуля, мкс) по python -X importtime."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import bot"], cwd=ROOT,
+                         env=dict(os.environ, PYTHONWARNINGS="ignore"), capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="прогонов (процессов)")
+    parser.add_argument("--target-ms", type=float, default=600.0, help="цель: медиана суммы этапов, ms")
+    parser.add_argument("--importtime", action="store_true", help="показать самые долгие импорты")
+    args = parser.parse_args()
+
+    _run_once()  # прогрев: байткод .pyc и файловый кэш ОС, как у перезапуска на сервере
+    runs = [_run_once() for _ in range(args.runs)]
+    stages = list(runs[0])
+    print(f"{'Этап':<20} {'медиана':>10} {'макс':>10}")
+    for stage in stages + ["всего"]:
+        values = sorted(sum(run.values()) if stage == "всего" else run[stage] for run in runs)
+        print(f"{stage:<20} {values[len(values) // 2]:>7.1f} ms {values[-1]:>7.1f} ms")
+    total = sorted(sum(run.values()) for run in runs)[len(runs) // 2]
+
+    if args.importtime:
+        print(f"\n{'Модуль':<40} {'своё':>9} {'всего':>9}")
+        for self_us, cumulative_us, name in _importtime(15):
+            print(f"{name:<40} {self_us / 1000:>6.1f} ms {cumulative_us / 1000:>6.1f} ms")
+
+    if total > args.target_ms:
+        print(f"\nХолодный старт {total:.0f} ms — больше цели {args.target_ms:.0f} ms.")
+        return 1
+    print(f"\nХолодный старт {total:.0f} ms (цель {args.target_ms:.0f} ms).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
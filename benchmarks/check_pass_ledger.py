@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Проверка абонементов через настоящий Application (harness): остаток и журнал pass_ledger после записи,
+отметок посещения (/roster, /attended), отмены — в обоих режимах PASS_DEBIT_ON.
+
+  booking:    начислить → запись (−1) → «пришёл» в /roster (без списания) → /attended (отказ) → отмена (+1)
+  attendance: начислить → запись (без списания) → «пришёл» в /roster (−1) → /attended (уже отмечено)
+              → снять отметку в /roster (+1) → /attended (−1) → /attended ещё раз (без списания) → отмена (+1)
+
+В каждом шаге сверяется остаток и то, что он равен сумме журнала. Любое расхождение — код выхода 1.
+
+Запуск:
+    python benchmarks/check_pass_ledger.py
+"""
+
+import asyncio
+import sys
+import tempfile
+
+from harness import build_app, callback, message
+
+ADMIN = 555
+USER = 42
+
+_REGISTER = [
+    (callback, "reg:day:mon"),
+    (callback, "reg:slot:mon_run"),
+    (callback, "reg:trainer:dasha"),
+    (callback, "reg:level:newbie"),
+    (message, "Иван +375 29 000-00-00"),
+    (callback, "reg:confirm:yes"),
+]
+
+
+class Checker:
+    def __init__(self, app, mode: str):
+        self.app = app
+        self.mode = mode
+        self.store = app.bot_data["bookings"]
+        self.failures = 0
+
+    async def admin(self, text: str) -> str:
+        """Команда админа → текст ответа."""
+        calls = self.app.bot.request.calls
+        calls.clear()
+        await self.app.process_update(message(self.app, text, user_id=ADMIN))
+        return next((params["text"] for name, params in calls if name == "sendMessage" and params.get("chat_id") == ADMIN), "")
+
+    async def roster_toggle(self, booking_id: int, session_date: str) -> None:
+        """Нажатие на имя в /roster (от админа) и запись отложенной отметки в базу."""
+        await self.app.process_update(callback(
+            self.app, f"roster:t:{booking_id}:mon_run:{session_date}:0", user_id=ADMIN
+        ))
+        await self.app.bot_data["attendance"].flush()
+
+    async def user(self, *steps) -> None:
+        for make, data in steps:
+            await self.app.process_update(make(self.app, data, user_id=USER))
+
+    def expect(self, step: str, remaining: int) -> None:
+        balance = self.store.balance(USER)
+        ledger = self.store._conn.execute("SELECT COALESCE(SUM(delta), 0) FROM pass_ledger WHERE user_id = ?",
+                                          (USER,)).fetchone()[0]
+        ok = balance == remaining and ledger == balance
+        self.failures += not ok
+        print(f"{'ok ' if ok else 'FAIL'} [{self.mode}] {step}: остаток {balance} (ждали {remaining}), журнал {ledger}")
+
+    def booking(self) -> tuple:
+        """(id, дата тренировки) единственной действующей записи пользователя."""
+        (booking_id, booking), = self.store.upcoming(USER, "0000-00-00")
+        return booking_id, booking.session_date
+
+
+async def run(mode: str) -> int:
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = build_app(data_dir, ADMIN_CHAT_ID=ADMIN, PASS_DEBIT_ON=mode)
+        async with app:
+            check = Checker(app, mode)
+            await check.admin(f"/pass_add {USER} 3")
+            check.expect("начислено 3", 3)
+            await check.user((message, "/register"), *_REGISTER)
+            booking_id, session_date = check.booking()
+            check.expect("запись", 2 if mode == "booking" else 3)
+            await check.roster_toggle(booking_id, session_date)
+            check.expect("/roster: пришёл", 2)
+            reply = await check.admin(f"/attended {USER} {session_date}")
+            check.expect(f"/attended ({reply})", 2)
+            if mode == "attendance":
+                await check.roster_toggle(booking_id, session_date)
+                check.expect("/roster: снята отметка", 3)
+                reply = await check.admin(f"/attended {USER} {session_date}")
+                check.expect(f"/attended ({reply})", 2)
+                reply = await check.admin(f"/attended {USER} {session_date}")
+                check.expect(f"/attended ещё раз ({reply})", 2)
+            await check.user((callback, f"my:cancel_yes:{booking_id}"))
+            check.expect("отмена", 3)
+            return check.failures
+
+
+async def main() -> int:
+    failures = 0
+    for mode in ("booking", "attendance"):
+        failures += await run(mode)
+    print(f"\nРасхождений: {failures}." if failures else "\nОстаток и журнал сходятся на всех шагах.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Проверка триггеров по тексту (TRIGGERS) через настоящий Application (harness): слово внутри другого слова
+(«Facebook», «notebook», «priceless», «addressed») не начинает запись и не отвечает разделом меню,
+а сами слова и фразы на всех языках бота — срабатывают.
+
+Каждый текст — от нового пользователя; запись началась, если бот спросил день недели (CHOOSE_DAY,
+состояние REG_DAY). Любое расхождение — код выхода 1.
+
+Запуск:
+    python benchmarks/check_triggers.py
+"""
+
+import asyncio
+import itertools
+import re
+import sys
+import tempfile
+
+from harness import bot, build_app, message
+
+# (язык клиента, текст, ожидаемый триггер или None)
+CASES = [
+    ("en", "I found you on Facebook", None),
+    ("en", "my notebook", None),
+    ("en", "nice costume", None),
+    ("en", "priceless", None),
+    ("en", "already addressed", None),
+    ("en", "I want to book", "register"),
+    ("en", "Sign up please", "register"),
+    ("en", "How much is it?", "price"),
+    ("en", "What is the address?", "address"),
+    ("ru", "Хочу записаться", "register"),
+    ("ru", "Какая цена?", "price"),
+    ("ru", "Скиньте по адресу", "address"),
+    ("ru", "Перезаписать файл", None),
+    ("be", "Хачу запісацца", "register"),
+]
+
+_user_ids = itertools.count(1000)
+
+
+def expected_trigger(text: str):
+    return next((name for name, (pattern, _data) in bot.TRIGGERS.items() if re.search(pattern, text)), None)
+
+
+async def started_registration(app, lang: str, text: str) -> bool:
+    user_id = next(_user_ids)
+    calls = app.bot.request.calls
+    calls.clear()
+    await app.process_update(message(app, text, user_id=user_id, lang=lang))
+    prompts = {bundle.t.CHOOSE_DAY for bundle in app.bot_data["i18n"].bundles.values()}
+    return any(name == "sendMessage" and params.get("text") in prompts for name, params in calls)
+
+
+async def main() -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as data_dir:
+        app = build_app(data_dir)
+        async with app:
+            for lang, text, want in CASES:
+                got = expected_trigger(text)
+                started = await started_registration(app, lang, text)
+                ok = got == want and started == (want == "register")
+                failures += not ok
+                print(f"{'ok ' if ok else 'FAIL'} [{lang}] {text!r}: триггер {got}, запись {'началась' if started else 'нет'}")
+    print(f"\nРасхождений: {failures}." if failures else "\nТриггеры срабатывают только на слова целиком.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
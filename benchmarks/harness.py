@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Обвязка для прогона обработчиков bot.py без Telegram: поддельные апдейты и Bot API, который только записывает.
+
+RecordingRequest подменяет HTTP-транспорт бота (BaseRequest): каждый вызов Bot API сохраняется в calls
+и сразу получает правдоподобный ответ (sendMessage → Message и т.д.), сети нет. Поверх него работает
+настоящий Application из bot.build_application — со всеми обработчиками, прослойками и диалогами.
+Апдейты (Message, CallbackQuery) собираются из словарей в формате Bot API, как их присылает Telegram.
+
+    app = build_app(tmpdir)
+    async with app:
+        await app.process_update(message(app, "/start"))
+        await app.process_update(callback(app, "menu:main"))
+        print(app.bot.request.calls)  # [("sendMessage", {...}), ...]
+"""
+
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update  # noqa: E402
+from telegram.request import BaseRequest  # noqa: E402
+
+import bot  # noqa: E402
+import settings  # noqa: E402
+
+# Для прогона без сети подходит любой синтаксически верный токен
+TOKEN = "123456:benchmark"
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+USER_ID = 42
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1000)
+
+
+class RecordingRequest(BaseRequest):
+    """Bot API без сети: вызовы копятся в calls (метод, параметры), ответы — сразу."""
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None, write_timeout=None,
+                         connect_timeout=None, pool_timeout=None):
+        name = url.rsplit("/", 1)[-1]
+        params = request_data.parameters if request_data is not None else {}
+        self.calls.append((name, params))
+        return 200, json.dumps({"ok": True, "result": _result(name, params)}).encode()
+
+
+def _result(name: str, params: dict):
+    if name == "getMe":
+        return BOT_USER
+    if name.startswith("send") or name == "editMessageText":
+        chat_id = params.get("chat_id", USER_ID)
+        return {
+            "message_id": params.get("message_id") or next(_message_ids),
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "text": params.get("text", ""),
+        }
+    return True
+
+
+def build_app(data_dir: str, club=None, **overrides):
+    """Application клуба с RecordingRequest. Без club — клуб по умолчанию (config.py + overrides): база записей и копии —
+    в data_dir, воронка и окно повторов на диск не пишутся."""
+    if club is None:
+        overrides = {
+            "BOOKINGS_DB": os.path.join(data_dir, "bookings.db"), "FUNNEL_FILE": "", "DEDUP_FILE": "",
+            "BACKUP_DIR": os.path.join(data_dir, "backups"), **overrides,
+        }
+        cfg = settings.load(BOT_TOKEN=TOKEN, **overrides)
+        club = bot.default_club(cfg)
+    request = RecordingRequest()
+    return bot.build_application(club, send_request=request, polling_request=RecordingRequest())
+
+
+def _user(user_id: int, lang) -> dict:
+    user = {"id": user_id, "is_bot": False, "first_name": "Иван", "username": "ivan"}
+    if lang:
+        user["language_code"] = lang
+    return user
+
+
+def message(app, text: str, user_id: int = USER_ID, lang: str = None) -> Update:
+    """Текстовое сообщение (или команда, если начинается с «/») от пользователя в личном чате."""
+    data = {
+        "message_id": next(_message_ids),
+        "date": 0,
+        "chat": {"id": user_id, "type": "private"},
+        "from": _user(user_id, lang),
+        "text": text,
+    }
+    if text.startswith("/"):
+        data["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+    return Update.de_json({"update_id": next(_update_ids), "message": data}, app.bot)
+
+
+def callback(app, data: str, user_id: int = USER_ID, lang: str = None, message_id: int = None) -> Update:
+    """Нажатие инлайн-кнопки; по умолчанию — под новым сообщением (кэш отрисовки не пропускает правку)."""
+    update_id = next(_update_ids)
+    return Update.de_json({
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "chat_instance": "bench",
+            "data": data,
+            "from": _user(user_id, lang),
+            "message": {
+                "message_id": message_id or next(_message_ids),
+                "date": 0,
+                "chat": {"id": user_id, "type": "private"},
+                "text": "…",
+            },
+        },
+    }, app.bot)
@@ -4,12 +4,20 @@ Telegram-бот спортивного клуба / беговых тренир
 Короткие сообщения, кнопки, сценарии: запись, цены, адрес, форма, расписание.
 """
 
+import asyncio
+import datetime
+import io
 import logging
+import os
 import re
+import sqlite3
+import sys
+import tempfile
 from html import escape
 from urllib.parse import quote_plus
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import TelegramError
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -20,36 +28,39 @@ from telegram.ext import (
     filters,
 )
 
-import config
+import backup
+import dashboard
+import dedup
+import export
+import funnel
+import health
+import http_pool
+import http_server
+import i18n
+import ical
+import memstats
+import middleware
+import profiler
+import roster
+import routing
+import sessions
+import settings
+import sources
+import storage
+import tenants
+import tracing
+from logging_setup import logging_middleware, setup_logging
+from replies import CallbackReply, answer_and_edit, safe_answer
+from runtime import BotApplication, run_polling_all
 
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
-logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
-# --- Состояния сценария записи: день → слот → [тренер для пн/ср] → уровень → контакт → подтверждение ---
+# --- Состояния сценария записи: день → слот → [тренер, если у слота его нет в SLOT_TO_TRAINER] → уровень → контакт → подтверждение ---
 REG_DAY, REG_SLOT, REG_TRAINER, REG_LEVEL, REG_CONTACT, REG_CONFIRM = range(6)
 
-# --- Дни недели (кнопки при записи) ---
-DAY_BUTTONS = [
-    ("mon", "Понедельник"),
-    ("tue", "Вторник"),
-    ("wed", "Среда"),
-    ("thu", "Четверг"),
-    ("fri", "Пятница"),
-    ("sun", "Воскресенье"),
-]
-# Подписи кнопок дней с эмодзи типа тренировки (🏃‍♂️ бег, 🏋️‍♂️ зал)
-DAY_EMOJI_LABEL = {
-    "mon": "🏃‍♂️ Понедельник",
-    "tue": "🏃‍♂️ Вторник",
-    "wed": "🏃‍♂️🏋️‍♂️ Среда",
-    "thu": "🏃‍♂️ Четверг",
-    "fri": "🏋️‍♂️ Пятница",
-    "sun": "🏃‍♂️ Воскресенье",
-}
+# --- Дни записи — дни SLOTS_BY_DAY клуба (club_days); подписи — в каталогах locales/ (DAY_LABEL) ---
+# Эмодзи на кнопке дня — по типам его тренировок (SLOT_TO_ADDRESS_TYPE), в этом порядке
+_TRAINING_EMOJI = {"run": "🏃‍♂️", "long": "🏃‍♂️", "gym": "🏋️‍♂️"}
 
 # --- Слоты по дню: (slot_id, label). Только актуальные варианты. ---
 # slot_id используется для определения адреса (run/gym/long)
@@ -131,9 +142,6 @@ def _location_geo_url(address: str) -> str:
 ADDRESS_TYPE_LABEL = {"run": "Беговая", "gym": "Силовая", "long": "Длительная"}
 # Только тип для сообщения админу (день и время — отдельными строками)
 ADMIN_TRAINING_LABEL = {"run": "Беговая", "gym": "Силовая (зал)", "long": "Длительная"}
-# Тип (формат/место) для карточки и однострочного подтверждения
-CARD_TRAINING_LABEL = {"run": "Беговая (улица)", "gym": "Силовая (зал)", "long": "Длительная"}
-DAY_LABEL = dict(DAY_BUTTONS)  # mon → Понедельник, tue → Вторник, ...
 SLOT_TO_TIME = {
     "mon_run": "19:20–20:50",
     "tue_morning": "07:30–09:00",
@@ -189,164 +197,1007 @@ FORM_GYM = (
     "• При необходимости — бутылка воды и полотенце"
 )
 
-# --- Что надеть: Зал / Манеж / Улица (экран выбора) ---
-FORM_WEAR_GYM = (
-    "🏋️‍♂️ Что надеть в зал (силовая тренировка)\n\n"
-    "• Удобная спортивная форма\n"
-    "• Кроссовки для зала\n"
-    "• Носки\n"
-    "• Бутылка воды\n"
-    "• Полотенце\n\n"
-    "По желанию:\n"
-    "• Перчатки для тренировок\n"
-    "• Ремень или личная экипировка"
-)
+# --- Блок в конце финального подтверждения (все сценарии): вопросы → руководитель ---
+FINAL_CONFIRM_FOOTER = "Если остались вопросы — напишите руководителю: @coach_pramuk"
 
-FORM_WEAR_MANEGE = (
-    "🏃‍♂️ Что надеть в манеж (беговая тренировка)\n\n"
-    "• Лёгкая спортивная форма\n"
-    "• Кроссовки для бега по покрытию\n"
-    "• Носки\n"
-    "• Бутылка воды\n\n"
-    "По желанию:\n"
-    "• Лёгкая кофта для разминки\n"
-    "• Часы или трекер"
-)
+# --- Клуб текущего бота (в мультиклубном режиме у каждого Application свой, см. tenants.py) ---
+def _club(context: ContextTypes.DEFAULT_TYPE) -> tenants.Club:
+    return context.bot_data["club"]
 
-FORM_WEAR_STREET_WARM = (
-    "☀️ Что надеть, когда тепло\n\n"
-    "• Футболка или майка\n"
-    "• Шорты или тайтсы\n"
-    "• Кроссовки для бега\n"
-    "• Кепка\n"
-    "• Вода обязательно"
-)
 
-FORM_WEAR_STREET_COOL = (
-    "🧢 Что надеть, когда прохладно\n\n"
-    "• Лонгслив или лёгкая кофта\n"
-    "• Тайтсы или лёгкие штаны\n"
-    "• Лёгкая ветровка\n"
-    "• Кроссовки\n"
-    "• Бафф или тонкая шапка — по желанию"
-)
+# --- Язык пользователя: тексты (t), готовые клавиатуры (kb) и контент клуба на этом языке (см. i18n.py) ---
+def _loc(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i18n.LocaleBundle:
+    return context.bot_data["i18n"].for_user(update.effective_user)
 
-FORM_WEAR_STREET_COLD = (
-    "🧥 Что надеть, когда холодно\n\n"
-    "• Термобельё\n"
-    "• Тёплый лонгслив или кофта\n"
-    "• Ветровка\n"
-    "• Тайтсы\n"
-    "• Шапка и перчатки\n"
-    "• Кроссовки по погоде"
-)
 
-FORM_WEAR_STREET_RAIN = (
-    "🌧 Что надеть в дождь\n\n"
-    "• Ветровка или дождевик\n"
-    "• Быстросохнущая форма\n"
-    "• Тайтсы или штаны\n"
-    "• Кроссовки с хорошим сцеплением\n"
-    "• Кепка"
-)
+# --- Клавиатуры. Собираются один раз на язык и клуб (_build_keyboards), в обработчиках — loc.kb.<имя> ---
+def _back_and_restart_row(t):
+    return [
+        InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main"),
+        InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart"),
+    ]
 
-# --- Финальные рекомендации ПОСЛЕ подтверждения записи (только после «✅ Да») ---
-# Беговые (пн/вт/ср/чт): что взять с собой + душ
-FORM_RUN_AFTER_CONFIRM = (
-    "🏃‍♂️ Что взять с собой на тренировку\n\n"
-    "• Бутылку воды\n"
-    "• Кроссовки по погоде\n"
-    "• Одежду по погоде\n\n"
-    "🚿 После тренировки можно помыться — возьмите вещи для душа: полотенце, шампунь, гель."
-)
-# Силовые (зал): что взять + душ
-FORM_GYM_AFTER_CONFIRM = (
-    "🏋️‍♂️ Что взять с собой на тренировку\n\n"
-    "• Удобную спортивную одежду для зала\n"
-    "• Кроссовки для зала\n"
-    "• Бутылку воды\n\n"
-    "🚿 После тренировки можно помыться — возьмите вещи для душа: полотенце, шампунь, гель."
-)
 
-# --- Блок в конце финального подтверждения (все сценарии): вопросы → руководитель ---
-FINAL_CONFIRM_FOOTER = "Если остались вопросы — напишите руководителю: @coach_pramuk"
-
-# --- Кнопка приветствия (первый экран) ---
-def start_welcome_keyboard():
+def start_welcome_keyboard(t):
     """Одна кнопка «Старт» — ведёт в основное меню."""
     return InlineKeyboardMarkup([
-        [InlineKeyboardButton("🚀 Старт", callback_data="menu:start")],
+        [InlineKeyboardButton(t.BTN_START, callback_data="menu:start")],
     ])
 
 
 # --- Кнопки основного меню (эмодзи + короткие названия) ---
-def main_menu_keyboard():
+def main_menu_keyboard(t):
     return InlineKeyboardMarkup([
         [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("🗓 Расписание", callback_data="menu:schedule"),
+            InlineKeyboardButton(t.BTN_REGISTER, callback_data="menu:register"),
+            InlineKeyboardButton(t.BTN_SCHEDULE, callback_data="menu:schedule"),
         ],
         [
-            InlineKeyboardButton("💰 Цены", callback_data="menu:price"),
-            InlineKeyboardButton("📍 Локации", callback_data="menu:locations"),
+            InlineKeyboardButton(t.BTN_PRICES, callback_data="menu:price"),
+            InlineKeyboardButton(t.BTN_LOCATIONS, callback_data="menu:locations"),
         ],
         [
-            InlineKeyboardButton("❓ Задать вопрос", callback_data="menu:question"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
+            InlineKeyboardButton(t.BTN_QUESTION, callback_data="menu:question"),
+            InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart"),
         ],
     ])
 
 
 # --- Кнопка «Начать заново» (анти-тупик: всегда есть выход) ---
-def restart_keyboard():
+def restart_keyboard(t):
     """Одна кнопка «Начать заново» — сброс диалога и показ стартового экрана."""
     return InlineKeyboardMarkup([
-        [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
+        [InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart")],
     ])
 
 
-def menu_and_restart_keyboard():
+def menu_and_restart_keyboard(t):
     """«⬅️ Назад в меню» и «Начать заново» — для экранов, где диалог может закончиться."""
+    return InlineKeyboardMarkup([_back_and_restart_row(t)])
+
+
+def menu_or_restart_keyboard(t):
+    """«⬅️ Назад в меню» и «Начать заново» отдельными рядами — после ошибки или непонятного текста."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main")],
+        [InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart")],
+    ])
+
+
+def _register_and_menu_keyboard(t):
+    """Записаться, Назад в меню, Начать заново — после цен и «Что взять с собой»."""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(t.BTN_REGISTER, callback_data="menu:register"),
+            InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main"),
+        ],
+        [InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart")],
+    ])
+
+
+def _not_understood_keyboard(t):
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(t.BTN_REGISTER_PLAIN, callback_data="menu:register"),
+            InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main"),
+        ],
+        [InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart")],
+    ])
+
+
+# --- Запись: день → слот → [тренер] → уровень → контакт → подтверждение ---
+def club_days(content) -> tuple:
+    """Дни, на которые у клуба есть слоты (SLOTS_BY_DAY), по порядку недели."""
+    return tuple(day for day in storage.WEEKDAYS if content.SLOTS_BY_DAY.get(day))
+
+
+def _day_keyboard(t, content):
+    """Кнопки дней клуба с эмодзи типа тренировки (🏃‍♂️ бег, 🏋️‍♂️ зал) + выход."""
+    buttons = []
+    for day in club_days(content):
+        types = {content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run") for slot_id, _label in content.SLOTS_BY_DAY[day]}
+        emoji = "".join(dict.fromkeys(icon for kind, icon in _TRAINING_EMOJI.items() if kind in types))
+        label = t.DAY_LABEL.get(day, day)
+        buttons.append([InlineKeyboardButton(f"{emoji} {label}" if emoji else label, callback_data=f"reg:day:{day}")])
+    buttons.append(_back_and_restart_row(t))
+    return InlineKeyboardMarkup(buttons)
+
+
+def _slot_keyboard(t, slots):
+    """Кнопки слотов только для выбранного дня (без лишних вариантов)."""
+    buttons = [
+        [InlineKeyboardButton(label, callback_data=f"reg:slot:{slot_id}")]
+        for slot_id, label in slots
+    ]
+    buttons.append(_back_and_restart_row(t))
+    return InlineKeyboardMarkup(buttons)
+
+
+def _trainer_keyboard(t):
+    """Кнопки выбора тренера для понедельника и среды (Даша / Максим)."""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(t.TRAINER_NAME["dasha"], callback_data="reg:trainer:dasha"),
+            InlineKeyboardButton(t.TRAINER_NAME["maxim"], callback_data="reg:trainer:maxim"),
+        ],
+        _back_and_restart_row(t),
+    ])
+
+
+def _level_keyboard(t):
+    """Кнопки уровня + выход."""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(t.LEVEL_LABEL["newbie"], callback_data="reg:level:newbie"),
+            InlineKeyboardButton(t.LEVEL_LABEL["medium"], callback_data="reg:level:medium"),
+        ],
+        [
+            InlineKeyboardButton(t.LEVEL_LABEL["advanced"], callback_data="reg:level:advanced"),
+            InlineKeyboardButton(t.LEVEL_LABEL["unknown"], callback_data="reg:level:unknown"),
+        ],
+        _back_and_restart_row(t),
+    ])
+
+
+def _confirm_keyboard(t):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_CONFIRM_YES, callback_data="reg:confirm:yes")],
+        [InlineKeyboardButton(t.BTN_CONFIRM_CHANGE, callback_data="reg:confirm:change")],
+        [InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart")],
+    ])
+
+
+# --- Цены: выбор тренера (Максим | Даша / Виталик) ---
+def _price_choice_keyboard(t):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_PRICE_MAKSIM_DASHA, callback_data="price:maksim_dasha")],
+        [InlineKeyboardButton(t.BTN_PRICE_VITALIK, callback_data="price:vitalik")],
+        _back_and_restart_row(t),
+    ])
+
+
+# --- Адрес ---
+def _address_transport_keyboard(t):
+    """Адрес указан в настройках: на машине / пешком + выход."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_BY_CAR, callback_data="addr:car")],
+        [InlineKeyboardButton(t.BTN_ON_FOOT, callback_data="addr:walk")],
+        _back_and_restart_row(t),
+    ])
+
+
+def _address_unknown_keyboard(t):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_REGISTER_PLAIN, callback_data="menu:register")],
+        _back_and_restart_row(t),
+    ])
+
+
+def _address_nav_keyboard(t):
+    """Клавиатура после показа адреса и расписания: Записаться, Адрес, Назад в меню, Начать заново."""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(t.BTN_REGISTER, callback_data="menu:register"),
+            InlineKeyboardButton(t.BTN_ADDRESS, callback_data="menu:locations"),
+        ],
+        _back_and_restart_row(t),
+    ])
+
+
+def _address_keyboard_with_geo(t, geo_url: str):
+    """Клавиатура после показа адреса: инлайн-кнопка с URL навигатора + Записаться, Адрес, Назад в меню."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_OPEN_LOCATION, url=geo_url)],
+        [
+            InlineKeyboardButton(t.BTN_REGISTER, callback_data="menu:register"),
+            InlineKeyboardButton(t.BTN_ADDRESS, callback_data="menu:locations"),
+        ],
+        _back_and_restart_row(t),
+    ])
+
+
+def _locations_choice_keyboard(t):
+    """Клавиатура выбора типа: Беговые / Силовые / Длительная."""
     return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_LOC_RUN, callback_data="loc:run")],
+        [InlineKeyboardButton(t.BTN_LOC_GYM, callback_data="loc:gym")],
+        [InlineKeyboardButton(t.BTN_LOC_LONG, callback_data="loc:long")],
         [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
+            InlineKeyboardButton(t.BTN_REGISTER, callback_data="menu:register"),
+            InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main"),
         ],
+        [InlineKeyboardButton(t.BTN_RESTART, callback_data="menu:restart")],
     ])
 
 
+# --- Что надеть (Зал / Манеж / Улица) ---
+def _form_place_keyboard(t):
+    """Три кнопки: Зал, Манеж, Улица."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_FORM_GYM, callback_data="form:gym")],
+        [InlineKeyboardButton(t.BTN_FORM_MANEGE, callback_data="form:manege")],
+        [InlineKeyboardButton(t.BTN_FORM_STREET, callback_data="form:street")],
+        _back_and_restart_row(t),
+    ])
+
+
+def _form_weather_keyboard(t):
+    """Четыре кнопки погоды для «Улица»."""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(t.WEATHER_LABEL["warm"], callback_data="form:weather:warm"),
+            InlineKeyboardButton(t.WEATHER_LABEL["cool"], callback_data="form:weather:cool"),
+        ],
+        [
+            InlineKeyboardButton(t.WEATHER_LABEL["cold"], callback_data="form:weather:cold"),
+            InlineKeyboardButton(t.WEATHER_LABEL["rain"], callback_data="form:weather:rain"),
+        ],
+        _back_and_restart_row(t),
+    ])
+
+
+# --- Вопросы: темы и «Как проходят тренировки» ---
+def _question_topics_keyboard(t):
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_TOPIC_FORM, callback_data="question:form")],
+        [InlineKeyboardButton(t.BTN_TOPIC_WHAT_TO_TAKE, callback_data="question:what_to_take")],
+        [InlineKeyboardButton(t.BTN_TOPIC_HOW, callback_data="question:how")],
+        [InlineKeyboardButton(t.BTN_TOPIC_CUSTOM, callback_data="question:custom")],
+        _back_and_restart_row(t),
+    ])
+
+
+def _question_how_keyboard(t):
+    """Первый уровень: Беговые / Силовые / Длительные + Назад в меню (🏃‍♂️ бег, длительные; 🏋️‍♂️ силовые)."""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(t.BTN_HOW_RUN, callback_data="how:run")],
+        [InlineKeyboardButton(t.BTN_HOW_STRENGTH, callback_data="how:strength")],
+        [InlineKeyboardButton(t.BTN_HOW_LONG, callback_data="how:long")],
+        [InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main")],
+    ])
+
+
+# --- Язык: названия — каждое на своём языке ---
+def _lang_keyboard():
+    catalogs = i18n.catalogs()
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(catalogs[code].messages.LANGUAGE_NAME, callback_data=f"lang:{code}") for code in i18n.LOCALES],
+    ])
+
+
+def _build_keyboards(t, content):
+    """Все клавиатуры одного языка и клуба (вызывается один раз при сборке приложения, см. i18n.build_locales)."""
+    location_geo = {}
+    for loc_type in ("run", "gym", "long"):
+        address = content.LOCATION_SHORT.get(loc_type, "Калиновского, 111")
+        location_geo[loc_type] = _address_keyboard_with_geo(t, _location_geo_url(address))
+    return i18n.frozen("Keyboards", {
+        "start_welcome": start_welcome_keyboard(t),
+        "main_menu": main_menu_keyboard(t),
+        "restart": restart_keyboard(t),
+        "menu_and_restart": menu_and_restart_keyboard(t),
+        "menu_or_restart": menu_or_restart_keyboard(t),
+        "register_and_menu": _register_and_menu_keyboard(t),
+        "not_understood": _not_understood_keyboard(t),
+        "day": _day_keyboard(t, content),
+        "slots": {day: _slot_keyboard(t, slots) for day, slots in content.SLOTS_BY_DAY.items()},
+        "no_slots": _slot_keyboard(t, ()),
+        "trainer": _trainer_keyboard(t),
+        "level": _level_keyboard(t),
+        "confirm": _confirm_keyboard(t),
+        "price_choice": _price_choice_keyboard(t),
+        "address_transport": _address_transport_keyboard(t),
+        "address_unknown": _address_unknown_keyboard(t),
+        "address_nav": _address_nav_keyboard(t),
+        "location_geo": location_geo,
+        "locations_choice": _locations_choice_keyboard(t),
+        "form_place": _form_place_keyboard(t),
+        "form_weather": _form_weather_keyboard(t),
+        "question_topics": _question_topics_keyboard(t),
+        "question_how": _question_how_keyboard(t),
+        "lang": _lang_keyboard(),
+    })
+
+
 # --- /start ---
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Фиксированное приветствие + кнопка «🚀 Старт» при каждом /start."""
-    text = (
-        "Привет! 👋\n\n"
-        "Я помогу записаться на тренировку и отвечу на вопросы.\n\n"
-        "Нажмите кнопку ниже, чтобы начать 👇"
-    )
-    await update.message.reply_text(text, reply_markup=start_welcome_keyboard())
+    """Фиксированное приветствие + кнопка «🚀 Старт» при каждом /start; метка из ссылки — источник (sources.py)."""
+    loc = _loc(update, context)
+    source = sources.parse_start(context.args, _club(context).cfg.START_SOURCES)
+    text = loc.t.WELCOME
+    greeting = loc.t.SOURCE_GREETING.get(source)
+    if greeting:
+        # После первой строки приветствия: «Привет! 👋» → «Вижу, вы пришли с сайта…» → остальное
+        head, _, rest = text.partition("\n\n")
+        text = f"{head}\n\n{greeting}\n\n{rest}"
+    store = context.bot_data.get("bookings")
+    if store is not None:
+        try:
+            source = await asyncio.to_thread(store.record_start, update.effective_user.id, source, sources.DIRECT)
+        except Exception as e:
+            logger.exception("Не удалось сохранить источник: %s", e)
+    elif source == sources.DIRECT:
+        source = context.user_data.get("source", source)
+    context.user_data["source"] = source
+    await update.message.reply_text(text, reply_markup=loc.kb.start_welcome)
     return ConversationHandler.END
 
 
 # --- /myid — показать пользователю его chat_id (для админа: подставить в config.ADMIN_CHAT_ID) ---
 async def cmd_myid(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
-    await update.message.reply_text(
-        f"Ваш chat_id: <code>{chat_id}</code>.\n\nЕсли вы админ — подставьте это число в config.ADMIN_CHAT_ID.",
-        parse_mode="HTML",
-    )
+    await update.message.reply_text(_loc(update, context).t.MYID_TEXT.format(chat_id=chat_id), parse_mode="HTML")
     return ConversationHandler.END
 
 
+# --- Служебные команды админа (только из чата config.ADMIN_CHAT_ID) ---
+def _is_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    admin_chat_id = _club(context).cfg.ADMIN_CHAT_ID
+    return bool(admin_chat_id) and update.effective_chat is not None and update.effective_chat.id == admin_chat_id
+
+
+async def cmd_slow(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/slow [N] — последние N медленных апдейтов с деревом спанов (по умолчанию 3)."""
+    if not update.message or not _is_admin(update, context):
+        return
+    try:
+        n = int(context.args[0]) if context.args else 3
+    except ValueError:
+        n = 3
+    traces = tracing.store.last_slow(min(max(n, 1), 20))
+    if not traces:
+        await update.message.reply_text(f"Медленных апдейтов (> {tracing.store.slow_ms:.0f} ms) пока нет.")
+        return
+    text = "\n\n".join(root.render() for root in reversed(traces))
+    await update.message.reply_text(f"<pre>{escape(text[:3900])}</pre>", parse_mode="HTML")
+
+
+_PROFILE_USAGE = "Использование: /profile [секунд] [N] — окно профилирования (по умолчанию 10 с) и длина топов (15)"
+
+
+async def cmd_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/profile [секунд] [N] — выборки стеков живого процесса за окно: топ обработчиков и функций, файл для flamegraph."""
+    if not update.message or not _is_admin(update, context):
+        return
+    try:
+        seconds = float(context.args[0]) if context.args else 10.0
+        top = int(context.args[1]) if len(context.args or ()) > 1 else 15
+        if not 0 < seconds or top <= 0:
+            raise ValueError(context.args)
+    except ValueError:
+        await update.message.reply_text(_PROFILE_USAGE)
+        return
+    if profiler.profiler.running:
+        await update.message.reply_text("Профилирование уже идёт — дождитесь отчёта.")
+        return
+    seconds = min(seconds, profiler.profiler.max_seconds)
+    await update.message.reply_text(f"Профилирую {seconds:g} с…")
+    # Окно ждёт в фоне: обработчик не держит очередь апдейтов (их же и профилируем)
+    context.application.create_task(_profile_and_report(update.message, context, seconds, top), name="profile")
+
+
+async def _profile_and_report(message, context: ContextTypes.DEFAULT_TYPE, seconds: float, top: int) -> None:
+    app = context.application
+    try:
+        result = await profiler.profiler.profile(seconds, middleware.callbacks(app), app)
+    except RuntimeError:
+        await message.reply_text("Профилирование уже идёт — дождитесь отчёта.")
+        return
+    try:
+        await message.reply_text(f"<pre>{escape(result.report(top)[:3900])}</pre>", parse_mode="HTML")
+        stacks = result.collapsed()
+        if stacks:
+            filename = f"profile-{datetime.datetime.now():%Y%m%d-%H%M%S}.folded"
+            await message.reply_document(
+                io.BytesIO(stacks.encode("utf-8")), filename=filename,
+                caption="Стеки для flamegraph.pl / speedscope.app",
+            )
+    except TelegramError as e:
+        logger.warning("Не удалось отправить отчёт /profile: %s", e)
+
+
+async def cmd_funnel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/funnel — где пользователи бросают запись: переходы по этапам, выбор и запись по слотам и дням."""
+    if not update.message or not _is_admin(update, context):
+        return
+    report = context.bot_data["funnel"].report()
+    await update.message.reply_text(f"<pre>{escape(report[:3900])}</pre>", parse_mode="HTML")
+
+
+_EXPORT_USAGE = (
+    "Использование: /export [csv|xlsx] [slot=wed_run] [trainer=Максим] [from=ГГГГ-ММ-ДД] [to=ГГГГ-ММ-ДД] [cancelled]"
+)
+_EXPORT_FILTERS = {"slot": "slot_id", "trainer": "trainer", "from": "date_from", "to": "date_to"}
+
+
+def _parse_export_args(args: list) -> tuple:
+    """Аргументы /export → (формат, фильтры для storage.BookingStore.iter_bookings). Ошибка — ValueError."""
+    fmt, criteria = "xlsx", {}
+    for arg in args:
+        if arg.lower() in export.FORMATS:
+            fmt = arg.lower()
+            continue
+        if arg.lower() == "cancelled":
+            criteria["cancelled"] = True
+            continue
+        key, sep, value = arg.partition("=")
+        if not sep or key not in _EXPORT_FILTERS or not value:
+            raise ValueError(arg)
+        if key in ("from", "to"):
+            value = datetime.date.fromisoformat(value).isoformat()
+        criteria[_EXPORT_FILTERS[key]] = value
+    return fmt, criteria
+
+
+async def cmd_export(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/export — подтверждённые записи файлом CSV/XLSX (по умолчанию XLSX), с фильтрами по слоту, тренеру и датам;
+    с cancelled — и отменённые."""
+    if not update.message or not _is_admin(update, context):
+        return
+    store = context.bot_data.get("bookings")
+    if store is None:
+        await update.message.reply_text("Хранилище записей выключено (BOOKINGS_DB в config.py).")
+        return
+    try:
+        fmt, criteria = _parse_export_args(context.args or [])
+    except ValueError:
+        await update.message.reply_text(_EXPORT_USAGE)
+        return
+    # Файл пишется во временный каталог в потоке (строки идут курсором, не целиком в памяти)
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        count = await asyncio.to_thread(export.export_bookings, store, path, fmt, **criteria)
+        if not count:
+            await update.message.reply_text("Записей по этим условиям нет.")
+            return
+        filename = f"bookings-{datetime.date.today().isoformat()}.{fmt}"
+        with open(path, "rb") as f:
+            await update.message.reply_document(f, filename=filename, caption=f"Записей: {count}")
+    finally:
+        os.remove(path)
+
+
+async def cmd_backup(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/backup — снять копию базы записей сейчас (как по расписанию: сжатая, проверенная) и показать последние."""
+    if not update.message or not _is_admin(update, context):
+        return
+    backups = context.bot_data.get("backups")
+    if backups is None:
+        await update.message.reply_text("Резервные копии выключены (BOOKINGS_DB, BACKUP_DIR в config.py).")
+        return
+    try:
+        result = await backups.snapshot()
+    except (backup.BackupError, OSError, sqlite3.Error) as e:
+        logger.warning("Не удалось снять копию базы по /backup: %s", e)
+        await update.message.reply_text(f"Копию снять не удалось: {e}")
+        return
+    lines = [
+        f"Копия: {os.path.basename(result.path)} — {result.size / 1024:.0f} КБ, {result.seconds:.1f} с",
+        "Проверена: " + ", ".join(f"{table} {count}" for table, count in result.rows.items()),
+        f"Всего копий: {len(backups.list())} (хранится {backups.keep})",
+    ]
+    await update.message.reply_text("\n".join(lines))
+
+
+# --- Абонементы: начисление админом, списание за посещение, остаток у пользователя ---
+def _pass_args(args: list, default_sessions: int) -> tuple:
+    """«<chat_id> [занятий]» → (chat_id, занятий). Ошибка — ValueError."""
+    if not args or len(args) > 2:
+        raise ValueError(args)
+    user_id = int(args[0])
+    sessions = int(args[1]) if len(args) == 2 else default_sessions
+    if sessions == 0:
+        raise ValueError(args)
+    return user_id, sessions
+
+
+async def _notify_pass(context: ContextTypes.DEFAULT_TYPE, user_id: int, text_name: str, **fields) -> None:
+    """Сообщить владельцу абонемента об изменении (на его языке); не удалось — только в лог."""
+    t = context.bot_data["i18n"].resolve(user_id).t
+    try:
+        await context.bot.send_message(user_id, getattr(t, text_name).format(**fields))
+    except TelegramError as e:
+        logger.warning("Не удалось сообщить %s об абонементе: %s", user_id, e)
+
+
+async def cmd_pass_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/pass_add <chat_id> [занятий] — начислить абонемент (по умолчанию PASS_SESSIONS); отрицательное — снять."""
+    if not update.message or not _is_admin(update, context):
+        return
+    store = context.bot_data.get("bookings")
+    if store is None:
+        await update.message.reply_text("Хранилище записей выключено (BOOKINGS_DB в config.py).")
+        return
+    try:
+        user_id, sessions = _pass_args(context.args, _club(context).cfg.PASS_SESSIONS)
+    except ValueError:
+        await update.message.reply_text("Использование: /pass_add <chat_id> [занятий]")
+        return
+    reason = storage.PASS_PURCHASE if sessions > 0 else storage.PASS_ADJUST
+    try:
+        remaining = await asyncio.to_thread(store.credit, user_id, sessions, reason, update.effective_user.id)
+    except storage.PassError:
+        balance = await asyncio.to_thread(store.balance, user_id)
+        await update.message.reply_text(f"Нельзя снять {-sessions}: на абонементе {balance or 0}.")
+        return
+    await update.message.reply_text(f"Абонемент {user_id}: {sessions:+d}, осталось занятий: {remaining}.")
+    if sessions > 0:
+        await _notify_pass(context, user_id, "PASS_CREDITED", sessions=sessions, remaining=remaining)
+
+
+async def cmd_attended(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/attended <chat_id> [ГГГГ-ММ-ДД] — отметить «пришёл» запись на дату (по умолчанию сегодня), как в /roster:
+    списать одно занятие с абонемента. Только при PASS_DEBIT_ON = "attendance"."""
+    if not update.message or not _is_admin(update, context):
+        return
+    store = context.bot_data.get("bookings")
+    if store is None:
+        await update.message.reply_text("Хранилище записей выключено (BOOKINGS_DB в config.py).")
+        return
+    if _club(context).cfg.PASS_DEBIT_ON != "attendance":
+        # Занятие уже списано при подтверждении записи — второе списание за тот же визит недопустимо
+        await update.message.reply_text("Занятия списываются при записи (PASS_DEBIT_ON = \"booking\"), /attended не нужен.")
+        return
+    args = context.args or []
+    try:
+        user_id = int(args[0]) if 1 <= len(args) <= 2 else None
+        session_date = datetime.date.fromisoformat(args[1]).isoformat() if len(args) == 2 else datetime.date.today().isoformat()
+    except ValueError:
+        user_id = None
+    if user_id is None:
+        await update.message.reply_text("Использование: /attended <chat_id> [ГГГГ-ММ-ДД]")
+        return
+    # Отложенные нажатия /roster — сначала в базу: отметка и списание видят их
+    await context.bot_data["attendance"].flush()
+    try:
+        booking_id, remaining = await asyncio.to_thread(
+            store.mark_attended, user_id, session_date, True, update.effective_user.id
+        )
+    except storage.BookingError:
+        await update.message.reply_text(f"У {user_id} нет записи на {session_date}.")
+        return
+    if booking_id is None:
+        await update.message.reply_text(f"Посещение {user_id} {session_date} уже отмечено «пришёл».")
+        return
+    if remaining is None:
+        await update.message.reply_text(f"Посещение {user_id} {session_date} отмечено; занятий на абонементе нет.")
+        return
+    await update.message.reply_text(f"Посещение {user_id} {session_date} отмечено. Абонемент: −1, осталось занятий: {remaining}.")
+    await _notify_pass(context, user_id, "PASS_DEBITED", remaining=remaining)
+
+
+async def cmd_balance(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/balance — сколько занятий осталось на абонементе."""
+    if not update.message:
+        return
+    loc = _loc(update, context)
+    store = context.bot_data.get("bookings")
+    remaining = await asyncio.to_thread(store.balance, update.effective_user.id) if store is not None else None
+    text = loc.t.PASS_NONE if remaining is None else loc.t.PASS_BALANCE.format(remaining=remaining)
+    await update.message.reply_text(text, reply_markup=loc.kb.menu_and_restart)
+
+
+# --- /mybookings — записи пользователя: список, отмена, перенос ---
+def _short_date(session_date: str) -> str:
+    return f"{session_date[8:10]}.{session_date[5:7]}"
+
+
+def _booking_trainer(booking: storage.Booking, loc: i18n.LocaleBundle, admin_loc: i18n.LocaleBundle) -> str:
+    """Тренер записи на языке пользователя (в базе — на языке бота по умолчанию)."""
+    codes = {name: code for code, name in admin_loc.t.TRAINER_NAME.items()}
+    code = codes.get(booking.trainer)
+    if code is not None:
+        return loc.t.TRAINER_NAME.get(code, booking.trainer)
+    return loc.content.SLOT_TO_TRAINER.get(booking.slot_id, booking.trainer)
+
+
+def _booking_line(booking: storage.Booking, loc: i18n.LocaleBundle, admin_loc: i18n.LocaleBundle) -> str:
+    t = loc.t
+    address_type = loc.content.SLOT_TO_ADDRESS_TYPE.get(booking.slot_id, "run")
+    return t.MYBOOKING_LINE.format(
+        date=_short_date(booking.session_date),
+        day=t.DAY_LABEL.get(booking.day, booking.day),
+        training=t.CARD_TRAINING_LABEL.get(address_type, "—"),
+        time=booking.time,
+        trainer=_booking_trainer(booking, loc, admin_loc),
+    )
+
+
+def _mybookings_screen(bookings: list, loc: i18n.LocaleBundle, admin_loc: i18n.LocaleBundle) -> tuple:
+    t = loc.t
+    if not bookings:
+        return t.MYBOOKINGS_EMPTY, loc.kb.menu_and_restart
+    lines = [t.MYBOOKINGS_TITLE, ""] + [_booking_line(booking, loc, admin_loc) for _id, booking in bookings]
+    buttons = [
+        [
+            InlineKeyboardButton(t.BTN_CANCEL_BOOKING.format(date=_short_date(booking.session_date)),
+                                 callback_data=f"my:cancel:{booking_id}"),
+            InlineKeyboardButton(t.BTN_MOVE_BOOKING.format(date=_short_date(booking.session_date)),
+                                 callback_data=f"my:move:{booking_id}"),
+        ]
+        for booking_id, booking in bookings
+    ]
+    buttons.append([InlineKeyboardButton(t.BTN_BACK_TO_MENU, callback_data="menu:main")])
+    return "\n".join(lines), InlineKeyboardMarkup(buttons)
+
+
+def _reschedule_targets(booking: storage.Booking, loc: i18n.LocaleBundle, admin_loc: i18n.LocaleBundle,
+                        now: datetime.datetime) -> list:
+    """Куда можно перенести: ближайшая тренировка каждого слота (и каждый тренер на слотах с выбором тренера).
+
+    [(slot_id, код тренера или "-", дата, подпись кнопки)], кроме тренировки самой записи.
+    """
+    content, t = loc.content, loc.t
+    targets = []
+    for day, slots in content.SLOTS_BY_DAY.items():
+        if day not in storage.WEEKDAYS:
+            continue
+        for slot_id, label in slots:
+            session_date = storage.next_session_date(day, content.SLOT_TO_TIME.get(slot_id, ""), now).isoformat()
+            if slot_id in content.SLOT_TO_TRAINER:
+                trainers = [("-", "")]
+            else:
+                trainers = [(code, f" · {name}") for code, name in t.TRAINER_NAME.items()]
+            for code, suffix in trainers:
+                same_trainer = code == "-" or admin_loc.t.TRAINER_NAME.get(code) == booking.trainer
+                if slot_id == booking.slot_id and session_date == booking.session_date and same_trainer:
+                    continue
+                targets.append((slot_id, code, session_date, f"{_short_date(session_date)} · {label}{suffix}"))
+    targets.sort(key=lambda target: target[2])
+    return targets
+
+
+def _reschedule_keyboard(booking_id: int, targets: list, t) -> InlineKeyboardMarkup:
+    buttons = [
+        [InlineKeyboardButton(label, callback_data=f"my:to:{booking_id}:{slot_id}:{code}")]
+        for slot_id, code, _date, label in targets
+    ]
+    buttons.append([InlineKeyboardButton(t.BTN_BACK_TO_BOOKINGS, callback_data="my:list")])
+    return InlineKeyboardMarkup(buttons)
+
+
+def _admin_booking_line(booking: storage.Booking) -> str:
+    return f"{booking.session_date} ({booking.day}) • {booking.time} • {booking.slot_id} • {booking.trainer}"
+
+
+def _notify_admin_later(context: ContextTypes.DEFAULT_TYPE, kind: str, text: str, *bookings: storage.Booking) -> None:
+    """Сообщение персоналу о записях (адресаты — по слотам и тренерам, см. routing) фоновой задачей:
+    ответ пользователю не ждёт Bot API (задачи дожидаются при остановке)."""
+    router = context.bot_data["admin_router"]
+    destinations = []
+    for booking in bookings:
+        destinations.extend(d for d in router.resolve(kind, booking.slot_id, booking.trainer) if d not in destinations)
+    if destinations:
+        context.application.create_task(router.send(context.bot, destinations, text), name="notify_admin")
+
+
+def _board_notify(context: ContextTypes.DEFAULT_TYPE, kind: str, *bookings: storage.Booking) -> None:
+    """Панель записей (dashboard): сбросить таблицу тренировок и отправить событие в ленту."""
+    board = context.bot_data.get("board")
+    if board is not None:
+        board.notify(kind, *bookings)
+
+
+async def _upcoming_bookings(context: ContextTypes.DEFAULT_TYPE, user_id: int) -> list:
+    store = context.bot_data["bookings"]
+    return await asyncio.to_thread(store.upcoming, user_id, datetime.date.today().isoformat())
+
+
+async def cmd_mybookings(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/mybookings — ближайшие записи пользователя с кнопками «Отменить» и «Перенести»."""
+    if not update.message:
+        return
+    loc = _loc(update, context)
+    bookings = []
+    if "bookings" in context.bot_data:
+        bookings = await _upcoming_bookings(context, update.effective_user.id)
+    text, keyboard = _mybookings_screen(bookings, loc, context.bot_data["i18n"].default)
+    await update.message.reply_text(text, reply_markup=keyboard)
+
+
+async def mybookings_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Кнопки /mybookings: my:list | my:cancel:<id> | my:cancel_yes:<id> | my:move:<id> | my:to:<id>:<слот>:<тренер>."""
+    query = update.callback_query
+    store = context.bot_data.get("bookings")
+    if store is None:
+        await safe_answer(query)
+        return
+    loc = _loc(update, context)
+    t = loc.t
+    admin_loc = context.bot_data["i18n"].default
+    user = update.effective_user
+    parts = query.data.split(":")
+    action = parts[1]
+    today = datetime.date.today().isoformat()
+    back = InlineKeyboardMarkup([[InlineKeyboardButton(t.BTN_BACK_TO_BOOKINGS, callback_data="my:list")]])
+
+    if action == "list":
+        text, keyboard = _mybookings_screen(await _upcoming_bookings(context, user.id), loc, admin_loc)
+        await answer_and_edit(query, text, reply_markup=keyboard)
+        return
+
+    booking_id = int(parts[2])
+    bookings = dict(await _upcoming_bookings(context, user.id)) if action in ("cancel", "move") else {}
+    try:
+        if action == "cancel":
+            if booking_id not in bookings:
+                raise storage.BookingError(booking_id)
+            keyboard = InlineKeyboardMarkup([
+                [InlineKeyboardButton(t.BTN_CANCEL_BOOKING_YES, callback_data=f"my:cancel_yes:{booking_id}")],
+                [InlineKeyboardButton(t.BTN_BACK_TO_BOOKINGS, callback_data="my:list")],
+            ])
+            text = t.CANCEL_BOOKING_ASK.format(booking=_booking_line(bookings[booking_id], loc, admin_loc))
+            await answer_and_edit(query, text, reply_markup=keyboard)
+
+        elif action == "cancel_yes":
+            booking, refunded = await asyncio.to_thread(store.cancel, booking_id, user.id, today)
+            lines = [t.BOOKING_CANCELLED.format(booking=_booking_line(booking, loc, admin_loc))]
+            if refunded is not None:
+                lines.append(t.PASS_REFUNDED.format(remaining=refunded))
+            await answer_and_edit(query, "\n\n".join(lines), reply_markup=back)
+            admin_lines = [
+                "❌ Отмена записи",
+                "",
+                f"👤 {booking.name} ({booking.username}) · {booking.user_id}",
+                f"📅 {_admin_booking_line(booking)}",
+            ]
+            if refunded is not None:
+                admin_lines.append(f"🎟 Занятие возвращено на абонемент, осталось: {refunded}")
+            _notify_admin_later(context, "cancel", "\n".join(admin_lines), booking)
+            _board_notify(context, "cancel", booking)
+
+        elif action == "move":
+            if booking_id not in bookings:
+                raise storage.BookingError(booking_id)
+            booking = bookings[booking_id]
+            targets = _reschedule_targets(booking, loc, admin_loc, datetime.datetime.now())
+            text = t.MOVE_BOOKING_ASK.format(booking=_booking_line(booking, loc, admin_loc))
+            await answer_and_edit(query, text, reply_markup=_reschedule_keyboard(booking_id, targets, t))
+
+        elif action == "to":
+            slot_id, code = parts[3], parts[4]
+            content = admin_loc.content
+            day = next((d for d, slots in content.SLOTS_BY_DAY.items() if any(s == slot_id for s, _ in slots)), None)
+            if day not in storage.WEEKDAYS:
+                raise storage.BookingError(slot_id)
+            time_range = content.SLOT_TO_TIME.get(slot_id, "—")
+            address_type = content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
+            changes = {
+                "session_date": storage.next_session_date(day, time_range, datetime.datetime.now()).isoformat(),
+                "day": day,
+                "slot_id": slot_id,
+                "time": time_range,
+                "trainer": admin_loc.t.TRAINER_NAME.get(code) or content.SLOT_TO_TRAINER.get(slot_id, "—"),
+                "location": content.LOCATION_SHORT.get(address_type, "Калиновского, 111"),
+            }
+            capacity = _club(context).cfg.SLOT_CAPACITY.get(slot_id)
+            try:
+                old, new = await asyncio.to_thread(store.reschedule, booking_id, user.id, today, capacity, **changes)
+            except storage.SlotFullError:
+                booking = dict(await _upcoming_bookings(context, user.id)).get(booking_id)
+                if booking is None:
+                    raise
+                targets = _reschedule_targets(booking, loc, admin_loc, datetime.datetime.now())
+                await answer_and_edit(query, t.SLOT_FULL, reply_markup=_reschedule_keyboard(booking_id, targets, t))
+                return
+            await answer_and_edit(query, t.BOOKING_MOVED.format(booking=_booking_line(new, loc, admin_loc)), reply_markup=back)
+            _notify_admin_later(context, "move", "\n".join([
+                "🔁 Перенос записи",
+                "",
+                f"👤 {new.name} ({new.username}) · {new.user_id}",
+                f"Было: {_admin_booking_line(old)}",
+                f"Стало: {_admin_booking_line(new)}",
+            ]), old, new)
+            _board_notify(context, "move", old, new)
+            await _send_booking_ics(context, update.effective_chat.id, loc, admin_loc, new)
+        else:
+            await safe_answer(query)
+    except storage.BookingError:
+        await answer_and_edit(query, t.BOOKING_UNAVAILABLE, reply_markup=back)
+
+
+# --- /roster — отметка посещаемости тренером (админ видит все тренировки, тренер — свои) ---
+def _roster_scope(update: Update, context: ContextTypes.DEFAULT_TYPE) -> tuple:
+    """(доступ есть, тренер): тренер — имя из TRAINER_CHAT_IDS (None у админа — все тренировки)."""
+    if _is_admin(update, context):
+        return True, None
+    chat = update.effective_chat
+    trainers = _club(context).cfg.TRAINER_CHAT_IDS
+    # В пакете клуба (JSON) ключи — строки
+    trainer = trainers.get(chat.id) or trainers.get(str(chat.id)) if chat is not None else None
+    return trainer is not None, trainer
+
+
+async def _roster_sessions(context: ContextTypes.DEFAULT_TYPE, trainer) -> tuple:
+    store = context.bot_data["bookings"]
+    sessions = await asyncio.to_thread(store.sessions_between, *roster.session_window(datetime.date.today()), trainer)
+    return roster.sessions_screen(sessions, context.bot_data["i18n"].default.content.SLOT_TO_LABEL)
+
+
+async def _roster_page(context: ContextTypes.DEFAULT_TYPE, slot_id: str, session_date: str, page: int, rows=None) -> tuple:
+    if rows is None:
+        rows = await asyncio.to_thread(context.bot_data["bookings"].roster, slot_id, session_date)
+        rows = context.bot_data["attendance"].overlay(rows)
+    slot_label = context.bot_data["i18n"].default.content.SLOT_TO_LABEL.get(slot_id, slot_id)
+    return roster.roster_screen(rows, slot_id, session_date, page, slot_label)
+
+
+async def cmd_roster(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/roster — тренировки последних дней с записями; дальше — список по страницам с отметками."""
+    allowed, trainer = _roster_scope(update, context)
+    if not update.message or not allowed:
+        return
+    if "bookings" not in context.bot_data:
+        await update.message.reply_text("Хранилище записей выключено (BOOKINGS_DB в config.py).")
+        return
+    text, keyboard = await _roster_sessions(context, trainer)
+    await update.message.reply_text(text, reply_markup=keyboard)
+
+
+async def roster_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Кнопки /roster: roster:list | roster:s:<слот>:<дата>:<стр> | roster:t:<id>:<слот>:<дата>:<стр> | roster:close:<слот>:<дата>."""
+    query = update.callback_query
+    allowed, trainer = _roster_scope(update, context)
+    if not allowed or "bookings" not in context.bot_data:
+        await safe_answer(query)
+        return
+    parts = query.data.split(":")
+    action = parts[1]
+    if action == "list":
+        text, keyboard = await _roster_sessions(context, trainer)
+        await answer_and_edit(query, text, reply_markup=keyboard)
+        return
+    attendance = context.bot_data["attendance"]
+    if action == "t":
+        booking_id, slot_id, session_date, page = int(parts[2]), parts[3], parts[4], int(parts[5])
+        rows = attendance.overlay(await asyncio.to_thread(context.bot_data["bookings"].roster, slot_id, session_date))
+        for row in rows:
+            if row[0] == booking_id:
+                attendance.set(booking_id, roster.toggled(row[4]))
+                break
+        text, keyboard = await _roster_page(context, slot_id, session_date, page, attendance.overlay(rows))
+    elif action == "close":
+        slot_id, session_date = parts[2], parts[3]
+        # Сначала дописать отложенные отметки, затем неотмеченных — в «не пришли»
+        await attendance.flush()
+        await asyncio.to_thread(context.bot_data["bookings"].close_session, slot_id, session_date)
+        text, keyboard = await _roster_page(context, slot_id, session_date, 0)
+    else:
+        slot_id, session_date, page = parts[2], parts[3], int(parts[4])
+        text, keyboard = await _roster_page(context, slot_id, session_date, page)
+    await answer_and_edit(query, text, reply_markup=keyboard)
+
+
+async def cmd_sources(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/sources — откуда приходят (метки /start) и сколько из них записались."""
+    if not update.message or not _is_admin(update, context):
+        return
+    store = context.bot_data.get("bookings")
+    if store is None:
+        await update.message.reply_text("Хранилище записей выключено (BOOKINGS_DB в config.py).")
+        return
+    rows = await asyncio.to_thread(store.source_stats)
+    if not rows:
+        await update.message.reply_text("Переходов по /start пока нет.")
+        return
+    report = sources.report(rows, _club(context).cfg.START_SOURCES)
+    await update.message.reply_text(f"<pre>{escape(report[:3900])}</pre>", parse_mode="HTML")
+
+
+async def cmd_noshows(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/noshows — кто чаще всего записывается и не приходит (по отметкам /roster)."""
+    if not update.message or not _is_admin(update, context):
+        return
+    store = context.bot_data.get("bookings")
+    if store is None:
+        await update.message.reply_text("Хранилище записей выключено (BOOKINGS_DB в config.py).")
+        return
+    rows = await asyncio.to_thread(store.no_show_stats)
+    if not rows:
+        await update.message.reply_text("Пропусков пока нет.")
+        return
+    lines = ["Пропуски (не пришёл / пришёл)", ""]
+    lines += [
+        f"{no_show:>3} / {attended:<3} {name or '—'} · {user_id} ({no_show / (attended + no_show):.0%})"
+        for user_id, name, attended, no_show in rows
+    ]
+    await update.message.reply_text(f"<pre>{escape(chr(10).join(lines))}</pre>", parse_mode="HTML")
+
+
+async def cmd_sessions(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/sessions — живые сессии в памяти: user_data, незавершённые диалоги, сколько вытеснено по TTL."""
+    if not update.message or not _is_admin(update, context):
+        return
+    report = context.bot_data["sessions"].report(context.application)
+    await update.message.reply_text(f"<pre>{escape(report)}</pre>", parse_mode="HTML")
+
+
+_MEMSTATS_USAGE = (
+    "Использование: /memstats — сводка; /memstats start [кадров] — включить tracemalloc и снять базовый снимок; "
+    "/memstats diff [N] — рост с базового снимка; /memstats top [N] — где больше всего памяти; "
+    "/memstats rebase — новый базовый снимок; /memstats stop — выключить"
+)
+
+
+async def cmd_memstats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/memstats [start|diff|top|rebase|stop] — память процесса: RSS, user_data, диалоги, кэши; снимки tracemalloc."""
+    if not update.message or not _is_admin(update, context):
+        return
+    args = context.args or []
+    action = args[0].lower() if args else ""
+    tracer = memstats.tracer
+    try:
+        number = int(args[1]) if len(args) > 1 else None
+        if action not in ("", "start", "diff", "top", "rebase", "stop") or (number is not None and number <= 0):
+            raise ValueError(args)
+    except ValueError:
+        await update.message.reply_text(_MEMSTATS_USAGE)
+        return
+    try:
+        if action == "":
+            text = memstats.report(context.application)
+        elif action == "start":
+            tracer.start(min(number or 1, 25))
+            text = f"tracemalloc включён ({tracer.frames} кадр.), базовый снимок снят. Дальше — /memstats diff."
+        elif action == "stop":
+            tracer.stop()
+            text = "tracemalloc выключен."
+        else:
+            tracer.require()
+            # Сравнение снимков — секунды: в фоне, чтобы не держать очередь апдейтов
+            job = {"rebase": tracer.rebase, "diff": tracer.diff, "top": tracer.top}[action]
+            job_args = () if action == "rebase" else (min(number or 10, 30),)
+            context.application.create_task(_memstats_job(update.message, job, job_args), name="memstats")
+            return
+    except RuntimeError as e:
+        text = f"Нельзя: {e}."
+    await update.message.reply_text(f"<pre>{escape(text[:3900])}</pre>", parse_mode="HTML")
+
+
+async def _memstats_job(message, job, job_args: tuple) -> None:
+    try:
+        text = await asyncio.to_thread(job, *job_args) or "Новый базовый снимок снят."
+    except RuntimeError as e:
+        text = f"Нельзя: {e}."
+    try:
+        await message.reply_text(f"<pre>{escape(text[:3900])}</pre>", parse_mode="HTML")
+    except TelegramError as e:
+        logger.warning("Не удалось отправить отчёт /memstats: %s", e)
+
+
+# --- Истёкшая сессия: диалог прерван вытеснением (см. sessions.py) ---
+async def notify_session_expired(app, user_id: int, chat_id: int, states: dict, language_code=None):
+    """Сообщить пользователю, что незавершённый диалог сброшен; брошенная запись — уход из воронки."""
+    if "register" in states:
+        app.bot_data["funnel"].record("session_expired", states["register"], ConversationHandler.END)
+    loc = app.bot_data["i18n"].resolve(user_id, language_code)
+    await app.bot.send_message(chat_id, loc.t.SESSION_EXPIRED, reply_markup=loc.kb.main_menu)
+
+
+# --- /lang — выбор языка (хранится отдельно от user_data, см. i18n.Locales) ---
+async def cmd_lang(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.message:
+        return
+    loc = _loc(update, context)
+    await update.message.reply_text(loc.t.LANG_PROMPT, reply_markup=loc.kb.lang)
+
+
+async def lang_choose(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    code = query.data.replace("lang:", "")
+    loc = context.bot_data["i18n"].set_preference(update.effective_user.id, code)
+    await answer_and_edit(query, f"{loc.t.LANG_SET}\n\n{loc.t.MENU_PROMPT}", reply_markup=loc.kb.main_menu)
+
+
 # --- Команды меню: /menu, /register, /prices, /schedule, /location, /question, /restart ---
 async def cmd_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Команда /menu — показать главное меню."""
     if not update.message:
         return ConversationHandler.END
     context.user_data.pop("reg", None)
-    await update.message.reply_text(
-        "Чем помочь?\n\nВыберите 👇",
-        reply_markup=main_menu_keyboard(),
-    )
+    loc = _loc(update, context)
+    await update.message.reply_text(loc.t.MENU_PROMPT, reply_markup=loc.kb.main_menu)
     return ConversationHandler.END
 
 
@@ -355,10 +1206,8 @@ async def cmd_register_entry(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if not update.message:
         return ConversationHandler.END
     context.user_data["reg"] = {}
-    await update.message.reply_text(
-        "Выберите день недели 👇",
-        reply_markup=_day_keyboard(),
-    )
+    loc = _loc(update, context)
+    await update.message.reply_text(loc.t.CHOOSE_DAY, reply_markup=loc.kb.day)
     return REG_DAY
 
 
@@ -367,31 +1216,22 @@ async def cmd_prices(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return
     context.user_data.pop("reg", None)
-    text, keyboard = get_price_text_and_keyboard()
+    text, keyboard = get_price_text_and_keyboard(_loc(update, context))
     await update.message.reply_text(text, reply_markup=keyboard)
 
 
 async def cmd_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Команда /schedule — показать расписание."""
     if not update.message:
-        return
-    context.user_data.pop("reg", None)
-    try:
-        text = _build_schedule_text()
-    except Exception as e:
-        logger.exception("Ошибка в cmd_schedule: %s", e)
-        text = "Расписание\n\nНе удалось загрузить данные. Попробуйте позже или напишите в чат 👇"
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("📍 Адрес", callback_data="menu:locations"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-    await update.message.reply_text(text, reply_markup=keyboard)
+        return
+    context.user_data.pop("reg", None)
+    loc = _loc(update, context)
+    try:
+        text = _build_schedule_text(loc)
+    except Exception as e:
+        logger.exception("Ошибка в cmd_schedule: %s", e)
+        text = loc.t.SCHEDULE_ERROR
+    await update.message.reply_text(text, reply_markup=loc.kb.address_nav)
 
 
 async def cmd_location(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -399,8 +1239,8 @@ async def cmd_location(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return
     context.user_data.pop("reg", None)
-    text = "Адрес\n\nВыберите тип тренировки 👇"
-    await update.message.reply_text(text, reply_markup=_locations_choice_keyboard())
+    loc = _loc(update, context)
+    await update.message.reply_text(loc.t.LOCATIONS_PROMPT, reply_markup=loc.kb.locations_choice)
 
 
 async def cmd_question(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -408,10 +1248,8 @@ async def cmd_question(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return
     context.user_data.pop("reg", None)
-    await update.message.reply_text(
-        "Выберите тему 👇",
-        reply_markup=_question_topics_keyboard(),
-    )
+    loc = _loc(update, context)
+    await update.message.reply_text(loc.t.CHOOSE_TOPIC, reply_markup=loc.kb.question_topics)
 
 
 async def cmd_restart(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -419,21 +1257,18 @@ async def cmd_restart(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return ConversationHandler.END
     context.user_data.pop("reg", None)
-    text = (
-        "Привет 👋\n\n"
-        "• Запись на тренировку\n"
-        "• Ответы на вопросы\n\n"
-        "Нажмите кнопку ниже 👇"
-    )
-    await update.message.reply_text(text, reply_markup=start_welcome_keyboard())
+    loc = _loc(update, context)
+    await update.message.reply_text(loc.t.RESTART_TEXT, reply_markup=loc.kb.start_welcome)
     return ConversationHandler.END
 
 
 # --- Пересылка входящих текстовых сообщений админу ---
 async def notify_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Отправляет админу имя, username и текст сообщения пользователя. Вызывается после основных обработчиков (group=99)."""
-    if not config.ADMIN_CHAT_ID:
-        # TODO: подставьте свой chat_id в config.ADMIN_CHAT_ID (узнать через /myid)
+    router = context.bot_data["admin_router"]
+    destinations = router.resolve("message")
+    if not destinations:
+        # Не бывает при проверенных настройках (settings.staff_errors): сообщения без адресата не пересылаются
         return
     if not update.message or not update.message.text:
         return
@@ -451,334 +1286,292 @@ async def notify_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"chat_id: {user.id}\n\n"
         f"Текст: {safe_text}"
     )
-    try:
-        await context.bot.send_message(
-            chat_id=config.ADMIN_CHAT_ID,
-            text=msg,
-            parse_mode="HTML",
-        )
-    except Exception as e:
-        logger.warning("Не удалось отправить сообщение админу: %s", e)
+    await router.send(context.bot, destinations, msg, parse_mode="HTML")
 
 
 # --- Сценарий: Записаться (день → время/слот → уровень → контакт → подтверждение) ---
-def _day_keyboard():
-    """Кнопки дней недели с эмодзи типа тренировки (🏃‍♂️ бег, 🏋️‍♂️ зал) + выход."""
-    buttons = [
-        [InlineKeyboardButton(DAY_EMOJI_LABEL.get(day, label), callback_data=f"reg:day:{day}")]
-        for day, label in DAY_BUTTONS
-    ]
-    buttons.append([
-        InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-        InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-    ])
-    return InlineKeyboardMarkup(buttons)
-
-
-def _slot_keyboard(day: str):
-    """Кнопки слотов только для выбранного дня (без лишних вариантов)."""
-    slots = SLOTS_BY_DAY.get(day, [])
-    buttons = [
-        [InlineKeyboardButton(label, callback_data=f"reg:slot:{slot_id}")]
-        for slot_id, label in slots
-    ]
-    buttons.append([
-        InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-        InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-    ])
-    return InlineKeyboardMarkup(buttons)
-
-
-def _trainer_keyboard():
-    """Кнопки выбора тренера для понедельника и среды (Даша / Максим)."""
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("Даша", callback_data="reg:trainer:dasha"),
-            InlineKeyboardButton("Максим", callback_data="reg:trainer:maxim"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
-def _level_keyboard():
-    """Кнопки уровня + выход."""
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("Новичок", callback_data="reg:level:newbie"),
-            InlineKeyboardButton("Средний", callback_data="reg:level:medium"),
-        ],
-        [
-            InlineKeyboardButton("Продвинутый", callback_data="reg:level:advanced"),
-            InlineKeyboardButton("Не знаю", callback_data="reg:level:unknown"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
 async def menu_register(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data["reg"] = {}
-    await query.edit_message_text(
-        "Выберите день недели 👇",
-        reply_markup=_day_keyboard(),
-    )
+    loc = _loc(update, context)
+    await answer_and_edit(query, loc.t.CHOOSE_DAY, reply_markup=loc.kb.day)
     return REG_DAY
 
 
 async def reg_choose_day(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     day = query.data.replace("reg:day:", "")
     context.user_data["reg"]["day"] = day
-    keyboard = _slot_keyboard(day)
-    await query.edit_message_text(
-        "Выберите тренировку 👇",
-        reply_markup=keyboard,
-    )
+    loc = _loc(update, context)
+    await answer_and_edit(query, loc.t.CHOOSE_SLOT, reply_markup=loc.kb.slots.get(day, loc.kb.no_slots))
     return REG_SLOT
 
 
 async def reg_choose_slot(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     slot_id = query.data.replace("reg:slot:", "")
     r = context.user_data["reg"]
     r["slot_id"] = slot_id
-    r["slot"] = SLOT_TO_LABEL.get(slot_id, slot_id)
-    # Понедельник и среда: сначала выбор тренера (Даша / Максим)
-    if slot_id in ("mon_run", "wed_run"):
-        await query.edit_message_text(
-            "Выберите тренера 👇",
-            reply_markup=_trainer_keyboard(),
-        )
+    loc = _loc(update, context)
+    # Слот без тренера в SLOT_TO_TRAINER (у клуба по умолчанию — беговые пн и ср): сначала выбор тренера
+    if slot_id not in loc.content.SLOT_TO_TRAINER:
+        await answer_and_edit(query, loc.t.CHOOSE_TRAINER, reply_markup=loc.kb.trainer)
         return REG_TRAINER
     # Силовые (зал) и остальные слоты: сразу уровень (рекомендации по форме — только после подтверждения)
-    await query.edit_message_text(
-        "Ваш уровень?\n\nНажмите кнопку ниже 👇",
-        reply_markup=_level_keyboard(),
-    )
+    await answer_and_edit(query, loc.t.ASK_LEVEL, reply_markup=loc.kb.level)
     return REG_LEVEL
 
 
 async def reg_choose_trainer(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Сохранить тренера (Даша/Максим) для пн/ср и перейти к уровню."""
+    """Сохранить тренера (dasha/maxim) для слота без SLOT_TO_TRAINER и перейти к уровню."""
     query = update.callback_query
-    await query.answer()
-    trainer = query.data.replace("reg:trainer:", "")  # dasha | maxim
-    trainer_label = "Даша" if trainer == "dasha" else "Максим"
-    r = context.user_data["reg"]
-    r["trainer"] = trainer_label
-    base = SLOT_TO_LABEL.get(r.get("slot_id", ""), "")
-    r["slot"] = f"{base}, {trainer_label}"
-    await query.edit_message_text(
-        "Ваш уровень?\n\nНажмите кнопку ниже 👇",
-        reply_markup=_level_keyboard(),
-    )
+    context.user_data["reg"]["trainer"] = query.data.replace("reg:trainer:", "")
+    loc = _loc(update, context)
+    await answer_and_edit(query, loc.t.ASK_LEVEL, reply_markup=loc.kb.level)
     return REG_LEVEL
 
 
 async def reg_choose_level(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
-    level_map = {"newbie": "Новичок", "medium": "Средний", "advanced": "Продвинутый", "unknown": "Не знаю"}
-    part = query.data.replace("reg:level:", "")
-    context.user_data["reg"]["level"] = level_map.get(part, part)
-    await query.edit_message_text(
-        "Контакт для связи\n\n"
-        "• Имя и телефон или @ник в Telegram\n\n"
-        "Напишите одним сообщением 👇",
-        reply_markup=InlineKeyboardMarkup([
-            [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-        ]),
-    )
+    # В reg — коды (newbie, medium, ...): подписи на языке того, кто читает (пользователь, админ)
+    context.user_data["reg"]["level"] = query.data.replace("reg:level:", "")
+    loc = _loc(update, context)
+    await answer_and_edit(query, loc.t.ASK_CONTACT, reply_markup=loc.kb.restart)
     return REG_CONTACT
 
 
-def _build_confirmation_line(r: dict) -> str:
+def _user_display_name(user) -> str:
+    name_part = (user.first_name or "").strip()
+    if user.last_name:
+        name_part = (name_part + " " + (user.last_name or "").strip()).strip()
+    if not name_part and user.username:
+        name_part = f"@{user.username}"
+    return name_part or "—"
+
+
+def _navigator_line(t, location_line: str) -> str:
+    geo_url_escaped = _location_geo_url(location_line).replace("&", "&amp;")
+    return t.NAVIGATOR_LINE.format(url=geo_url_escaped)
+
+
+def _build_confirmation_line(r: dict, loc: i18n.LocaleBundle) -> str:
     """Одна строка подтверждения: день • тип (формат/место) • время • уровень (без эмодзи)."""
-    day_label = DAY_LABEL.get(r.get("day", ""), "—")
+    t, content = loc.t, loc.content
+    day_label = t.DAY_LABEL.get(r.get("day", ""), "—")
     slot_id = r.get("slot_id", "")
-    address_type = SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
-    card_label = CARD_TRAINING_LABEL.get(address_type, "—")
-    time_str = SLOT_TO_TIME.get(slot_id, "—")
-    level = r.get("level", "—")
+    address_type = content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
+    card_label = t.CARD_TRAINING_LABEL.get(address_type, "—")
+    time_str = content.SLOT_TO_TIME.get(slot_id, "—")
+    level = t.LEVEL_LABEL.get(r.get("level"), "—")
     return f"{day_label} • {card_label} • {time_str} • {level}"
 
 
-def _build_check_message(r: dict, user) -> str:
+def _build_check_message(r: dict, user, loc: i18n.LocaleBundle) -> str:
     """Сообщение проверки для клиента: без строки-резюме, карточка + навигатор (HTML-ссылка)."""
+    t, content = loc.t, loc.content
     slot_id = r.get("slot_id", "")
-    address_type = SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
-    location_line = LOCATION_SHORT.get(address_type, "Калиновского, 111")
-    day_label = DAY_LABEL.get(r.get("day", ""), "—")
-    card_label = CARD_TRAINING_LABEL.get(address_type, "—")
-    time_str = SLOT_TO_TIME.get(slot_id, "—")
-    level = r.get("level", "—")
-    contact = r.get("contact", "—")
-    name_part = (user.first_name or "").strip()
-    if user.last_name:
-        name_part = (name_part + " " + (user.last_name or "").strip()).strip()
-    if not name_part and user.username:
-        name_part = f"@{user.username}"
-    if not name_part:
-        name_part = "—"
-    geo_url = _location_geo_url(location_line)
-    geo_url_escaped = geo_url.replace("&", "&amp;")
-    navigator_line = f'🧭 Навигатор: <a href="{geo_url_escaped}">Открыть локацию</a>'
-    lines = [
-        "Проверьте, пожалуйста, правильно ли заполнены данные:",
-        "",
-        "📝 Новая запись на тренировку",
-        "",
-        f"👤 Имя: {escape(name_part)}",
-        f"📞 Контакт: {escape(contact)}",
-        f"📅 День: {escape(day_label)}",
-        f"🏃‍♂️ Тренировка: {escape(card_label)}",
-        f"⏰ Время: {escape(time_str)}",
-        f"🎯 Уровень: {escape(level)}",
-        f"📍 Локация: {escape(location_line)}",
-        navigator_line,
-        "",
-        "Всё верно? 👇",
-    ]
-    return "\n".join(lines)
+    address_type = content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
+    location_line = content.LOCATION_SHORT.get(address_type, "Калиновского, 111")
+    return t.CHECK_CARD.format(
+        name=escape(_user_display_name(user)),
+        contact=escape(r.get("contact", "—")),
+        day=escape(t.DAY_LABEL.get(r.get("day", ""), "—")),
+        training=escape(t.CARD_TRAINING_LABEL.get(address_type, "—")),
+        time=escape(content.SLOT_TO_TIME.get(slot_id, "—")),
+        level=escape(t.LEVEL_LABEL.get(r.get("level"), "—")),
+        location=escape(location_line),
+        navigator=_navigator_line(t, location_line),
+    )
 
 
 async def reg_contact(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    loc = _loc(update, context)
     if not update.message or not update.message.text:
-        await update.message.reply_text(
-            "Напишите имя и контакт одним сообщением 👇",
-            reply_markup=restart_keyboard(),
-        )
+        await update.message.reply_text(loc.t.ASK_CONTACT_AGAIN, reply_markup=loc.kb.restart)
         return REG_CONTACT
     context.user_data["reg"]["contact"] = update.message.text.strip()
     r = context.user_data["reg"]
-    user = update.effective_user
-    keyboard = InlineKeyboardMarkup([
-        [InlineKeyboardButton("✅ Да", callback_data="reg:confirm:yes")],
-        [InlineKeyboardButton("Изменить", callback_data="reg:confirm:change")],
-        [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-    ])
-    text = _build_check_message(r, user)
-    await update.message.reply_text(text, reply_markup=keyboard, parse_mode="HTML")
+    text = _build_check_message(r, update.effective_user, loc)
+    await update.message.reply_text(text, reply_markup=loc.kb.confirm, parse_mode="HTML")
     return REG_CONFIRM
 
 
-def _build_admin_registration_text(r: dict, user, location_line: str, address_type: str, slot_id: str) -> str:
-    """Формирует текст формы записи для отправки администратору (без parse_mode).
+def _build_admin_registration_text(r: dict, user, location_line: str, address_type: str, slot_id: str, admin_loc,
+                                   source_label: str = None) -> str:
+    """Формирует текст формы записи для отправки администратору (без parse_mode), на языке бота по умолчанию.
     День и время — отдельными строками; в строке «Тренировка» только тип (Беговая / Силовая (зал) / Длительная).
     """
-    name_part = (user.first_name or "").strip()
-    if user.last_name:
-        name_part = (name_part + " " + (user.last_name or "").strip()).strip()
-    if not name_part and user.username:
-        name_part = f"@{user.username}"
-    if not name_part:
-        name_part = "—"
-    day_label = DAY_LABEL.get(r.get("day", ""), "—")
+    t = admin_loc.t
+    day_label = t.DAY_LABEL.get(r.get("day", ""), "—")
     training_label = ADMIN_TRAINING_LABEL.get(address_type, "—")
-    time_str = SLOT_TO_TIME.get(slot_id, "—")
+    time_str = admin_loc.content.SLOT_TO_TIME.get(slot_id, "—")
     lines = [
         "📝 Новая запись на тренировку",
         "",
-        f"👤 Имя: {name_part}",
+        f"👤 Имя: {_user_display_name(user)}",
         f"📞 Контакт: {r.get('contact', '—')}",
         f"📅 День: {day_label}",
         f"🏃‍♂️ Тренировка: {training_label}",
         f"⏰ Время: {time_str}",
-        f"🎯 Уровень: {r.get('level', '—')}",
+        f"🎯 Уровень: {t.LEVEL_LABEL.get(r.get('level'), '—')}",
         f"📍 Локация: {location_line}",
     ]
+    if source_label:
+        lines.append(f"🔗 Источник: {source_label}")
     return "\n".join(lines)
 
 
+def _build_booking(r: dict, user, slot_id: str, admin_loc, lang: str) -> storage.Booking:
+    """Строка хранилища записей: подписи — на языке бота по умолчанию, как в форме админу."""
+    t, content = admin_loc.t, admin_loc.content
+    day = r.get("day", "")
+    time_range = content.SLOT_TO_TIME.get(slot_id, "—")
+    trainer = r.get("trainer")
+    address_type = content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
+    now = datetime.datetime.now()
+    session_date = storage.next_session_date(day, time_range, now) if day in storage.WEEKDAYS else now.date()
+    return storage.Booking(
+        created_at=now.isoformat(sep=" ", timespec="seconds"),
+        session_date=session_date.isoformat(),
+        day=day,
+        slot_id=slot_id,
+        time=time_range,
+        trainer=t.TRAINER_NAME.get(trainer, trainer) if trainer else content.SLOT_TO_TRAINER.get(slot_id, "—"),
+        level=t.LEVEL_LABEL.get(r.get("level"), "—"),
+        location=content.LOCATION_SHORT.get(address_type, "Калиновского, 111"),
+        user_id=user.id,
+        username=f"@{user.username}" if user.username else "—",
+        name=_user_display_name(user),
+        contact=r.get("contact", "—"),
+        lang=lang,
+    )
+
+
 async def reg_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
+    reply = CallbackReply(query)
+    loc = _loc(update, context)
+    t = loc.t
     if query.data == "reg:confirm:change":
-        await query.edit_message_text(
-            "Выберите день недели 👇",
-            reply_markup=_day_keyboard(),
-        )
+        await reply.edit(t.CHOOSE_DAY, reply_markup=loc.kb.day)
         return REG_DAY
     # Да — одно финальное сообщение: подтверждение + локация + «что взять» (адрес отдельно не отправляем)
     r = context.user_data["reg"]
+    club = _club(context)
+    content = loc.content
     slot_id = r.get("slot_id", "")
-    address_type = SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
-    location_line = LOCATION_SHORT.get(address_type, "Калиновского, 111")
+    address_type = content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
+    location_line = content.LOCATION_SHORT.get(address_type, "Калиновского, 111")
+    # Ответить на нажатие сразу, не дожидаясь отправки формы админу
+    reply.ack()
+    admin_loc = context.bot_data["i18n"].default
+
+    # Сохранить запись: места (SLOT_CAPACITY), абонемент, /mybookings, /roster и выгрузки — по базе,
+    # поэтому без сохранённой записи подтверждения нет
+    booking = _build_booking(r, update.effective_user, slot_id, admin_loc, loc.code)
+    # Абонемент (если есть) списывается в той же транзакции, что и запись (PASS_DEBIT_ON = "booking")
+    pass_left = None
+    store = context.bot_data.get("bookings")
+    # Метка — из сессии (/start), а если сессия уже вытеснена по TTL — из базы
+    source = context.user_data.get("source")
+    if store is not None:
+        try:
+            if source is None:
+                source = await asyncio.to_thread(store.user_source, update.effective_user.id)
+            _booking_id, pass_left = await store.add(
+                booking, debit_pass=club.cfg.PASS_DEBIT_ON == "booking", capacity=club.cfg.SLOT_CAPACITY.get(slot_id),
+                source=source,
+            )
+        except storage.SlotFullError:
+            # Мест не осталось (SLOT_CAPACITY) — выбрать другой день; контакт и уровень сохраняются
+            await reply.edit(t.SLOT_FULL, reply_markup=loc.kb.day)
+            return REG_DAY
+        except Exception as e:
+            logger.exception("Не удалось сохранить запись: %s", e)
+            # Ни персоналу, ни .ics: запись остаётся на шаге подтверждения, «Да» можно нажать ещё раз
+            await reply.edit(t.BOOKING_SAVE_FAILED, reply_markup=loc.kb.confirm)
+            return REG_CONFIRM
+        else:
+            _board_notify(context, "booking", booking)
 
-    # Тихо отправить копию формы администратору (пользователь не видит)
-    if config.ADMIN_CHAT_ID:
+    # Тихо отправить копию формы персоналу (пользователь не видит): адресаты — по слоту и тренеру, см. routing
+    destinations = context.bot_data["admin_router"].resolve("booking", booking.slot_id, booking.trainer)
+    if destinations:
         try:
             user = update.effective_user
-            admin_text = _build_admin_registration_text(r, user, location_line, address_type, slot_id)
-            await context.bot.send_message(chat_id=config.ADMIN_CHAT_ID, text=admin_text)
+            # «Без метки» в форме не показываем — только переходы по ссылкам
+            source_label = sources.label(source, club.cfg.START_SOURCES) if source not in (None, sources.DIRECT) else None
+            admin_text = _build_admin_registration_text(
+                r, user, location_line, address_type, slot_id, admin_loc, source_label
+            )
+            await context.bot_data["admin_router"].send(context.bot, destinations, admin_text)
         except Exception as e:
             logger.exception("Не удалось отправить форму записи админу: %s", e)
 
-    day_label = DAY_LABEL.get(r.get("day", ""), "—")
-    card_training_label = CARD_TRAINING_LABEL.get(address_type, "—")
-    time_raw = SLOT_TO_TIME.get(slot_id, "—")
-    time_display = ("с " + time_raw.replace("–", " до ", 1)) if "–" in time_raw else time_raw
-    trainer_name = r.get("trainer") or SLOT_TO_TRAINER.get(slot_id, "—")
-    level = r.get("level", "—")
-
-    geo_url = _location_geo_url(location_line)
-    geo_url_escaped = geo_url.replace("&", "&amp;")
-    navigator_line = f'🧭 Навигатор: <a href="{geo_url_escaped}">Открыть локацию</a>'
+    time_raw = content.SLOT_TO_TIME.get(slot_id, "—")
+    if "–" in time_raw:
+        start, end = time_raw.split("–", 1)
+        time_display = t.TIME_RANGE.format(start=start, end=end)
+    else:
+        time_display = time_raw
+    trainer = r.get("trainer")
+    trainer_name = t.TRAINER_NAME.get(trainer, trainer) if trainer else content.SLOT_TO_TRAINER.get(slot_id, "—")
 
     lines = [
-        "Записали вас ✅",
+        t.CONFIRMED_CARD.format(
+            day=escape(t.DAY_LABEL.get(r.get("day", ""), "—")),
+            training=escape(t.CARD_TRAINING_LABEL.get(address_type, "—")),
+            time=escape(time_display),
+            level=escape(t.LEVEL_LABEL.get(r.get("level"), "—")),
+            location=escape(location_line),
+            navigator=_navigator_line(t, location_line),
+            trainer=escape(trainer_name),
+        ),
         "",
-        f"📅 День: {escape(day_label)}",
-        f"🏃‍♂️ Тренировка: {escape(card_training_label)}",
-        f"⏰ Время: {escape(time_display)}",
-        f"🎯 Уровень: {escape(level)}",
-        f"📍 Локация: {escape(location_line)}",
-        navigator_line,
-        f"👤 Тренер: {escape(trainer_name)}",
+        t.FORM_GYM_AFTER_CONFIRM if address_type == "gym" else t.FORM_RUN_AFTER_CONFIRM,
         "",
+        content.FINAL_CONFIRM_FOOTER,
     ]
-    if address_type == "gym":
-        lines.append(FORM_GYM_AFTER_CONFIRM)
-    else:
-        lines.append(FORM_RUN_AFTER_CONFIRM)
-    lines.append("")
-    lines.append(FINAL_CONFIRM_FOOTER)
-    if config.PAYMENT_INFO:
-        lines.append(f"Оплата: {config.PAYMENT_INFO}")
-    if config.CONTACT_ADMIN:
-        lines.append(f"Контакт: {config.CONTACT_ADMIN}")
-    final_keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-    await query.edit_message_text("\n".join(lines), reply_markup=final_keyboard, parse_mode="HTML")
+    if pass_left is not None:
+        lines.append(t.PASS_DEBITED.format(remaining=pass_left))
+    elif club.cfg.PAYMENT_INFO:
+        lines.append(t.PAYMENT_LINE.format(info=club.cfg.PAYMENT_INFO))
+    if club.cfg.CONTACT_ADMIN:
+        lines.append(t.CONTACT_LINE.format(contact=club.cfg.CONTACT_ADMIN))
+    await reply.edit("\n".join(lines), reply_markup=loc.kb.menu_and_restart, parse_mode="HTML")
     context.user_data.pop("reg", None)
+
+    # Файл .ics — добавить тренировку в календарь
+    await _send_booking_ics(context, update.effective_chat.id, loc, admin_loc, booking)
     return ConversationHandler.END
 
 
-# --- Цены: выбор тренера (Максим | Даша / Виталик) ---
-def _price_choice_keyboard():
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("Максим | Даша", callback_data="price:maksim_dasha")],
-        [InlineKeyboardButton("Виталик", callback_data="price:vitalik")],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
+async def _send_booking_ics(context: ContextTypes.DEFAULT_TYPE, chat_id: int, loc: i18n.LocaleBundle,
+                            admin_loc: i18n.LocaleBundle, booking: storage.Booking) -> None:
+    """Отправить .ics записи (если ICS_ON_CONFIRM); не удалось — только в лог."""
+    club = _club(context)
+    if not club.cfg.ICS_ON_CONFIRM:
+        return
+    address_type = loc.content.SLOT_TO_ADDRESS_TYPE.get(booking.slot_id, "run")
+    training = loc.t.CARD_TRAINING_LABEL.get(address_type, "—")
+    # UID по пользователю, слоту и дате: повторная запись на ту же тренировку обновит событие, а не продублирует
+    uid = f"booking-{club.club_id}-{booking.user_id}-{booking.slot_id}-{booking.session_date}@{ical.UID_DOMAIN}"
+    ics = ical.booking_ics(
+        uid, booking.session_date, booking.time, club.cfg.ICS_TIMEZONE,
+        f"{training} — {_booking_trainer(booking, loc, admin_loc)}",
+        loc.content.LOCATION_SHORT.get(address_type, "Калиновского, 111"), club.cfg.CLUB_NAME,
+    )
+    if ics is None:
+        return
+    try:
+        await context.bot.send_document(
+            chat_id, ics, filename=f"training-{booking.session_date}.ics", caption=loc.t.ICS_CAPTION
+        )
+    except TelegramError as e:
+        logger.warning("Не удалось отправить .ics: %s", e)
 
 
+# --- Цены: выбор тренера (Максим | Даша / Виталик) ---
 PRICE_TEXT_MAKSIM_DASHA = (
     "💰 Цены на тренировки\n\n"
     "Максим\n"
@@ -802,200 +1595,116 @@ VITALIK_INFO_TEXT = (
 )
 
 
-def _price_maksim_dasha_keyboard():
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-        ],
-        [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-    ])
-
-
 async def menu_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        "Выберите тренера 👇",
-        reply_markup=_price_choice_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.t.PRICE_PROMPT,
+        reply_markup=loc.kb.price_choice,
     )
     return ConversationHandler.END
 
 
 async def price_maksim_dasha(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        PRICE_TEXT_MAKSIM_DASHA,
-        reply_markup=_price_maksim_dasha_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.content.PRICE_TEXT_MAKSIM_DASHA,
+        reply_markup=loc.kb.register_and_menu,
     )
     return ConversationHandler.END
 
 
 async def price_vitalik(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        VITALIK_INFO_TEXT,
-        reply_markup=_price_maksim_dasha_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.content.VITALIK_INFO_TEXT,
+        reply_markup=loc.kb.register_and_menu,
     )
     return ConversationHandler.END
 
 
-def get_price_text_and_keyboard():
+def get_price_text_and_keyboard(loc: i18n.LocaleBundle):
     """Для триггера по тексту «цена» и /prices: показываем выбор тренера (то же, что menu_price)."""
-    text = "Выберите тренера 👇"
-    keyboard = _price_choice_keyboard()
-    return text, keyboard
+    return loc.t.PRICE_PROMPT, loc.kb.price_choice
 
 
 # --- Сценарий: Адрес ---
 async def menu_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("reg", None)
-    await _reply_address(update, is_callback=True)
+    await _reply_address(update, is_callback=True, cfg=_club(context).cfg, loc=_loc(update, context))
     return ConversationHandler.END
 
 
 async def address_transport(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
-    if query.data == "addr:car":
-        msg = (
-            "Парковка\n\n"
-            "• У места старта\n"
-            "• Геоточку или подсказку — напишите, скину или передам админу\n\n"
-            "Записать на тренировку? 👇"
-        )
-    else:
-        msg = (
-            "Пешком / транспорт\n\n"
-            "• Маршрут от метро/остановки — у админа или скину гео\n"
-            "• Напишите район — подскажу\n\n"
-            "Записать на тренировку? 👇"
-        )
-    await query.edit_message_text(
-        msg,
-        reply_markup=InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-                InlineKeyboardButton("📍 Адрес", callback_data="menu:locations"),
-            ],
-            [
-                InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-                InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-            ],
-        ]),
-    )
+    loc = _loc(update, context)
+    msg = loc.t.ADDRESS_CAR if query.data == "addr:car" else loc.t.ADDRESS_WALK
+    await answer_and_edit(query, msg, reply_markup=loc.kb.address_nav)
     return ConversationHandler.END
 
 
 # --- Сценарий: Что надеть (Зал / Манеж / Улица) ---
-def _form_place_keyboard():
-    """Три кнопки: Зал, Манеж, Улица."""
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("Зал", callback_data="form:gym")],
-        [InlineKeyboardButton("Манеж", callback_data="form:manege")],
-        [InlineKeyboardButton("Улица", callback_data="form:street")],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
-def _form_weather_keyboard():
-    """Четыре кнопки погоды для «Улица»."""
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("Тепло", callback_data="form:weather:warm"),
-            InlineKeyboardButton("Прохладно", callback_data="form:weather:cool"),
-        ],
-        [
-            InlineKeyboardButton("Холодно", callback_data="form:weather:cold"),
-            InlineKeyboardButton("Дождь", callback_data="form:weather:rain"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
-def _form_result_keyboard():
-    """Кнопки после показа текста «Что надеть» — только навигация, без адреса и ссылок (раздел исключительно информационный)."""
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
 async def menu_form(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("reg", None)
-    await _reply_form(update, is_callback=True)
+    await _reply_form(update, is_callback=True, loc=_loc(update, context))
     return ConversationHandler.END
 
 
 async def form_place(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработка выбора: Зал / Манеж / Улица."""
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
+    loc = _loc(update, context)
+    t, kb = loc.t, loc.kb
     data = query.data.replace("form:", "")
     if data == "gym":
-        await query.edit_message_text(
-            FORM_WEAR_GYM,
-            reply_markup=_form_result_keyboard(),
-        )
+        # Кнопки после текста «Что надеть» — только навигация (раздел исключительно информационный)
+        await answer_and_edit(query, t.FORM_WEAR_GYM, reply_markup=kb.menu_and_restart)
     elif data == "manege":
-        await query.edit_message_text(
-            FORM_WEAR_MANEGE,
-            reply_markup=_form_result_keyboard(),
-        )
+        await answer_and_edit(query, t.FORM_WEAR_MANEGE, reply_markup=kb.menu_and_restart)
     else:
         # Улица — показать выбор погоды
-        await query.edit_message_text(
-            "Погода у вас? 👇",
-            reply_markup=_form_weather_keyboard(),
-        )
+        await answer_and_edit(query, t.WEATHER_PROMPT, reply_markup=kb.form_weather)
     return ConversationHandler.END
 
 
 async def form_weather(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработка выбора погоды для «Улица»: Тепло / Прохладно / Холодно / Дождь."""
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
+    loc = _loc(update, context)
+    t, kb = loc.t, loc.kb
     key = query.data.replace("form:weather:", "")
     texts = {
-        "warm": FORM_WEAR_STREET_WARM,
-        "cool": FORM_WEAR_STREET_COOL,
-        "cold": FORM_WEAR_STREET_COLD,
-        "rain": FORM_WEAR_STREET_RAIN,
+        "warm": t.FORM_WEAR_STREET_WARM,
+        "cool": t.FORM_WEAR_STREET_COOL,
+        "cold": t.FORM_WEAR_STREET_COLD,
+        "rain": t.FORM_WEAR_STREET_RAIN,
     }
-    text = texts.get(key, FORM_WEAR_STREET_WARM)
-    await query.edit_message_text(
-        text,
-        reply_markup=_form_result_keyboard(),
-    )
+    text = texts.get(key, t.FORM_WEAR_STREET_WARM)
+    await answer_and_edit(query, text, reply_markup=kb.menu_and_restart)
     return ConversationHandler.END
 
 
 # --- Сценарий: Расписание ---
 async def menu_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("reg", None)
-    await _reply_schedule(update, is_callback=True)
+    await _reply_schedule(update, is_callback=True, loc=_loc(update, context))
     return ConversationHandler.END
 
 
 # --- Сценарий: Локации ---
 async def menu_locations(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("reg", None)
-    await _reply_locations(update, is_callback=True)
+    await _reply_locations(update, is_callback=True, loc=_loc(update, context))
     return ConversationHandler.END
 
 
@@ -1003,10 +1712,11 @@ async def menu_locations(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def menu_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """По нажатию «Старт» — показать основное меню. Сбрасывает активный диалог (fallback)."""
     query = update.callback_query
-    await query.answer()
-    await query.edit_message_text(
-        "Чем помочь?\n\nВыберите 👇",
-        reply_markup=main_menu_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.t.MENU_PROMPT,
+        reply_markup=loc.kb.main_menu,
     )
     return ConversationHandler.END
 
@@ -1015,173 +1725,54 @@ async def menu_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def menu_restart(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """По нажатию «Начать заново» — сброс диалога и показ приветствия + кнопка «Старт»."""
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    text = (
-        "Привет 👋\n\n"
-        "• Запись на тренировку\n"
-        "• Ответы на вопросы\n\n"
-        "Нажмите кнопку ниже 👇"
-    )
-    await query.edit_message_text(text, reply_markup=start_welcome_keyboard())
+    loc = _loc(update, context)
+    await answer_and_edit(query, loc.t.RESTART_TEXT, reply_markup=loc.kb.start_welcome)
     return ConversationHandler.END
 
 
 # --- Возврат в главное меню ---
 async def menu_main(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        "Чем помочь?\n\nВыберите 👇",
-        reply_markup=main_menu_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.t.MENU_PROMPT,
+        reply_markup=loc.kb.main_menu,
     )
     return ConversationHandler.END
 
 
 # --- Задать вопрос: сразу кнопки тем ---
-def _question_topics_keyboard():
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("Что надеть?", callback_data="question:form")],
-        [InlineKeyboardButton("Что взять с собой?", callback_data="question:what_to_take")],
-        [InlineKeyboardButton("Как проходят тренировки?", callback_data="question:how")],
-        [InlineKeyboardButton("Задать свой вопрос", callback_data="question:custom")],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
 async def menu_question(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        "Выберите тему 👇",
-        reply_markup=_question_topics_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.t.CHOOSE_TOPIC,
+        reply_markup=loc.kb.question_topics,
     )
     return ConversationHandler.END
 
 
-# Текст для темы «Как проходят тренировки»
-# Тексты для темы «Как проходят тренировки» (Беговые / Силовые / Длительные)
-QUESTION_HOW_RUN = (
-    "🏃‍♂️ БЕГОВЫЕ ТРЕНИРОВКИ\n"
-    "────────────────────\n\n"
-    "Тренировки проходят на стадионе или на улице и выстроены\n"
-    "по полной структуре:\n\n"
-    "• разминка\n"
-    "• основная часть\n"
-    "• заминка\n\n"
-    "В процессе уделяется внимание:\n"
-    "• общей физической подготовке\n"
-    "• общеразвивающим упражнениям\n"
-    "• беговым упражнениям и технике\n\n"
-    "Тренировки методически структурированы и адаптируются\n"
-    "под индивидуальные цели и уровень каждого участника.\n\n"
-    "────────────────────"
-)
-
-QUESTION_HOW_STRENGTH = (
-    "🏋️‍♂️ СИЛОВЫЕ ТРЕНИРОВКИ\n"
-    "────────────────────\n\n"
-    "Тренировки проходят в зале и имеют чёткую структуру занятия.\n\n"
-    "Основной акцент делается на:\n"
-    "• развитие силы\n"
-    "• развитие силовой выносливости\n\n"
-    "Дополнительно развиваются:\n"
-    "• координация\n"
-    "• мобильность\n"
-    "• общая физическая подготовка\n\n"
-    "Упражнения подбираются с учётом уровня подготовки\n"
-    "и индивидуальных целей.\n\n"
-    "────────────────────"
-)
-
-QUESTION_HOW_LONG = (
-    "🏃‍♂️ ДЛИТЕЛЬНЫЕ ВЫЕЗДНЫЕ БЕГОВЫЕ\n"
-    "────────────────────\n\n"
-    "Это совместная длительная пробежка на природе\n"
-    "(выездные локации, например Раубичи).\n\n"
-    "Цель тренировки:\n"
-    "• развитие сердечно-сосудистой системы\n"
-    "• повышение выносливости\n"
-    "• комфортный, спокойный темп\n\n"
-    "После тренировки:\n"
-    "☕ чай, кофе\n"
-    "🥐 завтраки, пирожные\n"
-    "и приятное общение.\n\n"
-    "────────────────────"
-)
-
-
-def _question_how_keyboard():
-    """Первый уровень: Беговые / Силовые / Длительные + Назад в меню (🏃‍♂️ бег, длительные; 🏋️‍♂️ силовые)."""
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("🏃‍♂️ Беговые", callback_data="how:run")],
-        [InlineKeyboardButton("🏋️‍♂️ Силовые", callback_data="how:strength")],
-        [InlineKeyboardButton("🏃‍♂️ Длительные", callback_data="how:long")],
-        [InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main")],
-    ])
-
-
-def _question_how_result_keyboard():
-    """Второй уровень: после текста — Назад в меню и Начать заново."""
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-# Текст для темы «Что взять с собой»
-QUESTION_WHAT_TO_TAKE_TEXT = (
-    "🎒 Что взять с собой на тренировку\n\n"
-    "✅ Обязательно:\n"
-    "• Спортивная форма (по формату тренировки)\n"
-    "• Спортивная обувь:\n"
-    "  — для зала\n"
-    "  — для бега (улица / манеж)\n"
-    "• Бутылка воды\n"
-    "• Полотенце\n\n"
-    "🚿 Если планируете принять душ:\n"
-    "• Сланцы\n"
-    "• Средства для душа\n"
-    "• Сменная одежда\n\n"
-    "➕ Дополнительно (по желанию):\n"
-    "• Резинка для волос\n"
-    "• Личная экипировка\n"
-    "• Небольшой рюкзак или сумка\n\n"
-    "ℹ️ Важно:\n"
-    "Форму и обувь подбирайте с учётом погодных условий\n"
-    "и типа тренировки: зал / улица / манеж"
-)
-
-# Текст для «Задать свой вопрос»
-QUESTION_CUSTOM_PROMPT = (
-    "✍️ Задайте свой вопрос\n\n"
-    "Напишите ваш вопрос сообщением,\n"
-    "и мы обязательно вам ответим."
-)
-
-
 async def question_topic_form(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    query = update.callback_query
-    await query.answer()
+    # answer() делает _reply_form вместе с правкой сообщения
     context.user_data.pop("reg", None)
-    await _reply_form(update, is_callback=True)
+    await _reply_form(update, is_callback=True, loc=_loc(update, context))
     return ConversationHandler.END
 
 
 async def question_topic_how(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """«Как проходят тренировки» — показать три кнопки: Беговые / Силовые / Длительные."""
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        "Выберите тип тренировки 👇",
-        reply_markup=_question_how_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.t.HOW_PROMPT,
+        reply_markup=loc.kb.question_how,
     )
     return ConversationHandler.END
 
@@ -1189,31 +1780,25 @@ async def question_topic_how(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def question_how_type(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показать текст по типу: Беговые / Силовые / Длительные + Назад в меню, Начать заново."""
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
+    loc = _loc(update, context)
+    t, kb = loc.t, loc.kb
     key = query.data.replace("how:", "")
     texts = {
-        "run": QUESTION_HOW_RUN,
-        "strength": QUESTION_HOW_STRENGTH,
-        "long": QUESTION_HOW_LONG,
+        "run": t.QUESTION_HOW_RUN,
+        "strength": t.QUESTION_HOW_STRENGTH,
+        "long": t.QUESTION_HOW_LONG,
     }
-    text = texts.get(key, QUESTION_HOW_RUN)
-    await query.edit_message_text(text, reply_markup=_question_how_result_keyboard())
+    text = texts.get(key, t.QUESTION_HOW_RUN)
+    await answer_and_edit(query, text, reply_markup=kb.menu_and_restart)
     return ConversationHandler.END
 
 
 async def question_topic_what_to_take(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-        ],
-        [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-    ])
-    await query.edit_message_text(QUESTION_WHAT_TO_TAKE_TEXT, reply_markup=keyboard)
+    loc = _loc(update, context)
+    await answer_and_edit(query, loc.t.QUESTION_WHAT_TO_TAKE_TEXT, reply_markup=loc.kb.register_and_menu)
     return ConversationHandler.END
 
 
@@ -1221,22 +1806,14 @@ async def question_topic_what_to_take(update: Update, context: ContextTypes.DEFA
 ASK_QUESTION = 0
 
 
-def _ask_question_prompt_keyboard():
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
 async def ask_question_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
-    await query.edit_message_text(
-        QUESTION_CUSTOM_PROMPT,
-        reply_markup=_ask_question_prompt_keyboard(),
+    loc = _loc(update, context)
+    await answer_and_edit(
+        query,
+        loc.t.QUESTION_CUSTOM_PROMPT,
+        reply_markup=loc.kb.menu_and_restart,
     )
     return ASK_QUESTION
 
@@ -1246,7 +1823,9 @@ async def ask_question_receive(update: Update, context: ContextTypes.DEFAULT_TYP
         return ConversationHandler.END
     text = update.message.text.strip()
     user = update.effective_user
-    if config.ADMIN_CHAT_ID:
+    router = context.bot_data["admin_router"]
+    destinations = router.resolve("question")
+    if destinations:
         try:
             name_part = (user.first_name or "").strip()
             if user.last_name:
@@ -1266,34 +1845,33 @@ async def ask_question_receive(update: Update, context: ContextTypes.DEFAULT_TYP
                 f"chat_id: {user.id}\n\n"
                 f"Текст: {safe_text}"
             )
-            await context.bot.send_message(
-                chat_id=config.ADMIN_CHAT_ID,
-                text=msg,
-                parse_mode="HTML",
-            )
+            await router.send(context.bot, destinations, msg, parse_mode="HTML")
         except Exception as e:
             logger.warning("Не удалось переслать вопрос админу: %s", e)
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
+    loc = _loc(update, context)
     await update.message.reply_text(
-        "Спасибо, ваш вопрос передан. Мы ответим в ближайшее время.",
-        reply_markup=keyboard,
+        loc.t.QUESTION_THANKS,
+        reply_markup=loc.kb.menu_and_restart,
     )
     return ConversationHandler.END
 
 
-# --- Обработка текста: триггеры и свободный вопрос ---
+# --- Обработка текста: триггеры и свободный вопрос (слова на всех языках бота) ---
+# Слово целиком с начала (\b): «Facebook» — не «book». Русские и белорусские основы открыты справа
+# («адрес» — и «адресу»), английские слова закрыты и справа: «priceless», «costume» — не триггеры.
 TRIGGERS = {
-    "register": (r"(?i)(записаться|хочу\s+на\s+тренировку|записать|запиши)", "menu:register"),
-    "price": (r"(?i)(цена|сколько\s+стоит|стоимость)", "menu:price"),
-    "address": (r"(?i)(адрес|где\s+находится|как\s+добраться)", "menu:address"),
-    "locations": (r"(?i)(локаци[ия]|локации|адреса)", "menu:locations"),
-    "form": (r"(?i)(форма|что\s+надеть|экипировка|кроссовки)", "menu:form"),
-    "schedule": (r"(?i)(расписание|когда\s+тренировки)", "menu:schedule"),
+    "register": (
+        r"(?i)\b(?:записаться|хочу\s+на\s+тренировку|записать|запиши|запісацца|запішы|(?:sign\s+up|register|book)\b)",
+        "menu:register",
+    ),
+    "price": (r"(?i)\b(?:цена|сколько\s+стоит|стоимость|кошт|колькі\s+каштуе|(?:price|cost|how\s+much)\b)", "menu:price"),
+    "address": (
+        r"(?i)\b(?:адрес|где\s+находится|как\s+добраться|адрас|як\s+дабрацца|(?:address|how\s+to\s+get)\b)",
+        "menu:address",
+    ),
+    "locations": (r"(?i)\b(?:локаци[ия]|локации|адреса|лакацы[яі]|locations?\b)", "menu:locations"),
+    "form": (r"(?i)\b(?:форма|что\s+надеть|экипировка|кроссовки|што\s+надзець|(?:what\s+to\s+wear|outfit)\b)", "menu:form"),
+    "schedule": (r"(?i)\b(?:расписание|когда\s+тренировки|расклад|schedule\b)", "menu:schedule"),
 }
 
 
@@ -1302,186 +1880,96 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message or not update.message.text:
         return ConversationHandler.END
     text = update.message.text.strip()
+    loc = _loc(update, context)
     for name, (pattern, callback_data) in TRIGGERS.items():
         if re.search(pattern, text):
             if callback_data == "menu:register":
                 # Обрабатывается ConversationHandler (entry_point по тексту)
                 return ConversationHandler.END
             if callback_data == "menu:price":
-                t, k = get_price_text_and_keyboard()
+                t, k = get_price_text_and_keyboard(loc)
                 await update.message.reply_text(t, reply_markup=k)
                 return ConversationHandler.END
             if callback_data == "menu:address":
-                await _reply_address(update, is_callback=False)
+                await _reply_address(update, is_callback=False, cfg=_club(context).cfg, loc=loc)
                 return ConversationHandler.END
             if callback_data == "menu:locations":
-                await _reply_locations(update, is_callback=False)
+                await _reply_locations(update, is_callback=False, loc=loc)
                 return ConversationHandler.END
             if callback_data == "menu:form":
-                await _reply_form(update, is_callback=False)
+                await _reply_form(update, is_callback=False, loc=loc)
                 return ConversationHandler.END
             if callback_data == "menu:schedule":
-                await _reply_schedule(update, is_callback=False)
+                await _reply_schedule(update, is_callback=False, loc=loc)
                 return ConversationHandler.END
 
     # Сообщение не подошло ни под один сценарий — анти-тупик
-    reply = "Похоже, я не понял. Давайте продолжим через меню 👇"
-    await update.message.reply_text(
-        reply,
-        reply_markup=InlineKeyboardMarkup([
-            [InlineKeyboardButton("Записаться", callback_data="menu:register"), InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main")],
-            [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-        ]),
-    )
+    await update.message.reply_text(loc.t.NOT_UNDERSTOOD, reply_markup=loc.kb.not_understood)
     return ConversationHandler.END
 
 
-async def _reply_address(update: Update, is_callback: bool):
+async def _reply_address(update: Update, is_callback: bool, cfg: settings.Settings, loc: i18n.LocaleBundle = None):
     """Отправить текст и кнопки сценария «Адрес» (callback или message). Без parse_mode."""
+    t, kb = loc.t, loc.kb
     try:
-        if config.ADDRESS:
-            text = "Адрес\n\n" + str(config.ADDRESS)
-            if getattr(config, "MAP_LINK", None):
-                text += "\n\nКарта: " + str(config.MAP_LINK)
-            text += "\n\nНа машине или пешком/транспорт? 👇"
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("На машине", callback_data="addr:car")],
-                [InlineKeyboardButton("Пешком/транспорт", callback_data="addr:walk")],
-                [
-                    InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-                    InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-                ],
-            ])
+        if cfg.ADDRESS:
+            text = t.ADDRESS_TITLE + "\n\n" + str(cfg.ADDRESS)
+            if cfg.MAP_LINK:
+                text += "\n\n" + t.ADDRESS_MAP.format(link=cfg.MAP_LINK)
+            text += "\n\n" + t.ADDRESS_HOW
+            keyboard = kb.address_transport
         else:
-            text = (
-                "Адрес\n\n"
-                "• Пока не указан\n"
-                "• Напишите город/район — подскажу контакт админа или скину гео\n\n"
-                "Нажмите кнопку ниже 👇"
-            )
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("Записаться", callback_data="menu:register")],
-                [
-                    InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-                    InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-                ],
-            ])
+            text = t.ADDRESS_UNKNOWN
+            keyboard = kb.address_unknown
     except Exception as e:
         logger.exception("Ошибка при формировании адреса: %s", e)
-        text = "Адрес\n\nНе удалось загрузить данные. Напишите в чат — подскажу 👇"
-        keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main")],
-            [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-        ])
+        text = t.ADDRESS_ERROR
+        keyboard = kb.menu_or_restart
     if is_callback:
-        await update.callback_query.answer()
-        await update.callback_query.edit_message_text(text, reply_markup=keyboard)
+        await answer_and_edit(update.callback_query, text, reply_markup=keyboard)
     else:
         await update.message.reply_text(text, reply_markup=keyboard)
 
 
-async def _reply_form(update: Update, is_callback: bool):
+async def _reply_form(update: Update, is_callback: bool, loc: i18n.LocaleBundle):
     """Отправить текст и три кнопки: Зал, Манеж, Улица."""
-    text = "Что надеть\n\nВыберите тип тренировки 👇"
-    keyboard = _form_place_keyboard()
+    text = loc.t.FORM_PROMPT
+    keyboard = loc.kb.form_place
     if is_callback:
-        await update.callback_query.answer()
-        await update.callback_query.edit_message_text(text, reply_markup=keyboard)
+        await answer_and_edit(update.callback_query, text, reply_markup=keyboard)
     else:
         await update.message.reply_text(text, reply_markup=keyboard)
 
 
-def _build_schedule_text():
+def _build_schedule_text(loc: i18n.LocaleBundle):
     """Собирает текст расписания (без parse_mode). При ошибке — заглушка + лог."""
     try:
-        return SCHEDULE_FULL + "\n\nЗаписаться на удобный день? 👇"
+        return loc.content.SCHEDULE_FULL + "\n\n" + loc.t.SCHEDULE_CTA
     except Exception as e:
         logger.exception("Ошибка при формировании расписания: %s", e)
-        return (
-            "Расписание\n\n"
-            "• Данные временно недоступны\n"
-            "• Напишите в чат — подскажу дни и время\n\n"
-            "Нажмите кнопку ниже 👇"
-        )
+        return loc.t.SCHEDULE_UNAVAILABLE
 
 
-async def _reply_schedule(update: Update, is_callback: bool):
+async def _reply_schedule(update: Update, is_callback: bool, loc: i18n.LocaleBundle):
     """Отправить текст и кнопки сценария «Расписание»."""
     try:
-        text = _build_schedule_text()
+        text = _build_schedule_text(loc)
     except Exception as e:
         logger.exception("Ошибка в _reply_schedule: %s", e)
-        text = "Расписание\n\nНе удалось загрузить данные. Попробуйте позже или напишите в чат 👇"
-    keyboard = InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("📍 Адрес", callback_data="menu:locations"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
+        text = loc.t.SCHEDULE_ERROR
+    keyboard = loc.kb.address_nav
     if is_callback:
-        await update.callback_query.answer()
-        await update.callback_query.edit_message_text(text, reply_markup=keyboard)
+        await answer_and_edit(update.callback_query, text, reply_markup=keyboard)
     else:
         await update.message.reply_text(text, reply_markup=keyboard)
 
 
-def _locations_choice_keyboard():
-    """Клавиатура выбора типа: Беговые / Силовые / Длительная."""
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("🏃‍♂️ Беговые тренировки", callback_data="loc:run")],
-        [InlineKeyboardButton("🏋️‍♂️ Силовые тренировки", callback_data="loc:gym")],
-        [InlineKeyboardButton("🏃‍♂️ Длительная (Раубичи)", callback_data="loc:long")],
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-        ],
-        [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-    ])
-
-
-def _address_nav_keyboard():
-    """Клавиатура после показа адреса: Записаться, Адрес, Назад в меню, Начать заново."""
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("📍 Адрес", callback_data="menu:locations"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
-def _address_keyboard_with_geo(geo_url: str):
-    """Клавиатура после показа адреса: инлайн-кнопка с URL навигатора + Записаться, Адрес, Назад в меню."""
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("🧭 Открыть локацию", url=geo_url)],
-        [
-            InlineKeyboardButton("📝 Записаться", callback_data="menu:register"),
-            InlineKeyboardButton("📍 Адрес", callback_data="menu:locations"),
-        ],
-        [
-            InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main"),
-            InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart"),
-        ],
-    ])
-
-
-async def _reply_locations(update: Update, is_callback: bool):
+async def _reply_locations(update: Update, is_callback: bool, loc: i18n.LocaleBundle):
     """Первый экран «Адрес»: выбор типа тренировки (Беговые / Силовые)."""
-    text = (
-        "Адрес\n\n"
-        "Выберите тип тренировки 👇"
-    )
-    keyboard = _locations_choice_keyboard()
+    text = loc.t.LOCATIONS_PROMPT
+    keyboard = loc.kb.locations_choice
     if is_callback:
-        await update.callback_query.answer()
-        await update.callback_query.edit_message_text(text, reply_markup=keyboard)
+        await answer_and_edit(update.callback_query, text, reply_markup=keyboard)
     else:
         await update.message.reply_text(text, reply_markup=keyboard)
 
@@ -1489,21 +1977,21 @@ async def _reply_locations(update: Update, is_callback: bool):
 async def location_show(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показать адрес по типу (loc:run / loc:gym / loc:long): только текст 📍 Локация + инлайн-кнопка с URL."""
     query = update.callback_query
-    await query.answer()
     context.user_data.pop("reg", None)
+    loc = _loc(update, context)
     try:
         loc_type = "run" if query.data == "loc:run" else ("long" if query.data == "loc:long" else "gym")
-        address = LOCATION_SHORT.get(loc_type, "Калиновского, 111")
-        geo_url = _location_geo_url(address)
-        text = f"📍 Локация: {address}"
-        keyboard = _address_keyboard_with_geo(geo_url)
+        address = loc.content.LOCATION_SHORT.get(loc_type, "Калиновского, 111")
+        text = loc.t.LOCATION_LINE.format(address=address)
+        # Кнопка с URL навигатора собрана заранее (_build_keyboards)
+        keyboard = loc.kb.location_geo[loc_type]
     except Exception as e:
         logger.exception("Ошибка при показе адреса: %s", e)
-        text = "Адрес\n\nНе удалось загрузить данные. Напишите в чат — подскажу 👇"
-        keyboard = _address_nav_keyboard()
-        await query.edit_message_text(text, reply_markup=keyboard)
+        text = loc.t.ADDRESS_ERROR
+        keyboard = loc.kb.address_nav
+        await answer_and_edit(query, text, reply_markup=keyboard)
         return ConversationHandler.END
-    await query.edit_message_text(text, reply_markup=keyboard)
+    await answer_and_edit(query, text, reply_markup=keyboard)
     return ConversationHandler.END
 
 
@@ -1511,13 +1999,8 @@ async def location_show(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def fallback_unexpected_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Если пользователь отправил текст, когда ожидался выбор по кнопкам — короткий ответ + выход."""
     if update.message:
-        await update.message.reply_text(
-            "Похоже, я не понял. Давайте продолжим через меню 👇",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("⬅️ Назад в меню", callback_data="menu:main")],
-                [InlineKeyboardButton("🔄 Начать заново", callback_data="menu:restart")],
-            ]),
-        )
+        loc = _loc(update, context)
+        await update.message.reply_text(loc.t.NOT_UNDERSTOOD, reply_markup=loc.kb.menu_or_restart)
     return ConversationHandler.END
 
 
@@ -1526,13 +2009,23 @@ async def start_register_by_text(update: Update, context: ContextTypes.DEFAULT_T
     if not update.message or not update.message.text:
         return ConversationHandler.END
     context.user_data["reg"] = {}
+    loc = _loc(update, context)
     await update.message.reply_text(
-        "Выберите день недели 👇",
-        reply_markup=_day_keyboard(),
+        loc.t.CHOOSE_DAY,
+        reply_markup=loc.kb.day,
     )
     return REG_DAY
 
 
+# --- Клуб по умолчанию: настройки (config.py) + контент этого модуля (одиночный режим, CLUBS_DIR пуст) ---
+def _default_content() -> dict:
+    return {name: globals()[name] for name in tenants.CONTENT_KEYS}
+
+
+def default_club(cfg: settings.Settings) -> tenants.Club:
+    return tenants.make_club("default", cfg.BOT_TOKEN, cfg, _default_content())
+
+
 # --- ConversationHandler для «Задать свой вопрос» (показать приглашение → принять сообщение → переслать админу) ---
 def build_ask_question_conv():
     return ConversationHandler(
@@ -1556,8 +2049,14 @@ def build_ask_question_conv():
     )
 
 
+# Кнопки, двойное нажатие которых — повтор действия (запись, отмена, перенос): отбрасывает dedup.
+# Переключатели (отметка в /roster) сюда не входят — второе нажатие там отменяет первое.
+_ONCE_CALLBACKS = ("reg:confirm:yes", "my:cancel_yes:", "my:to:")
+
+
 # --- ConversationHandler для записи (день → слот → уровень → контакт → подтверждение) ---
-def build_register_conv():
+def build_register_conv(days: tuple):
+    """days — дни записи клуба (club_days): другие reg:day: диалог не принимает."""
     return ConversationHandler(
         entry_points=[
             CallbackQueryHandler(menu_register, pattern="^menu:register$"),
@@ -1566,7 +2065,7 @@ def build_register_conv():
         ],
         states={
             REG_DAY: [
-                CallbackQueryHandler(reg_choose_day, pattern="^reg:day:(mon|tue|wed|thu|fri|sun)$"),
+                CallbackQueryHandler(reg_choose_day, pattern=f"^reg:day:({'|'.join(days)})$"),
             ],
             REG_SLOT: [
                 CallbackQueryHandler(reg_choose_slot, pattern=r"^reg:slot:[a-z_]+$"),
@@ -1613,10 +2112,162 @@ def build_register_conv():
 
 
 def main():
-    if not config.BOT_TOKEN:
-        logger.error("Заполните BOT_TOKEN в config.py")
-        return
-    app = Application.builder().token(config.BOT_TOKEN).build()
+    # Настройки и пакеты клубов проверяются до запуска — все ошибки сразу, понятным текстом
+    try:
+        cfg = settings.load()
+        clubs = _load_clubs(cfg)
+    except ValueError as e:
+        sys.exit(f"Ошибка в настройках:\n{e}")
+    log_listener = setup_logging(
+        json_format=cfg.LOG_JSON,
+        log_file=cfg.LOG_FILE,
+        max_bytes=cfg.LOG_MAX_BYTES,
+        backup_count=cfg.LOG_BACKUP_COUNT,
+        info_sample_rate=cfg.LOG_INFO_SAMPLE_RATE,
+    )
+    try:
+        _run_bot(cfg, clubs)
+    finally:
+        log_listener.stop()
+
+
+def _load_clubs(cfg: settings.Settings) -> list:
+    if not cfg.CLUBS_DIR:
+        return [default_club(cfg)]
+    # Мультиклубный режим: по боту на пакет клуба, один цикл событий и общие пулы HTTP
+    clubs = tenants.load_clubs(cfg.CLUBS_DIR, cfg, _default_content())
+    if not clubs:
+        raise ValueError(f"В {cfg.CLUBS_DIR} нет пакетов клубов (*.json)")
+    return clubs
+
+
+def _run_bot(cfg: settings.Settings, clubs: list):
+    tracing.store.configure(cfg.TRACE_BUFFER_SIZE, cfg.TRACE_SLOW_BUFFER_SIZE, cfg.TRACE_SLOW_MS)
+    profiler.profiler.configure(cfg.PROFILE_INTERVAL_SECONDS, cfg.PROFILE_MAX_SECONDS)
+    send_request = http_pool.build_send_request(cfg, shared=len(clubs) > 1)
+    polling_request = http_pool.build_polling_request(cfg, bots=len(clubs))
+    apps = [build_application(club, send_request, polling_request) for club in clubs]
+    # Здоровье процесса: замер задержки цикла событий и сторож long polling — по одному на все клубы
+    health.monitor.configure(cfg.POLL_STALL_SECONDS, cfg.LOOP_LAG_PROBE_SECONDS, cfg.LOOP_LAG_MAX_SECONDS)
+    for app in apps:
+        health.monitor.watch(app)
+    apps[0].services.append(health.monitor.run_lag_probe)
+    apps[0].services.append(health.monitor.run_watchdog)
+    if cfg.HTTP_SERVER_PORT:
+        # Локальные HTTP-эндпоинты всех клубов — один сервер, запускается вместе с первым ботом
+        server = http_server.HttpServer(cfg.HTTP_SERVER_HOST, cfg.HTTP_SERVER_PORT)
+        for app in apps:
+            club_id = app.bot_data["club"].club_id
+            server.route(f"/calendar/{club_id}/", app.bot_data["calendar"].handle)
+            if "board" in app.bot_data:
+                server.route(f"/dashboard/{club_id}/", app.bot_data["board"].handle)
+        server.route("/health/live", health.monitor.handle_live)
+        server.route("/health/ready", health.monitor.handle_ready)
+        apps[0].services.append(server.run)
+    run_polling_all(apps, allowed_updates=Update.ALL_TYPES, shutdown_timeout=cfg.SHUTDOWN_TIMEOUT_SECONDS)
+
+
+def build_application(club=None, send_request=None, polling_request=None) -> Application:
+    """Собрать Application клуба со всеми обработчиками и прослойками (без запуска polling).
+
+    Без club — клуб по умолчанию (settings.load(): config.py и окружение). Пулы HTTP можно передать общие
+    (мультиклубный режим).
+    """
+    club = club or default_club(settings.load())
+    cfg = club.cfg
+    app = (
+        Application.builder()
+        .application_class(BotApplication)
+        .token(club.token)
+        .request(send_request or http_pool.build_send_request(cfg))
+        .get_updates_request(polling_request or http_pool.build_polling_request(cfg))
+        .build()
+    )
+    app.bot_data["club"] = club
+    # Тексты и клавиатуры на всех языках — собираются один раз здесь, в обработчиках только выбор пакета
+    app.bot_data["i18n"] = i18n.build_locales(club, _build_keyboards)
+
+    # Воронка записи: счётчики клуба, периодический сброс на диск и финальный — при остановке
+    reg_funnel = funnel.Funnel(
+        state_stages={REG_DAY: "day", REG_SLOT: "slot", REG_TRAINER: "trainer", REG_LEVEL: "level", REG_CONTACT: "contact", REG_CONFIRM: "confirm"},
+        end_state=ConversationHandler.END,
+        slot_ids=club.content.SLOT_TO_LABEL,
+        days=club_days(club.content),
+        path=tenants.club_path(cfg.FUNNEL_FILE, club),
+        flush_interval=cfg.FUNNEL_FLUSH_SECONDS,
+    )
+    reg_funnel.load()
+    app.bot_data["funnel"] = reg_funnel
+    app.services.append(reg_funnel.run_flusher)
+    app.stop_hooks.append(reg_funnel.flush_on_stop)
+
+    # Повторы апдейтов (повторная доставка, двойное нажатие) — отбрасываются до обработчиков
+    recent_updates = dedup.UpdateDeduplicator(
+        update_window=cfg.DEDUP_UPDATE_SECONDS,
+        callback_window=cfg.DEDUP_CALLBACK_SECONDS,
+        max_entries=cfg.DEDUP_MAX_ENTRIES,
+        path=tenants.club_path(cfg.DEDUP_FILE, club),
+        callback_prefixes=_ONCE_CALLBACKS,
+    )
+    recent_updates.load()
+    app.bot_data["dedup"] = recent_updates
+    app.update_filters.append(recent_updates.drop)
+    app.services.append(recent_updates.run_flusher)
+    app.stop_hooks.append(recent_updates.flush_on_stop)
+
+    # Подтверждённые записи (SQLite) — для выгрузок /export и export.py
+    if cfg.BOOKINGS_DB:
+        booking_store = storage.BookingStore(tenants.club_path(cfg.BOOKINGS_DB, club))
+        booking_store.open()
+        app.bot_data["bookings"] = booking_store
+        # Отметки /roster копятся и пишутся пачкой; при остановке — дописать до закрытия базы
+        attendance = roster.AttendanceBuffer(
+            booking_store, cfg.ROSTER_DEBOUNCE_SECONDS, debit_pass=cfg.PASS_DEBIT_ON == "attendance"
+        )
+        app.bot_data["attendance"] = attendance
+        app.stop_hooks.append(attendance.flush_on_stop)
+        app.stop_hooks.append(booking_store.close_on_stop)
+        # Резервные копии базы на ходу: по расписанию и по /backup
+        if cfg.BACKUP_DIR:
+            backups = backup.BackupManager(
+                booking_store.path,
+                cfg.BACKUP_DIR,
+                keep=cfg.BACKUP_KEEP,
+                interval=cfg.BACKUP_INTERVAL_SECONDS,
+                pages_per_step=cfg.BACKUP_PAGES_PER_STEP,
+                step_pause=cfg.BACKUP_STEP_PAUSE_SECONDS,
+            )
+            app.bot_data["backups"] = backups
+            app.services.append(backups.run_scheduler)
+            app.stop_hooks.append(backups.abort_on_stop)
+        # Панель записей в браузере (раздаёт HTTP-сервер, см. _run_bot); лента начинается с последних записей
+        if cfg.HTTP_SERVER_PORT:
+            board = dashboard.BookingBoard(app, days=cfg.DASHBOARD_DAYS, feed_size=cfg.DASHBOARD_FEED_SIZE)
+            app.bot_data["board"] = board
+            board.load()
+
+    # Подписки на слоты и тренеров (.ics); раздаёт HTTP-сервер, см. _run_bot
+    admin_t = app.bot_data["i18n"].default.t
+
+    # Куда слать записи, вопросы и сообщения персоналу: таблица по слотам и тренерам клуба (ADMIN_ROUTES)
+    app.bot_data["admin_router"] = routing.AdminRouter(
+        club.cfg.ADMIN_ROUTES,
+        club.cfg.ADMIN_CHAT_ID,
+        slot_ids=list(club.content.SLOT_TO_LABEL),
+        trainers={*admin_t.TRAINER_NAME.values(), *club.content.SLOT_TO_TRAINER.values()},
+    )
+    app.bot_data["calendar"] = ical.CalendarFeeds(
+        app, club.cfg.ICS_TIMEZONE, ADMIN_TRAINING_LABEL, admin_t.TRAINER_NAME.values()
+    )
+
+    # Вытеснение простаивающих сессий (user_data и состояния диалогов) по TTL
+    session_tracker = sessions.SessionTracker(
+        ttl=cfg.SESSION_TTL_SECONDS,
+        sweep_interval=cfg.SESSION_SWEEP_SECONDS,
+        on_expired=notify_session_expired,
+    )
+    app.bot_data["sessions"] = session_tracker
+    app.services.append(session_tracker.run_sweeper)
 
     # Команды — регистрируем ПЕРЕД ConversationHandler
     app.add_handler(CommandHandler("start", cmd_start))
@@ -1627,9 +2278,24 @@ def main():
     app.add_handler(CommandHandler("location", cmd_location))
     app.add_handler(CommandHandler("question", cmd_question))
     app.add_handler(CommandHandler("restart", cmd_restart))
+    app.add_handler(CommandHandler("slow", cmd_slow))
+    app.add_handler(CommandHandler("profile", cmd_profile))
+    app.add_handler(CommandHandler("funnel", cmd_funnel))
+    app.add_handler(CommandHandler("sessions", cmd_sessions))
+    app.add_handler(CommandHandler("memstats", cmd_memstats))
+    app.add_handler(CommandHandler("export", cmd_export))
+    app.add_handler(CommandHandler("backup", cmd_backup))
+    app.add_handler(CommandHandler("pass_add", cmd_pass_add))
+    app.add_handler(CommandHandler("attended", cmd_attended))
+    app.add_handler(CommandHandler("balance", cmd_balance))
+    app.add_handler(CommandHandler("mybookings", cmd_mybookings))
+    app.add_handler(CommandHandler("roster", cmd_roster))
+    app.add_handler(CommandHandler("noshows", cmd_noshows))
+    app.add_handler(CommandHandler("sources", cmd_sources))
+    app.add_handler(CommandHandler("lang", cmd_lang))
 
     # Сценарий записи (ConversationHandler; /register — entry_point внутри)
-    app.add_handler(build_register_conv())
+    app.add_handler(build_register_conv(club_days(club.content)))
 
     # «Задать свой вопрос» (ConversationHandler: приглашение → принять сообщение → переслать админу)
     app.add_handler(build_ask_question_conv())
@@ -1652,6 +2318,15 @@ def main():
     app.add_handler(CallbackQueryHandler(price_maksim_dasha, pattern="^price:maksim_dasha$"))
     app.add_handler(CallbackQueryHandler(price_vitalik, pattern="^price:vitalik$"))
 
+    # Мои записи: отмена и перенос (/mybookings)
+    app.add_handler(CallbackQueryHandler(mybookings_callback, pattern="^my:"))
+
+    # Отметка посещаемости (/roster)
+    app.add_handler(CallbackQueryHandler(roster_callback, pattern="^roster:"))
+
+    # Выбор языка
+    app.add_handler(CallbackQueryHandler(lang_choose, pattern="^lang:(ru|be|en)$"))
+
     # Адрес: машина/пешком
     app.add_handler(CallbackQueryHandler(address_transport, pattern="^addr:(car|walk)$"))
 
@@ -1667,7 +2342,12 @@ def main():
     # Пересылка всех входящих текстовых сообщений админу (низкий приоритет, после остальных)
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, notify_admin), group=99)
 
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Прослойки вокруг всех обработчиков (после регистрации): контекст и задержка в логах, спаны трассировки,
+    # активность сессии, переходы по воронке записи
+    middleware.install(
+        app, logging_middleware, tracing.tracing_middleware, sessions.session_middleware, funnel.funnel_middleware
+    )
+    return app
 
 
 if __name__ == "__main__":
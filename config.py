@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
-"""Конфигурация бота спортивного клуба. Заполните значения под ваш клуб."""
+"""Конфигурация бота спортивного клуба. Заполните значения под ваш клуб.
+
+Здесь только значения: любое можно переопределить переменной окружения с тем же именем, а отсутствующее
+берётся по умолчанию (settings.Settings). Проверяются все сразу при запуске бота (settings.load).
+"""
 
 # Название клуба и город
 CLUB_NAME = "Беговой клуб CADENCE"  # например: "Паркран Москва"
@@ -20,19 +24,129 @@ CONTACT_ADMIN = ""  # например: "@admin_run" или "+7 999 123-45-67"
 # Расписание: текст или список слотов (если пусто — бот спросит удобное время)
 SCHEDULE = ""  # например: "Пн, Ср, Пт 19:00 — парк; Сб 10:00 — стадион"
 
-# Токен бота (получить у @BotFather)
-import os
-
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-
-if not BOT_TOKEN:
-    raise ValueError("BOT_TOKEN не найден! Проверь переменные окружения.")
+# Токен бота (получить у @BotFather). Лучше не писать сюда, а задать переменную окружения BOT_TOKEN
+BOT_TOKEN = ""
 
 # TODO: Chat ID администратора — напишите боту /myid в личку, скопируйте число и подставьте сюда
 ADMIN_CHAT_ID = 265416708
 
+# Куда слать записи, отмены/переносы, вопросы и сообщения боту, если не всё в ADMIN_CHAT_ID (см. routing.py):
+# правила с условиями kind (booking, cancel, move, question, message), slot_id, trainer (как в записи) и адресатами
+# chats — chat_id или [chat_id, id темы форума]. Сообщение уходит всем подошедшим правилам; ни одно не подошло —
+# в ADMIN_CHAT_ID. Команды админа по-прежнему только из ADMIN_CHAT_ID
+ADMIN_ROUTES = []  # например: [{"trainer": "Даша", "chats": [111]}, {"slot_id": ["wed_gym", "fri_gym"], "chats": [[-1001234567890, 7]]}]
+
 # Оплата заранее (если нужна — короткое описание)
 PAYMENT_INFO = ""  # например: "Оплата на месте" или "Реквизиты вышлю после записи"
 
 # Место встречи (если отличается от адреса)
 MEETING_PLACE = ""  # например: "У главного входа в парк, лавочка справа"
+
+# Логи: JSON в stderr (и в файл с ротацией, если указан LOG_FILE). Запись идёт в отдельном потоке.
+LOG_JSON = True
+LOG_FILE = ""  # например: "bot.log"
+LOG_MAX_BYTES = 10 * 1024 * 1024  # размер файла до ротации
+LOG_BACKUP_COUNT = 5  # сколько старых файлов хранить
+LOG_INFO_SAMPLE_RATE = 1.0  # доля INFO-записей, которые попадают в лог (0.1 — каждая десятая); WARNING+ — всегда
+
+# Трассировка: апдейт дольше TRACE_SLOW_MS пишется в лог с деревом спанов и доступен админу через /slow
+TRACE_SLOW_MS = 1500
+TRACE_BUFFER_SIZE = 200  # сколько последних трасс держать в памяти
+TRACE_SLOW_BUFFER_SIZE = 50  # сколько последних медленных трасс держать в памяти
+
+# Профилирование по команде админа /profile <секунд>: стеки всех потоков раз в PROFILE_INTERVAL_SECONDS,
+# окно не длиннее PROFILE_MAX_SECONDS. Вне окна профилировщик не запущен и ничего не стоит
+PROFILE_INTERVAL_SECONDS = 0.005
+PROFILE_MAX_SECONDS = 300
+
+# HTTP-клиент Bot API: отдельные пулы соединений для отправок и для get_updates (long polling)
+HTTP_POOL_SIZE = 32  # соединений для отправок (ответы, правки, уведомления админу)
+HTTP_POLL_POOL_SIZE = 2  # соединений для get_updates
+HTTP_KEEPALIVE_CONNECTIONS = 16  # сколько простаивающих соединений держать открытыми
+HTTP_KEEPALIVE_EXPIRY = 30.0  # секунд до закрытия простаивающего соединения
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 10.0
+HTTP_WRITE_TIMEOUT = 10.0
+HTTP_POOL_TIMEOUT = 3.0  # сколько ждать свободного соединения из пула
+HTTP2 = False  # HTTP/2 (нужен пакет h2: pip install "python-telegram-bot[http2]")
+
+# Мультиклубный режим: каталог с пакетами клубов (clubs/<клуб>.json, см. tenants.py). Пусто — один бот из этого файла.
+CLUBS_DIR = ""
+
+# Воронка записи (/funnel): файл со счётчиками и как часто их сохранять (сек). Пустой файл — только в памяти.
+FUNNEL_FILE = "funnel.json"
+FUNNEL_FLUSH_SECONDS = 60
+
+# Сессии: через сколько секунд простоя удалять user_data и незавершённый диалог (с сообщением «сессия истекла»)
+# и как часто проверять сроки
+SESSION_TTL_SECONDS = 3 * 60 * 60
+SESSION_SWEEP_SECONDS = 60
+
+# Повторы апдейтов отбрасываются: тот же update_id — в течение DEDUP_UPDATE_SECONDS (повторная доставка после
+# перезапуска), нажатие той же кнопки записи, отмены или переноса под тем же сообщением — в течение
+# DEDUP_CALLBACK_SECONDS (двойное нажатие; переключатели вроде отметки в /roster не отбрасываются).
+# Окно сохраняется в DEDUP_FILE, чтобы пережить перезапуск (у клубов — dedup.<клуб>.json); пусто — только в памяти
+DEDUP_FILE = "dedup.json"
+DEDUP_UPDATE_SECONDS = 3600
+DEDUP_CALLBACK_SECONDS = 2.0
+DEDUP_MAX_ENTRIES = 5000
+
+# Остановка (SIGTERM при выкатке): сколько секунд дообрабатывать уже полученные апдейты и отправлять
+# уведомления, прежде чем сбросить данные на диск и выйти. Должно быть меньше таймаута остановки у
+# systemd/Docker (TimeoutStopSec, stop_grace_period), иначе процесс убьют раньше
+SHUTDOWN_TIMEOUT_SECONDS = 25
+
+# Подтверждённые записи: база SQLite для выгрузок тренерам (/export, python export.py). Пусто — не сохранять.
+# У клубов — bookings.<клуб>.db
+BOOKINGS_DB = "bookings.db"
+
+# Резервные копии базы записей без остановки бота: раз в BACKUP_INTERVAL_SECONDS — сжатая проверенная копия
+# в BACKUP_DIR (<база>-ГГГГММДД-ЧЧММСС.db.gz), хранятся BACKUP_KEEP последних. Копируется по
+# BACKUP_PAGES_PER_STEP страниц (4 КБ) с паузой BACKUP_STEP_PAUSE_SECONDS — запись в базу не ждёт копию.
+# Вручную — /backup и python backup.py. Пусто — без копий
+BACKUP_DIR = "backups"
+BACKUP_INTERVAL_SECONDS = 6 * 60 * 60
+BACKUP_KEEP = 28
+BACKUP_PAGES_PER_STEP = 64
+BACKUP_STEP_PAUSE_SECONDS = 0.005
+
+# Календарь: .ics после подтверждения записи и часовой пояс времени тренировок
+ICS_ON_CONFIRM = True
+ICS_TIMEZONE = "Europe/Minsk"
+
+# Локальный HTTP-сервер: подписки на календарь /calendar/<club>/... (см. ical.py), /health/live и /health/ready
+# (см. health.py). 0 — выключен.
+HTTP_SERVER_HOST = "127.0.0.1"
+HTTP_SERVER_PORT = 0
+
+# Панель записей в браузере /dashboard/<club>/ (на том же HTTP-сервере, см. dashboard.py): тренировки на
+# DASHBOARD_DAYS дней вперёд (считая сегодня) и лента записей — последние DASHBOARD_FEED_SIZE событий
+DASHBOARD_DAYS = 7
+DASHBOARD_FEED_SIZE = 50
+
+# Сторож long polling: если get_updates не завершался успешно POLL_STALL_SECONDS, polling перезапускается
+# (должно быть заметно больше таймаута long polling — 10 с). Задержка цикла событий замеряется раз в
+# LOOP_LAG_PROBE_SECONDS; больше LOOP_LAG_MAX_SECONDS — /health/live отвечает 503
+POLL_STALL_SECONDS = 90
+LOOP_LAG_PROBE_SECONDS = 1.0
+LOOP_LAG_MAX_SECONDS = 2.0
+
+# Абонементы: сколько занятий начисляет /pass_add по умолчанию и когда списывать занятие:
+# "booking" — при подтверждении записи (в одной транзакции с ней), "attendance" — только по /attended
+PASS_SESSIONS = 8
+PASS_DEBIT_ON = "booking"
+
+# Метки ссылок t.me/<бот>?start=<метка>: метка → подпись в форме записи и отчёте /sources.
+# Неизвестные метки считаются вместе («неизвестная метка»); приветствие по метке — SOURCE_GREETING в locales/
+START_SOURCES = {
+    "ref_site": "Сайт",
+    "utm_website": "Сайт (UTM)",
+}
+
+# Мест на тренировке: slot_id → сколько (слота нет — без ограничения). Проверяется при записи и переносе (/mybookings)
+SLOT_CAPACITY = {}  # например: {"wed_gym": 12, "fri_gym": 12}
+
+# Отметка посещаемости (/roster): тренеры — chat_id → имя, как в записи (админ видит все тренировки);
+# отметки пишутся в базу пачкой, когда нажатия стихли на ROSTER_DEBOUNCE_SECONDS
+TRAINER_CHAT_IDS = {}  # например: {123456789: "Максим", 987654321: "Даша"}
+ROSTER_DEBOUNCE_SECONDS = 2.0
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Панель записей для админа в браузере: тренировки на ближайшие дни и живая лента записей.
+
+Раздаёт локальный HTTP-сервер (http_server) в том же цикле событий, что и бот:
+
+    /dashboard/<club_id>/           — страница (статична, собирается один раз)
+    /dashboard/<club_id>/sessions   — таблица тренировок: сегодня и ещё days − 1 дней по расписанию клуба
+                                      (SLOTS_BY_DAY), записано / мест (SLOT_CAPACITY), по уровням и тренерам
+    /dashboard/<club_id>/events     — лента (Server-Sent Events): запись, отмена, перенос
+
+Таблица — из кэша: один запрос к базе (BookingStore.session_counts, в потоке) собирает её целиком, и она
+отдаётся готовыми байтами с ETag, пока не было записи, отмены или переноса (обработчики бота вызывают
+notify) и не сменился день. Сколько бы вкладок ни было открыто, база читается один раз на изменение.
+Лента не читает базу вовсе: notify раздаёт событие подписчикам через их очереди; последние feed_size
+событий (при старте — из базы) помнятся, переподключение с Last-Event-ID получает пропущенные.
+Страница по событию перезапрашивает таблицу (с If-None-Match). Имена записавшихся видны на странице —
+сервер слушает HTTP_SERVER_HOST (по умолчанию только локально); наружу — только за прокси с авторизацией.
+"""
+
+import asyncio
+import datetime
+import hashlib
+import html
+import json
+import logging
+import time
+from collections import Counter, deque
+
+import storage
+from http_server import Response, StreamResponse, text_response
+
+logger = logging.getLogger(__name__)
+
+KINDS = {"booking": "✅", "cancel": "❌", "move": "🔁"}
+_WEEKDAY_SHORT = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
+_DAYS = {index: day for day, index in storage.WEEKDAYS.items()}
+
+
+class BookingBoard:
+    """Панель одного бота (клуба): кэш таблицы тренировок и подписчики ленты."""
+
+    def __init__(self, app, days: int = 7, feed_size: int = 50, heartbeat: float = 15.0):
+        self.app = app
+        self.days = days
+        self.heartbeat = heartbeat
+        self._version = 0  # растёт с каждым изменением записей
+        self._lock = asyncio.Lock()
+        self._sessions = None  # (ключ, тело, ETag)
+        self._page = None
+        # Номера событий — с меткой процесса: Last-Event-ID от прошлого запуска не совпадёт с новыми
+        self._epoch = format(int(time.time()), "x")
+        self._next_id = 0
+        self._events = deque(maxlen=feed_size)  # (номер, вид, JSON)
+        self._subscribers = set()  # asyncio.Queue на каждое открытое соединение ленты
+        self.hits = 0
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def load(self) -> None:
+        """Начало ленты — последние записи из базы (при сборке бота)."""
+        store = self.app.bot_data["bookings"]
+        for booking, cancelled in store.recent(self._events.maxlen):
+            self._append("cancel" if cancelled else "booking", booking.created_at[11:16], booking)
+
+    # --- Изменения (из обработчиков бота, после записи в базу) ---
+    def notify(self, kind: str, *bookings: storage.Booking) -> None:
+        """Записи изменились: сбросить таблицу и разослать событие ленты. kind — booking, cancel, move
+        (для move — старая и новая запись)."""
+        self._version += 1
+        event = self._append(kind, datetime.datetime.now().strftime("%H:%M"), *bookings)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Клиент не успевает читать: отключить, переподключится с Last-Event-ID
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _append(self, kind: str, at: str, *bookings: storage.Booking) -> tuple:
+        booking = bookings[-1]
+        text = f"{at} {KINDS[kind]} {booking.name} — {self._session_line(booking)}"
+        if kind == "move":
+            text += f" (было: {self._session_line(bookings[0])})"
+        self._next_id += 1
+        event = (self._next_id, kind, json.dumps({"kind": kind, "text": text}, ensure_ascii=False))
+        self._events.append(event)
+        return event
+
+    def _session_line(self, booking: storage.Booking) -> str:
+        date = datetime.date.fromisoformat(booking.session_date)
+        label = self.app.bot_data["club"].content.SLOT_TO_LABEL.get(booking.slot_id, booking.slot_id)
+        return f"{_date_label(date)}, {label} · {booking.trainer} · {booking.level}"
+
+    # --- Таблица тренировок ---
+    async def sessions(self) -> tuple:
+        """Готовая таблица (тело, ETag): из кэша или, если записи менялись, — одним запросом к базе."""
+        async with self._lock:
+            today = datetime.date.today()
+            content = self.app.bot_data["club"].content
+            # Версия берётся до запроса: изменение во время него сбросит кэш ещё раз
+            key = (self._version, today, id(content))
+            if self._sessions is not None and self._sessions[0] == key:
+                self.hits += 1
+                return self._sessions[1:]
+            last = today + datetime.timedelta(days=self.days - 1)
+            store = self.app.bot_data["bookings"]
+            rows = await asyncio.to_thread(store.session_counts, today.isoformat(), last.isoformat())
+            body = self._render_sessions(content, today, rows).encode("utf-8")
+            self._sessions = (key, body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"')
+            self.builds += 1
+            return self._sessions[1:]
+
+    def _render_sessions(self, content, today: datetime.date, rows: list) -> str:
+        # (дата, slot_id) → [записано, по уровням, по тренерам]: сначала все тренировки по расписанию
+        sessions = {}
+        for offset in range(self.days):
+            date = today + datetime.timedelta(days=offset)
+            for slot_id, _label in content.SLOTS_BY_DAY.get(_DAYS[date.weekday()], ()):
+                sessions[(date.isoformat(), slot_id)] = [0, Counter(), Counter()]
+        # …и записи (в том числе на слоты, которых в расписании уже нет)
+        for session_date, slot_id, trainer, level, count in rows:
+            totals = sessions.setdefault((session_date, slot_id), [0, Counter(), Counter()])
+            totals[0] += count
+            totals[1][level] += count
+            totals[2][trainer] += count
+
+        capacity = self.app.bot_data["club"].cfg.SLOT_CAPACITY
+        out = [
+            f"<p>Записей на {self.days} дн.: {sum(totals[0] for totals in sessions.values())} · "
+            f"обновлено {datetime.datetime.now():%H:%M:%S}</p>",
+            "<table><tr><th>Дата</th><th>Время</th><th>Тренировка</th><th>Записано</th>"
+            "<th>По уровням</th><th>По тренерам</th></tr>",
+        ]
+        for (session_date, slot_id), (total, levels, trainers) in sorted(
+            sessions.items(), key=lambda item: (item[0][0], content.SLOT_TO_TIME.get(item[0][1], ""))
+        ):
+            date = datetime.date.fromisoformat(session_date)
+            places = capacity.get(slot_id)
+            full = places is not None and total >= places
+            out.append(
+                f'<tr class="{"today" if date == today else ""}{" full" if full else ""}">'
+                f"<td>{_date_label(date)}</td>"
+                f"<td>{html.escape(content.SLOT_TO_TIME.get(slot_id, '—'))}</td>"
+                f"<td>{html.escape(content.SLOT_TO_LABEL.get(slot_id, slot_id))}</td>"
+                f"<td>{total}{f' / {places}' if places is not None else ''}</td>"
+                f"<td>{_counts(levels)}</td><td>{_counts(trainers)}</td></tr>"
+            )
+        out.append("</table>")
+        return "\n".join(out)
+
+    # --- Лента ---
+    async def _stream(self, last_id: str):
+        queue = asyncio.Queue(maxsize=self._events.maxlen)
+        self._subscribers.add(queue)
+        getter = None
+        try:
+            yield b"retry: 5000\n\n"
+            epoch, _, number = last_id.partition("-")
+            after = int(number) if epoch == self._epoch and number.isdigit() else 0
+            for event in list(self._events):
+                if event[0] > after:
+                    yield self._encode(event)
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter}, timeout=self.heartbeat)
+                if not done:
+                    # Комментарий SSE: держит соединение через прокси и показывает, что клиент ещё здесь
+                    yield b": ping\n\n"
+                    continue
+                event, getter = getter.result(), None
+                if event is None:
+                    return
+                yield self._encode(event)
+        finally:
+            if getter is not None:
+                getter.cancel()
+            self._subscribers.discard(queue)
+
+    def _encode(self, event: tuple) -> bytes:
+        number, kind, data = event
+        return f"id: {self._epoch}-{number}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8")
+
+    # --- HTTP ---
+    async def handle(self, request) -> Response:
+        """Обработчик маршрута /dashboard/<club_id>/ (см. http_server.HttpServer.route)."""
+        if request.path in ("", "/"):
+            if self._page is None:
+                self._page = _PAGE.replace("{title}", html.escape(self._title())).encode("utf-8")
+            return Response(200, self._page, (("Content-Type", "text/html; charset=utf-8"),))
+        if request.path == "sessions":
+            body, etag = await self.sessions()
+            headers = (("ETag", etag), ("Cache-Control", "no-cache"))
+            if etag in request.headers.get("if-none-match", ""):
+                return Response(304, b"", headers)
+            return Response(200, body, (("Content-Type", "text/html; charset=utf-8"),) + headers)
+        if request.path == "events":
+            return StreamResponse(200, self._stream(request.headers.get("last-event-id", "")), (
+                ("Content-Type", "text/event-stream; charset=utf-8"),
+                ("Cache-Control", "no-cache"),
+                ("X-Accel-Buffering", "no"),  # nginx: не копить поток в буфере
+            ))
+        return text_response(404, "Not Found")
+
+    def _title(self) -> str:
+        club = self.app.bot_data["club"]
+        return f"Записи — {club.cfg.CLUB_NAME}" if club.cfg.CLUB_NAME else "Записи"
+
+
+def _date_label(date: datetime.date) -> str:
+    return f"{_WEEKDAY_SHORT[date.weekday()]} {date:%d.%m}"
+
+
+def _counts(counter: Counter) -> str:
+    return " · ".join(f"{html.escape(str(name))} {count}" for name, count in counter.most_common()) or "—"
+
+
+_PAGE = """<!doctype html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body { font: 14px/1.4 system-ui, sans-serif; margin: 1.5em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 1.5em; }
+th, td { padding: .3em .8em; border-bottom: 1px solid #ddd; text-align: left; }
+tr.today { background: #f3f8ff; }
+tr.full td:nth-child(4) { color: #b00; font-weight: bold; }
+#feed { list-style: none; padding: 0; }
+#feed li { padding: .2em 0; }
+#feed li.cancel { color: #888; }
+#state { color: #888; font-size: 12px; }
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div id="sessions">Загрузка…</div>
+<h2>Лента <span id="state"></span></h2>
+<ul id="feed"></ul>
+<script>
+const sessions = document.getElementById("sessions");
+const feed = document.getElementById("feed");
+const state = document.getElementById("state");
+let timer = null;
+
+function refresh() {
+  clearTimeout(timer);
+  timer = setTimeout(() => {
+    fetch("sessions", {cache: "no-cache"}).then(r => r.ok ? r.text() : Promise.reject(r.status))
+      .then(html => { sessions.innerHTML = html; }).catch(() => {});
+  }, 300);
+}
+
+const source = new EventSource("events");
+source.onopen = () => { state.textContent = ""; refresh(); };
+source.onerror = () => { state.textContent = "(нет связи, переподключение…)"; };
+for (const kind of ["booking", "cancel", "move"]) {
+  source.addEventListener(kind, e => {
+    const li = document.createElement("li");
+    li.className = kind;
+    li.textContent = JSON.parse(e.data).text;
+    feed.prepend(li);
+    while (feed.children.length > 200) feed.lastChild.remove();
+    refresh();
+  });
+}
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Повторы апдейтов отбрасываются до обработчиков: повторная доставка (после перезапуска Telegram присылает
+неподтверждённые апдейты ещё раз, webhook повторяет запрос) и двойное нажатие кнопки, которую нельзя
+повторять («✅ Да» в reg_confirm иначе отправит админу две записи).
+
+Помнятся update_id за update_window секунд и нажатия (пользователь, callback_data, сообщение) за
+callback_window — только для callback_data с префиксами callback_prefixes (необратимые действия: запись,
+отмена, перенос). Остальные кнопки повторять можно: переключатель «пришёл» в /roster, нажатый дважды
+подряд, — это отмена ошибочной отметки, а не повтор. Обе структуры — OrderedDict по времени добавления: устаревшие снимаются с начала,
+сверх max_entries вытесняются самые старые. Окно сохраняется в JSON (раз в flush_interval секунд, если
+изменилось, и при остановке) и подхватывается при старте — повтор после перезапуска тоже отбрасывается.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from telegram.error import TelegramError
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateDeduplicator:
+    """Окно недавних апдейтов одного бота (клуба). Подключается в BotApplication.update_filters."""
+
+    def __init__(self, update_window: float = 3600.0, callback_window: float = 2.0, max_entries: int = 5000,
+                 path: str = "", flush_interval: float = 5.0, callback_prefixes: tuple = ()):
+        self.update_window = update_window
+        self.callback_window = callback_window
+        self.callback_prefixes = tuple(callback_prefixes)
+        self.max_entries = max_entries
+        self.path = path
+        self.flush_interval = flush_interval
+        self._updates = OrderedDict()  # update_id → time.time()
+        self._callbacks = OrderedDict()  # (user_id, callback_data, сообщение) → time.time()
+        self._dirty = False
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._updates) + len(self._callbacks)
+
+    def is_duplicate(self, update, now: float = None) -> bool:
+        """Апдейт уже был (или это повторное нажатие) — True; иначе запомнить и вернуть False."""
+        now = time.time() if now is None else now
+        _expire(self._updates, now - self.update_window)
+        _expire(self._callbacks, now - self.callback_window)
+        update_id = update.update_id
+        keys = [(self._updates, update_id)]
+        query = update.callback_query
+        if query is not None and query.data is not None and query.data.startswith(self.callback_prefixes):
+            message = query.message.message_id if query.message is not None else query.inline_message_id
+            keys.append((self._callbacks, (query.from_user.id, query.data, message)))
+        if any(key in seen for seen, key in keys):
+            self.dropped += 1
+            return True
+        for seen, key in keys:
+            seen[key] = now
+            if len(seen) > self.max_entries:
+                seen.popitem(last=False)
+        self._dirty = True
+        return False
+
+    async def drop(self, app, update) -> bool:
+        """Фильтр апдейтов (BotApplication.update_filters): True — повтор, не обрабатывать."""
+        if not self.is_duplicate(update):
+            return False
+        logger.info("Повтор апдейта %s отброшен", update.update_id)
+        if update.callback_query is not None:
+            # Иначе у повторного нажатия крутятся «часики» на кнопке
+            try:
+                await update.callback_query.answer()
+            except TelegramError:
+                pass
+        return True
+
+    # --- Сохранение окна между перезапусками ---
+    def snapshot(self) -> dict:
+        return {
+            "updates": [[update_id, ts] for update_id, ts in self._updates.items()],
+            "callbacks": [[*key, ts] for key, ts in self._callbacks.items()],
+        }
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Не удалось прочитать окно повторов из %s: %s", self.path, e)
+            return
+        now = time.time()
+        for update_id, ts in data.get("updates", []):
+            if ts > now - self.update_window:
+                self._updates[update_id] = ts
+        for user_id, callback_data, message, ts in data.get("callbacks", []):
+            if ts > now - self.callback_window:
+                self._callbacks[(user_id, callback_data, message)] = ts
+
+    async def flush_on_stop(self, app) -> None:
+        await self.flush()
+
+    async def flush(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        data = self.snapshot()
+        await asyncio.to_thread(_write_json_atomic, self.path, data)
+
+    async def run_flusher(self, app) -> None:
+        """Фоновый сервис (см. BotApplication.services): сброс раз в flush_interval секунд."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.warning("Не удалось сохранить окно повторов в %s: %s", self.path, e)
+
+
+def _expire(seen: OrderedDict, oldest: float) -> None:
+    while seen:
+        key, ts = next(iter(seen.items()))
+        if ts > oldest:
+            return
+        del seen[key]
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
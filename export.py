@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Выгрузка записей на тренировки в CSV или XLSX для тренеров.
+
+Строки идут потоком из курсора storage.BookingStore.iter_bookings прямо в файл: CSV — построчно,
+XLSX — XML листа пишется в zip-архив по мере чтения (zipfile в режиме записи потока), без сборки
+книги в памяти. Память не зависит от числа записей. XLSX собирается без сторонних библиотек.
+
+Из командной строки:
+    python export.py bookings.db -o bookings.xlsx --slot wed_run --from 2026-09-01 --to 2026-09-30
+В боте — команда админа /export (см. bot.cmd_export).
+"""
+
+import argparse
+import csv
+import datetime
+import re
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+from storage import COLUMNS, BookingStore
+
+FORMATS = ("csv", "xlsx")
+
+# Заголовки столбцов в файле (порядок — storage.COLUMNS)
+HEADERS = {
+    "id": "№",
+    "created_at": "Записан",
+    "session_date": "Дата тренировки",
+    "day": "День",
+    "slot_id": "Слот",
+    "time": "Время",
+    "trainer": "Тренер",
+    "level": "Уровень",
+    "location": "Локация",
+    "user_id": "chat_id",
+    "username": "Username",
+    "name": "Имя",
+    "contact": "Контакт",
+    "lang": "Язык",
+    "attended": "Пришёл",
+    "cancelled_at": "Отменена",
+    "source": "Источник",
+}
+
+# Значения, которые табличный редактор принял бы за формулу (кроме телефонов вида +375 29 …)
+_FORMULA_PREFIX = re.compile(r"^[=+\-@\t\r](?![\d\s()\-]*$)")
+# Символы, недопустимые в XML 1.0
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def export_bookings(store: BookingStore, out_path: str, fmt: str = "csv", **filters) -> int:
+    """Записать записи по фильтрам (slot_id, trainer, date_from, date_to, cancelled) в файл. Возвращает число строк."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат: {fmt} (нужен csv или xlsx)")
+    rows = store.iter_bookings(**filters)
+    if fmt == "csv":
+        return write_csv(rows, out_path)
+    return write_xlsx(rows, out_path)
+
+
+def write_csv(rows, out_path: str) -> int:
+    """CSV в UTF-8 с BOM (чтобы Excel правильно открыл кириллицу), разделитель — запятая."""
+    count = 0
+    with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([HEADERS[c] for c in COLUMNS])
+        for row in rows:
+            writer.writerow([_csv_safe(value) for value in row])
+            count += 1
+    return count
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and _FORMULA_PREFIX.match(value):
+        return "'" + value
+    return value
+
+
+# --- XLSX: минимальная книга из одного листа (строки — inlineStr, числа — как числа) ---
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Записи" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+_COLUMN_LETTERS = [chr(ord("A") + i) for i in range(len(COLUMNS))]
+
+
+def write_xlsx(rows, out_path: str, batch_size: int = 500) -> int:
+    """XLSX: служебные части книги + лист, который пишется в архив пачками по batch_size строк."""
+    count = 0
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            chunk = [_SHEET_HEAD, _xlsx_row(1, [HEADERS[c] for c in COLUMNS])]
+            for row in rows:
+                count += 1
+                chunk.append(_xlsx_row(count + 1, row))
+                if len(chunk) >= batch_size:
+                    sheet.write("".join(chunk).encode("utf-8"))
+                    chunk.clear()
+            chunk.append(_SHEET_TAIL)
+            sheet.write("".join(chunk).encode("utf-8"))
+    return count
+
+
+def _xlsx_row(number: int, values) -> str:
+    cells = []
+    for letter, value in zip(_COLUMN_LETTERS, values):
+        ref = f"{letter}{number}"
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        elif value is not None and value != "":
+            text = escape(_XML_ILLEGAL.sub("", str(value)))
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+# --- Командная строка ---
+def _date(value: str) -> str:
+    return datetime.date.fromisoformat(value).isoformat()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Выгрузка записей на тренировки в CSV/XLSX")
+    parser.add_argument("db", help="файл базы записей (config.BOOKINGS_DB, у клубов — bookings.<клуб>.db)")
+    parser.add_argument("-o", "--output", required=True, help="куда записать (.csv или .xlsx)")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="формат; по умолчанию — по расширению файла")
+    parser.add_argument("--slot", dest="slot_id", help="слот, например wed_run")
+    parser.add_argument("--trainer", help="тренер, как в форме записи (например, Максим)")
+    parser.add_argument("--from", dest="date_from", type=_date, help="дата тренировки от (ГГГГ-ММ-ДД)")
+    parser.add_argument("--to", dest="date_to", type=_date, help="дата тренировки до, включительно")
+    parser.add_argument("--cancelled", action="store_true", help="и отменённые записи (столбец «Отменена»)")
+    args = parser.parse_args(argv)
+    fmt = args.format or ("xlsx" if args.output.lower().endswith(".xlsx") else "csv")
+    count = export_bookings(
+        BookingStore(args.db), args.output, fmt,
+        slot_id=args.slot_id, trainer=args.trainer, date_from=args.date_from, date_to=args.date_to,
+        cancelled=args.cancelled,
+    )
+    print(f"Записей: {count} → {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
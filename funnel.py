@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Воронка записи: где пользователи бросают сценарий день → слот → [тренер] → уровень → контакт → подтверждение.
+
+Счётчики — массивы фиксированного размера (array 'Q'): матрица переходов между этапами, выбор и запись
+по слотам и дням. Запись одного апдейта — несколько инкрементов по индексу, без аллокаций.
+Накопленные значения периодически сбрасываются в JSON (в отдельном потоке) и подхватываются при старте.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from array import array
+
+from middleware import conversation_state
+
+logger = logging.getLogger(__name__)
+
+# Этапы воронки. none — вне сценария; done — запись подтверждена; exit — ушёл в меню/заново;
+# fallback_exit — выкинул fallback_unexpected_text (текст вместо кнопки)
+STAGES = ("none", "day", "slot", "trainer", "level", "contact", "confirm", "done", "exit", "fallback_exit")
+_STAGE_INDEX = {name: i for i, name in enumerate(STAGES)}
+_FUNNEL_STAGES = ("day", "slot", "trainer", "level", "contact", "confirm")
+
+# Обработчики, чей выход из диалога — не «ушёл», а особый исход
+_END_STAGE_BY_HANDLER = {"reg_confirm": "done", "fallback_unexpected_text": "fallback_exit"}
+
+
+class Funnel:
+    """Счётчики воронки одного бота (клуба).
+
+    state_stages — состояние ConversationHandler → этап (REG_DAY → "day" и т.д.), end_state — значение END.
+    """
+
+    def __init__(self, state_stages: dict, end_state, slot_ids, days, path: str = "", flush_interval: float = 60.0):
+        self.end_state = end_state
+        self.path = path
+        self.flush_interval = flush_interval
+        self._state_index = {state: _STAGE_INDEX[stage] for state, stage in state_stages.items()}
+        self.slot_ids = list(slot_ids)
+        self.days = list(days)
+        self._slot_index = {slot_id: i for i, slot_id in enumerate(self.slot_ids)}
+        self._day_index = {day: i for i, day in enumerate(self.days)}
+        n = len(STAGES)
+        self.transitions = array("Q", bytes(8 * n * n))
+        # Последний элемент — «неизвестный» слот/день
+        self.slot_selected = array("Q", bytes(8 * (len(self.slot_ids) + 1)))
+        self.slot_confirmed = array("Q", bytes(8 * (len(self.slot_ids) + 1)))
+        self.day_selected = array("Q", bytes(8 * (len(self.days) + 1)))
+        self.day_confirmed = array("Q", bytes(8 * (len(self.days) + 1)))
+        self._dirty = False
+
+    # --- Запись (в цикле событий, дёшево) ---
+    def _stage_of(self, state, handler_name: str) -> int:
+        if state is None:
+            return 0
+        if state == self.end_state:
+            return _STAGE_INDEX[_END_STAGE_BY_HANDLER.get(handler_name, "exit")]
+        return self._state_index.get(state, 0)
+
+    def record(self, handler_name: str, prev_state, next_state, slot_id=None, day=None) -> None:
+        prev = self._stage_of(prev_state, handler_name)
+        # None от обработчика — диалог остаётся в том же состоянии
+        nxt = prev if next_state is None else self._stage_of(next_state, handler_name)
+        self.transitions[prev * len(STAGES) + nxt] += 1
+        if handler_name == "reg_choose_slot" and slot_id is not None:
+            self.slot_selected[self._slot_index.get(slot_id, -1)] += 1
+        elif handler_name == "reg_choose_day" and day is not None:
+            self.day_selected[self._day_index.get(day, -1)] += 1
+        elif nxt == _STAGE_INDEX["done"]:
+            self.slot_confirmed[self._slot_index.get(slot_id, -1)] += 1
+            self.day_confirmed[self._day_index.get(day, -1)] += 1
+        self._dirty = True
+
+    # --- Отчёт ---
+    def _count(self, src: str, dst: str) -> int:
+        return self.transitions[_STAGE_INDEX[src] * len(STAGES) + _STAGE_INDEX[dst]]
+
+    def entered(self, stage: str) -> int:
+        j = _STAGE_INDEX[stage]
+        return sum(self.transitions[i * len(STAGES) + j] for i in range(len(STAGES)) if i != j)
+
+    def report(self) -> str:
+        started = self.entered("day")
+        done = self.entered("done")
+        lines = ["Воронка записи", "", "Этап       вошли  ушли  fallback"]
+        for stage in _FUNNEL_STAGES:
+            lines.append(
+                f"{stage:<10} {self.entered(stage):>5} {self._count(stage, 'exit'):>5} {self._count(stage, 'fallback_exit'):>9}"
+            )
+        conversion = f" ({done * 100 // started}% от начавших)" if started else ""
+        lines += ["", f"Записались: {done}{conversion}", "", "Слот          выбрали  записались"]
+        for i, slot_id in enumerate(self.slot_ids):
+            if self.slot_selected[i] or self.slot_confirmed[i]:
+                lines.append(f"{slot_id:<13} {self.slot_selected[i]:>7} {self.slot_confirmed[i]:>11}")
+        lines += ["", "День  выбрали  записались"]
+        for i, day in enumerate(self.days):
+            if self.day_selected[i] or self.day_confirmed[i]:
+                lines.append(f"{day:<5} {self.day_selected[i]:>7} {self.day_confirmed[i]:>11}")
+        return "\n".join(lines)
+
+    # --- Сохранение: по именам, а не индексам — переживает изменение сетки слотов ---
+    def snapshot(self) -> dict:
+        n = len(STAGES)
+        return {
+            "transitions": {
+                f"{STAGES[i // n]}>{STAGES[i % n]}": count for i, count in enumerate(self.transitions) if count
+            },
+            "slot_selected": dict(zip(self.slot_ids + ["?"], self.slot_selected)),
+            "slot_confirmed": dict(zip(self.slot_ids + ["?"], self.slot_confirmed)),
+            "day_selected": dict(zip(self.days + ["?"], self.day_selected)),
+            "day_confirmed": dict(zip(self.days + ["?"], self.day_confirmed)),
+        }
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Не удалось прочитать воронку из %s: %s", self.path, e)
+            return
+        n = len(STAGES)
+        for key, count in data.get("transitions", {}).items():
+            src, _, dst = key.partition(">")
+            if src in _STAGE_INDEX and dst in _STAGE_INDEX:
+                self.transitions[_STAGE_INDEX[src] * n + _STAGE_INDEX[dst]] += count
+        for name, names in (("slot_selected", self.slot_ids), ("slot_confirmed", self.slot_ids),
+                            ("day_selected", self.days), ("day_confirmed", self.days)):
+            counters = getattr(self, name)
+            index = {key: i for i, key in enumerate(names)}
+            for key, count in data.get(name, {}).items():
+                counters[index.get(key, -1)] += count
+
+    async def flush_on_stop(self, app) -> None:
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записать счётчики на диск (снимок — в цикле событий, запись файла — в потоке)."""
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        data = self.snapshot()
+        await asyncio.to_thread(_write_json_atomic, self.path, data)
+
+    async def run_flusher(self, app) -> None:
+        """Фоновый сервис (см. BotApplication.services): сброс раз в flush_interval секунд."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.warning("Не удалось сохранить воронку в %s: %s", self.path, e)
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+async def funnel_middleware(info, update, context, call_next):
+    """Прослойка (см. middleware.install): переход по воронке для обработчиков диалога «register»."""
+    if info.conversation != "register":
+        return await call_next()
+    funnel = context.bot_data.get("funnel")
+    if funnel is None:
+        return await call_next()
+    prev_state = conversation_state(info, update)
+    # reg_confirm удаляет user_data["reg"] — слот и день запоминаем до вызова
+    reg = context.user_data.get("reg") or {}
+    slot_id, day = reg.get("slot_id"), reg.get("day")
+    next_state = await call_next()
+    if info.name == "reg_choose_slot":
+        slot_id = update.callback_query.data.replace("reg:slot:", "")
+    elif info.name == "reg_choose_day":
+        day = update.callback_query.data.replace("reg:day:", "")
+    funnel.record(info.name, prev_state, next_state, slot_id, day)
+    return next_state
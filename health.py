@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Здоровье процесса: задержка цикла событий, живость long polling и сторож, который его перезапускает.
+
+Запросы к Bot API проходят через http_pool.MonitoredRequest, он отмечает здесь успешные get_updates
+и отправки (по токену в URL — отдельно для каждого бота). Фоновые сервисы (BotApplication.services):
+  - run_lag_probe — дешёвый замер: насколько позже срока просыпается asyncio.sleep (задержка цикла);
+  - run_watchdog — если у бота get_updates не завершался успешно stall_seconds, polling перезапускается
+    (сеть зависла, отозван токен — процесс жив, а сообщения не приходят).
+Эндпоинты локального HTTP-сервера (http_server): /health/live — задержка цикла (503, если больше
+max_lag), /health/ready — последние успешные get_updates и отправка у каждого бота (503, если polling стоит).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+
+from http_server import Response
+
+logger = logging.getLogger(__name__)
+
+# Методы Bot API, которые считаются отправкой пользователю (для /health/ready)
+_OUTBOUND_PREFIXES = ("send", "edit", "answer", "forward", "copy")
+# Сколько последних замеров задержки помнить (максимум по окну — в /health/live)
+_LAG_WINDOW = 60
+
+
+class BotHealth:
+    """Состояние одного бота (клуба); время — time.monotonic()."""
+
+    __slots__ = ("club_id", "app", "watched_since", "last_poll", "last_send", "restarts")
+
+    def __init__(self, club_id: str, app):
+        self.club_id = club_id
+        self.app = app
+        self.watched_since = time.monotonic()
+        self.last_poll = None
+        self.last_send = None
+        self.restarts = 0
+
+    def poll_age(self, now: float) -> float:
+        """Сколько секунд без успешного get_updates (до первого — с начала наблюдения или перезапуска)."""
+        return now - max(self.last_poll or 0.0, self.watched_since)
+
+    def polling(self, now: float, stall_seconds: float) -> bool:
+        app = self.app
+        return app.updater.running and not app.stopping and self.poll_age(now) <= stall_seconds
+
+
+class HealthMonitor:
+    def __init__(self, stall_seconds: float = 90.0, probe_interval: float = 1.0, max_lag: float = 2.0):
+        self.stall_seconds = stall_seconds
+        self.probe_interval = probe_interval
+        self.max_lag = max_lag
+        self.bots = {}  # токен → BotHealth
+        self.loop_lag = 0.0
+        self._lags = deque(maxlen=_LAG_WINDOW)
+
+    def configure(self, stall_seconds: float, probe_interval: float, max_lag: float) -> None:
+        self.stall_seconds = stall_seconds
+        self.probe_interval = probe_interval
+        self.max_lag = max_lag
+
+    def watch(self, app) -> None:
+        self.bots[app.bot.token] = BotHealth(app.bot_data["club"].club_id, app)
+
+    def observe(self, url: str, status: int) -> None:
+        """Ответ Bot API (вызывается из http_pool.MonitoredRequest); url — .../bot<токен>/<метод>."""
+        if status != 200:
+            return
+        prefix, _, method = url.rpartition("/")
+        bot = self.bots.get(prefix.rpartition("/bot")[2])
+        if bot is None:
+            return
+        if method == "getUpdates":
+            bot.last_poll = time.monotonic()
+        elif method.startswith(_OUTBOUND_PREFIXES):
+            bot.last_send = time.monotonic()
+
+    # --- Фоновые сервисы ---
+    async def run_lag_probe(self, app) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.probe_interval)
+            self.loop_lag = max(loop.time() - start - self.probe_interval, 0.0)
+            self._lags.append(self.loop_lag)
+            if self.loop_lag > self.max_lag:
+                logger.warning("Цикл событий занят: задержка %.0f ms", self.loop_lag * 1000)
+
+    async def run_watchdog(self, app) -> None:
+        while True:
+            await asyncio.sleep(min(self.stall_seconds / 3, 30.0))
+            now = time.monotonic()
+            for bot in list(self.bots.values()):
+                if bot.app.stopping or bot.poll_age(now) <= self.stall_seconds:
+                    continue
+                logger.warning(
+                    "Polling бота %s стоит %.0f с — перезапуск", bot.club_id, bot.poll_age(now)
+                )
+                # Следующая проверка — не раньше чем через stall_seconds после перезапуска
+                bot.watched_since = now
+                bot.restarts += 1
+                try:
+                    await bot.app.restart_polling()
+                except Exception:
+                    logger.exception("Не удалось перезапустить polling бота %s", bot.club_id)
+
+    # --- HTTP (http_server.HttpServer.route) ---
+    async def handle_live(self, request) -> Response:
+        alive = self.loop_lag <= self.max_lag
+        return _json_response(alive, {
+            "alive": alive,
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "loop_lag_max_ms": round(max(self._lags, default=0.0) * 1000, 1),
+        })
+
+    async def handle_ready(self, request) -> Response:
+        now = time.monotonic()
+        bots = {}
+        for bot in self.bots.values():
+            bots[bot.club_id] = {
+                "polling": bot.polling(now, self.stall_seconds),
+                "last_poll_s": _age(now, bot.last_poll),
+                "last_send_s": _age(now, bot.last_send),
+                "restarts": bot.restarts,
+            }
+        ready = bool(bots) and all(state["polling"] for state in bots.values())
+        return _json_response(ready, {"ready": ready, "bots": bots})
+
+
+def _age(now: float, moment) -> float:
+    """Сколько секунд назад (None — ещё ни разу)."""
+    return None if moment is None else round(now - moment, 1)
+
+
+def _json_response(ok: bool, data: dict) -> Response:
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    headers = (("Content-Type", "application/json; charset=utf-8"), ("Cache-Control", "no-store"))
+    return Response(200 if ok else 503, body, headers)
+
+
+monitor = HealthMonitor()
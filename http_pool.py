@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP-клиенты Bot API: отдельный пул соединений для get_updates (long polling) и для всех отправок.
+
+Пока long polling держит соединение, отправки из обработчиков и уведомления админу не ждут в очереди
+к общему пулу. Размер пулов, keep-alive, таймауты и HTTP/2 задаются в config.py (HTTP_*).
+"""
+
+import importlib.util
+import logging
+
+import httpx
+
+import health
+from tracing import TracedRequest
+
+logger = logging.getLogger(__name__)
+
+
+class MonitoredRequest(TracedRequest):
+    """Отмечает ответы Bot API в health.monitor: успешные get_updates и отправки (для /health/ready и сторожа)."""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs):
+        status, payload = await super().do_request(url, method, *args, **kwargs)
+        health.monitor.observe(url, status)
+        return status, payload
+
+
+class SharedRequest(MonitoredRequest):
+    """Один пул на несколько ботов (мультиклубный режим): соединение закрывается, когда его отпустил последний бот."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._users = 0
+
+    async def initialize(self) -> None:
+        self._users += 1
+        await super().initialize()
+
+    async def shutdown(self) -> None:
+        self._users = max(self._users - 1, 0)
+        if self._users == 0:
+            await super().shutdown()
+
+
+def http2_available() -> bool:
+    """HTTP/2 требует пакет h2: pip install "python-telegram-bot[http2]"."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_request(
+    pool_size: int,
+    keepalive_connections: int = None,
+    keepalive_expiry: float = 30.0,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 5.0,
+    write_timeout: float = 5.0,
+    pool_timeout: float = 1.0,
+    http2: bool = False,
+    shared: bool = False,
+) -> TracedRequest:
+    """Клиент Bot API с заданным пулом. Без пакета h2 HTTP/2 отключается с предупреждением в лог.
+
+    shared=True — пул для нескольких ботов одного процесса (см. SharedRequest).
+    """
+    if http2 and not http2_available():
+        logger.warning('HTTP/2 недоступен (нет пакета h2): pip install "python-telegram-bot[http2]". Используется HTTP/1.1.')
+        http2 = False
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size if keepalive_connections is None else keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    request_class = SharedRequest if shared else MonitoredRequest
+    return request_class(
+        connection_pool_size=pool_size,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        write_timeout=write_timeout,
+        pool_timeout=pool_timeout,
+        http_version="2" if http2 else "1.1",
+        httpx_kwargs={"limits": limits},
+    )
+
+
+def build_send_request(cfg, shared: bool = False) -> TracedRequest:
+    """Пул для отправок (send_message, edit_message_text, answer и т.д.)."""
+    return build_request(
+        pool_size=cfg.HTTP_POOL_SIZE,
+        keepalive_connections=cfg.HTTP_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=cfg.HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=cfg.HTTP_CONNECT_TIMEOUT,
+        read_timeout=cfg.HTTP_READ_TIMEOUT,
+        write_timeout=cfg.HTTP_WRITE_TIMEOUT,
+        pool_timeout=cfg.HTTP_POOL_TIMEOUT,
+        http2=cfg.HTTP2,
+        shared=shared,
+    )
+
+
+def build_polling_request(cfg, bots: int = 1) -> TracedRequest:
+    """Пул для get_updates. К read_timeout PTB сам добавляет таймаут long polling.
+
+    bots > 1 — общий пул для нескольких ботов: у каждого свой long polling, размер пула умножается.
+    """
+    return build_request(
+        pool_size=cfg.HTTP_POLL_POOL_SIZE * bots,
+        keepalive_expiry=cfg.HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=cfg.HTTP_CONNECT_TIMEOUT,
+        read_timeout=cfg.HTTP_READ_TIMEOUT,
+        write_timeout=cfg.HTTP_WRITE_TIMEOUT,
+        pool_timeout=cfg.HTTP_POOL_TIMEOUT,
+        http2=cfg.HTTP2,
+        shared=bots > 1,
+    )
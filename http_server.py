@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Небольшой HTTP-сервер на asyncio (без сторонних библиотек) в том же цикле событий, что и боты.
+
+Только то, что нужно локальным эндпоинтам бота: GET/HEAD, маршруты по префиксу пути, ответ целиком
+(Content-Length) и соединение на один запрос. Поток (StreamResponse, например Server-Sent Events) пишется
+кусками, пока обработчик их отдаёт, и заканчивается закрытием соединения; открытые потоки обрываются при
+остановке сервера. Запускается как фоновый сервис (см. BotApplication.services).
+"""
+
+import asyncio
+import logging
+from typing import NamedTuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+_MAX_REQUEST_LINE = 8 * 1024
+_MAX_HEADERS = 64
+_READ_TIMEOUT = 10.0
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class Request(NamedTuple):
+    method: str
+    path: str  # без префикса маршрута, раскодированный
+    query: dict
+    headers: dict  # имена в нижнем регистре
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes = b""
+    headers: tuple = ()  # пары (имя, значение)
+
+
+class StreamResponse(NamedTuple):
+    """Ответ без Content-Length: тело — асинхронный генератор bytes, конец тела — закрытие соединения."""
+
+    status: int
+    chunks: object  # асинхронный генератор bytes; закрывается (aclose), когда клиент ушёл
+    headers: tuple = ()
+
+
+def text_response(status: int, text: str) -> Response:
+    return Response(status, text.encode("utf-8"), (("Content-Type", "text/plain; charset=utf-8"),))
+
+
+class HttpServer:
+    """Маршруты: route(prefix, handler), handler — корутинная функция handler(request) → Response.
+
+    Запрос уходит обработчику с самым длинным подходящим префиксом.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._routes = []
+        self._streams = set()  # задачи соединений с открытым потоком
+        self.requests = 0
+
+    def route(self, prefix: str, handler) -> None:
+        self._routes.append((prefix, handler))
+        self._routes.sort(key=lambda item: len(item[0]), reverse=True)
+
+    async def run(self, app) -> None:
+        """Фоновый сервис: слушать host:port, пока сервис не отменят при остановке."""
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info("HTTP-сервер слушает %s:%s", self.host, self.port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Потоки сами не заканчиваются — без этого закрытие сервера ждало бы клиентов
+            for task in self._streams:
+                task.cancel()
+            logger.info("HTTP-сервер остановлен")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(_read_request(reader), _READ_TIMEOUT)
+            if request is None:
+                response = text_response(400, "Bad Request")
+            else:
+                self.requests += 1
+                response = await self._dispatch(request)
+            head_only = request is not None and request.method == "HEAD"
+            if isinstance(response, StreamResponse):
+                await self._stream(response, writer, head_only)
+            else:
+                writer.write(_encode_response(response, head_only))
+                await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, response: StreamResponse, writer: asyncio.StreamWriter, head_only: bool) -> None:
+        task = asyncio.current_task()
+        self._streams.add(task)
+        try:
+            writer.write(_encode_head(response.status, response.headers))
+            await writer.drain()
+            if head_only:
+                return
+            # drain() после каждого куска: ушедший клиент — ConnectionError на ближайшей записи
+            async for chunk in response.chunks:
+                writer.write(chunk)
+                await writer.drain()
+        except asyncio.CancelledError:
+            pass  # остановка сервера (run): поток обрывается, соединение закрывается как обычно
+        except ConnectionError:
+            raise
+        except Exception:
+            logger.exception("Ошибка в потоке HTTP")
+        finally:
+            self._streams.discard(task)
+            await response.chunks.aclose()
+
+    async def _dispatch(self, request: Request) -> Response:
+        if request.method not in ("GET", "HEAD"):
+            return text_response(405, "Method Not Allowed")
+        for prefix, handler in self._routes:
+            if request.path.startswith(prefix):
+                try:
+                    return await handler(request._replace(path=request.path[len(prefix):]))
+                except Exception:
+                    logger.exception("Ошибка в обработчике HTTP %s", request.path)
+                    return text_response(500, "Internal Server Error")
+        return text_response(404, "Not Found")
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line or len(line) > _MAX_REQUEST_LINE:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        return None
+    method, target, _version = parts
+    headers = {}
+    for _ in range(_MAX_HEADERS):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, sep, value = line.decode("latin-1").partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    else:
+        return None
+    url = urlsplit(target)
+    return Request(method.upper(), unquote(url.path), parse_qs(url.query), headers)
+
+
+def _encode_head(status: int, headers: tuple, content_length: int = None) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    if content_length is not None:
+        lines.append(f"Content-Length: {content_length}")
+    lines += ["Connection: close", "", ""]
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def _encode_response(response: Response, head_only: bool = False) -> bytes:
+    head = _encode_head(response.status, response.headers, len(response.body))
+    return head if head_only else head + response.body
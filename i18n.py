@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Локализация: русский, беларуская, English.
+
+Каталоги — модули locales/<код>.py с константами (имена как в ru.py). При первом обращении они
+компилируются в неизменяемые таблицы: сообщения — namedtuple (t.MENU_PROMPT — поиск атрибута, как у
+константы модуля), словари подписей — MappingProxyType. Для каждого клуба и языка один раз собирается
+LocaleBundle: сообщения + готовые клавиатуры + контент клуба на этом языке. В обработчике остаётся
+выбрать пакет по пользователю (Locales.for_user) — два поиска в словаре.
+
+Язык: явный выбор пользователя (/lang), иначе language_code из Telegram.
+"""
+
+import functools
+import importlib
+import logging
+import string
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+import tenants
+
+logger = logging.getLogger(__name__)
+
+LOCALES = ("ru", "be", "en")
+DEFAULT_LOCALE = "ru"
+
+# language_code клиента Telegram → язык бота; прочие языки интерфейса — английский
+_LANGUAGE_TO_LOCALE = {"ru": "ru", "be": "be", "en": "en", "uk": "ru", "kk": "ru"}
+_FALLBACK_LOCALE = "en"
+
+
+class Catalog(NamedTuple):
+    """Скомпилированный каталог: сообщения (namedtuple Messages) и перевод контента клуба по умолчанию."""
+
+    messages: Any
+    content: MappingProxyType
+
+
+class LocaleBundle(NamedTuple):
+    """Всё, что нужно обработчику на одном языке: сообщения, готовые клавиатуры, контент клуба."""
+
+    code: str
+    t: Any
+    kb: Any
+    content: Any
+
+
+def frozen(typename: str, values: dict):
+    """Неизменяемая таблица с доступом по атрибуту (namedtuple); словари внутри — только для чтения."""
+    cls = namedtuple(typename, values)
+    return cls(**{name: _freeze(value) for name, value in values.items()})
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType(value)
+    return value
+
+
+def _read_catalog(code: str) -> dict:
+    module = importlib.import_module(f"locales.{code}")
+    return {name: getattr(module, name) for name in dir(module) if name.isupper()}
+
+
+def _placeholders(value) -> frozenset:
+    if not isinstance(value, str):
+        return frozenset()
+    return frozenset(field for _, field, _, _ in string.Formatter().parse(value) if field)
+
+
+@functools.lru_cache(maxsize=None)
+def catalogs() -> MappingProxyType:
+    """Все каталоги (компилируются один раз). Лишние имена и расхождение подстановок — ValueError при старте."""
+    base = _read_catalog(DEFAULT_LOCALE)
+    Messages = namedtuple("Messages", base)
+    compiled = {}
+    for code in LOCALES:
+        data = base if code == DEFAULT_LOCALE else _read_catalog(code)
+        content = {name: data[name] for name in tenants.CONTENT_KEYS if name in data}
+        unknown = sorted(set(data) - set(base) - set(content))
+        if unknown:
+            raise ValueError(f"Каталог {code}: неизвестные имена {', '.join(unknown)}")
+        missing = sorted(set(base) - set(data))
+        if missing:
+            logger.warning("Каталог %s: нет перевода для %s — используется %s", code, ", ".join(missing), DEFAULT_LOCALE)
+        for name in set(base) & set(data):
+            if _placeholders(base[name]) != _placeholders(data[name]):
+                raise ValueError(f"Каталог {code}: в {name} другие подстановки, чем в {DEFAULT_LOCALE}")
+        messages = Messages(**{name: _freeze(data.get(name, base[name])) for name in base})
+        compiled[code] = Catalog(messages, MappingProxyType(content))
+    return MappingProxyType(compiled)
+
+
+def build_locales(club: tenants.Club, build_keyboards) -> "Locales":
+    """Пакеты всех языков для клуба. build_keyboards(t, content) — готовые клавиатуры языка."""
+    bundles = {}
+    for code, catalog in catalogs().items():
+        content = tenants.localized_content(club, catalog.content)
+        bundles[code] = LocaleBundle(code, catalog.messages, build_keyboards(catalog.messages, content), content)
+    return Locales(bundles)
+
+
+class Locales:
+    """Пакеты языков одного бота и выбор языка пользователя."""
+
+    def __init__(self, bundles: dict, default: str = DEFAULT_LOCALE):
+        self.bundles = MappingProxyType(bundles)
+        self.default = bundles[default]
+        # Явный выбор (/lang): user_id → код языка. Отдельно от user_data — не вытесняется по TTL сессии
+        self.preferences = {}
+        # language_code клиента → пакет (кэш разбора тегов вида «en-US»)
+        self._by_language_code = {None: self.default}
+
+    def for_user(self, user) -> LocaleBundle:
+        if user is None:
+            return self.default
+        return self.resolve(user.id, user.language_code)
+
+    def resolve(self, user_id: int, language_code=None) -> LocaleBundle:
+        code = self.preferences.get(user_id)
+        if code is not None:
+            return self.bundles[code]
+        bundle = self._by_language_code.get(language_code)
+        if bundle is None:
+            code = _LANGUAGE_TO_LOCALE.get(language_code.split("-")[0].lower(), _FALLBACK_LOCALE)
+            bundle = self._by_language_code[language_code] = self.bundles[code]
+        return bundle
+
+    def set_preference(self, user_id: int, code: str) -> LocaleBundle:
+        if code not in self.bundles:
+            raise ValueError(f"Неизвестный язык: {code}")
+        self.preferences[user_id] = code
+        return self.bundles[code]
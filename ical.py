@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Календарь (iCalendar, RFC 5545): .ics для подтверждённой записи и подписки на слот или тренера.
+
+Запись — одно событие на дату тренировки (отправляется пользователю после подтверждения).
+Время событий — местное (TZID=ICS_TIMEZONE); в каждом файле рядом с событиями — VTIMEZONE этого пояса
+(смещение и переходы на летнее время из базы zoneinfo), иначе клиент вправе считать время плавающим.
+Подписки — еженедельные события (RRULE) из расписания клуба: SLOTS_BY_DAY, SLOT_TO_TIME,
+SLOT_TO_ADDRESS_TYPE → LOCATION_SHORT, SLOT_TO_TRAINER. Их раздаёт локальный HTTP-сервер:
+
+    /calendar/<club_id>/                     — список подписок
+    /calendar/<club_id>/slot/<slot_id>.ics
+    /calendar/<club_id>/trainer/<имя>.ics
+
+Календарные клиенты опрашивают подписки часто, а расписание меняется редко. Поэтому готовые файлы
+лежат в кэше вместе с ETag; кэш сбрасывается, только если изменился отпечаток расписания
+(хэш таблиц SCHEDULE_KEYS). Повторный запрос — поиск в словаре, а с If-None-Match — пустой ответ 304.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+import logging
+import zoneinfo
+
+from http_server import Response, text_response
+
+logger = logging.getLogger(__name__)
+
+PRODID = "-//Admin-Cadence//Training bot//RU"
+UID_DOMAIN = "admin-cadence"
+
+# Таблицы контента, из которых строятся подписки: их изменение сбрасывает кэш
+SCHEDULE_KEYS = (
+    "SLOTS_BY_DAY", "SLOT_TO_LABEL", "SLOT_TO_TIME", "SLOT_TO_ADDRESS_TYPE", "SLOT_TO_TRAINER", "LOCATION_SHORT",
+)
+
+_BYDAY = {"mon": "MO", "tue": "TU", "wed": "WE", "thu": "TH", "fri": "FR", "sat": "SA", "sun": "SU"}
+_WEEKDAYS = {day: i for i, day in enumerate(_BYDAY)}
+
+
+# --- Формат iCalendar ---
+def escape_text(value) -> str:
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Строки длиннее 75 октетов переносятся (CRLF + пробел), не разрывая символы UTF-8."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, current, size = [], [], 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > 75:
+            parts.append("".join(current))
+            current, size = [" "], 1
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return "\r\n".join(parts)
+
+
+def _stamp(moment: datetime.datetime) -> str:
+    return moment.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _local(moment: datetime.datetime) -> str:
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+
+def _offset(delta: datetime.timedelta) -> str:
+    """timedelta(hours=3) → «+0300» (с секундами — «+023017»)."""
+    seconds = int(delta.total_seconds())
+    sign, seconds = ("-" if seconds < 0 else "+"), abs(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{sign}{hours:02d}{minutes:02d}" + (f"{seconds:02d}" if seconds else "")
+
+
+@functools.lru_cache(maxsize=32)
+def vtimezone(tz: str, year: int) -> tuple:
+    """VTIMEZONE для TZID=tz на год year: ежегодные правила перехода или одно постоянное смещение.
+
+    Правила берутся из переходов прошлого года — тогда они действуют и с 1 января года year.
+    """
+    zone = zoneinfo.ZoneInfo(tz)
+    utc = datetime.timezone.utc
+    moment = datetime.datetime(year - 1, 1, 1, tzinfo=utc)
+    transitions = []
+    for _day in range(366):
+        following = moment + datetime.timedelta(days=1)
+        if moment.astimezone(zone).utcoffset() != following.astimezone(zone).utcoffset():
+            # Переход внутри суток — найти час
+            while moment.astimezone(zone).utcoffset() == (moment + datetime.timedelta(hours=1)).astimezone(zone).utcoffset():
+                moment += datetime.timedelta(hours=1)
+            transitions.append(moment + datetime.timedelta(hours=1))
+        moment = following
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tz}"]
+    if not transitions:
+        local = datetime.datetime(year, 1, 1, tzinfo=utc).astimezone(zone)
+        offset = _offset(local.utcoffset())
+        lines += ["BEGIN:STANDARD", "DTSTART:19700101T000000", f"TZOFFSETFROM:{offset}", f"TZOFFSETTO:{offset}",
+                  f"TZNAME:{escape_text(local.tzname())}", "END:STANDARD"]
+    for onset in transitions:
+        before = (onset - datetime.timedelta(seconds=1)).astimezone(zone)
+        after = onset.astimezone(zone)
+        start = onset.replace(tzinfo=None) + before.utcoffset()  # местное время до перехода
+        # Правило года: n-й (или последний, −1) такой день недели месяца
+        last = (start + datetime.timedelta(days=7)).month != start.month
+        nth = -1 if last else (start.day - 1) // 7 + 1
+        kind = "DAYLIGHT" if after.dst() else "STANDARD"
+        lines += [
+            f"BEGIN:{kind}", f"DTSTART:{_local(start)}",
+            f"RRULE:FREQ=YEARLY;BYMONTH={start.month};BYDAY={nth}{tuple(_BYDAY.values())[start.weekday()]}",
+            f"TZOFFSETFROM:{_offset(before.utcoffset())}", f"TZOFFSETTO:{_offset(after.utcoffset())}",
+            f"TZNAME:{escape_text(after.tzname())}", f"END:{kind}",
+        ]
+    lines.append("END:VTIMEZONE")
+    return tuple(lines)
+
+
+def parse_time_range(time_range: str):
+    """«19:20–20:50» → (time(19, 20), time(20, 50)); не время — None."""
+    start, sep, end = time_range.partition("–")
+    try:
+        return (
+            datetime.datetime.strptime(start.strip(), "%H:%M").time(),
+            datetime.datetime.strptime(end.strip(), "%H:%M").time() if sep else None,
+        )
+    except ValueError:
+        return None
+
+
+def event(uid: str, dtstamp: str, start: datetime.datetime, end: datetime.datetime, tz: str,
+          summary: str, location: str = "", description: str = "", rrule: str = "") -> list:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART;TZID={tz}:{_local(start)}",
+        f"DTEND;TZID={tz}:{_local(end)}",
+    ]
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    lines.append(f"SUMMARY:{escape_text(summary)}")
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def calendar(events: list, name: str = "", timezone: tuple = ()) -> bytes:
+    """timezone — строки VTIMEZONE (см. vtimezone) для TZID событий."""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", "METHOD:PUBLISH"]
+    if name:
+        lines.append(f"X-WR-CALNAME:{escape_text(name)}")
+    lines.extend(timezone)
+    for event_lines in events:
+        lines.extend(event_lines)
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode("utf-8")
+
+
+def _session_bounds(date: datetime.date, time_range: str):
+    times = parse_time_range(time_range)
+    if times is None:
+        return None
+    start_time, end_time = times
+    start = datetime.datetime.combine(date, start_time)
+    end = datetime.datetime.combine(date, end_time) if end_time else start + datetime.timedelta(hours=1)
+    return start, end
+
+
+# --- Запись пользователя ---
+def booking_ics(uid: str, session_date: str, time_range: str, tz: str, summary: str, location: str,
+                description: str = ""):
+    """.ics одной тренировки; None — если время слота не разобрать."""
+    bounds = _session_bounds(datetime.date.fromisoformat(session_date), time_range)
+    if bounds is None:
+        return None
+    start, end = bounds
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return calendar([event(uid, _stamp(now), start, end, tz, summary, location, description)],
+                    timezone=vtimezone(tz, start.year))
+
+
+# --- Подписки клуба ---
+class CalendarFeeds:
+    """Подписки на слоты и тренеров одного бота (клуба) и HTTP-обработчик для них.
+
+    training_label — тип тренировки (run/gym/long) → подпись; choice_trainers — тренеры слотов без
+    SLOT_TO_TRAINER (их выбирает пользователь при записи, в подписке тренера такой слот есть у каждого).
+    """
+
+    def __init__(self, app, tz: str, training_label, choice_trainers):
+        self.app = app
+        self.tz = tz
+        self.training_label = training_label
+        self.choice_trainers = tuple(choice_trainers)
+        self._content = None
+        self._fingerprint = None
+        # (вид, ключ) → (тело .ics, ETag)
+        self._cache = {}
+        self.hits = 0
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    # --- Кэш ---
+    def _sync(self) -> None:
+        """Сбросить кэш, если расписание клуба изменилось (проверка отпечатка — только при смене объекта контента)."""
+        content = self.app.bot_data["club"].content
+        if content is self._content:
+            return
+        self._content = content
+        fingerprint = schedule_fingerprint(content)
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._cache.clear()
+
+    def feed(self, kind: str, key: str):
+        """Готовая подписка (тело, ETag) или None, если такого слота/тренера нет."""
+        self._sync()
+        cached = self._cache.get((kind, key))
+        if cached is not None:
+            self.hits += 1
+            return cached
+        body = self._build(kind, key)
+        if body is None:
+            return None
+        self.builds += 1
+        cached = self._cache[(kind, key)] = (body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"')
+        return cached
+
+    # --- Сборка ---
+    def slots(self) -> dict:
+        """slot_id → день недели (из SLOTS_BY_DAY)."""
+        return {slot_id: day for day, slots in self._content.SLOTS_BY_DAY.items() for slot_id, _label in slots}
+
+    def trainers_of(self, slot_id: str) -> tuple:
+        trainer = self._content.SLOT_TO_TRAINER.get(slot_id)
+        if trainer is None:
+            return self.choice_trainers
+        return () if trainer == "—" else (trainer,)
+
+    def trainers(self) -> list:
+        names = []
+        for slot_id in self.slots():
+            names += [name for name in self.trainers_of(slot_id) if name not in names]
+        return names
+
+    def _build(self, kind: str, key: str):
+        slots = self.slots()
+        if kind == "slot":
+            selected = [key] if key in slots else []
+            name = self._content.SLOT_TO_LABEL.get(key, key)
+        else:
+            selected = [slot_id for slot_id in slots if key in self.trainers_of(slot_id)]
+            name = key
+        if not selected:
+            return None
+        club = self.app.bot_data["club"]
+        now = datetime.datetime.now()
+        dtstamp = _stamp(now.astimezone())
+        events = []
+        for slot_id in selected:
+            day = slots[slot_id]
+            # Первое занятие — ближайший такой день недели, дальше — каждую неделю
+            first = now.date() + datetime.timedelta(days=(_WEEKDAYS[day] - now.weekday()) % 7)
+            bounds = _session_bounds(first, self._content.SLOT_TO_TIME.get(slot_id, ""))
+            if bounds is None:
+                continue
+            address_type = self._content.SLOT_TO_ADDRESS_TYPE.get(slot_id, "run")
+            trainers = ", ".join(self.trainers_of(slot_id))
+            summary = self.training_label.get(address_type, slot_id) + (f" — {trainers}" if trainers else "")
+            events.append(event(
+                f"slot-{club.club_id}-{slot_id}@{UID_DOMAIN}", dtstamp, *bounds, self.tz, summary,
+                self._content.LOCATION_SHORT.get(address_type, ""), self._content.SLOT_TO_LABEL.get(slot_id, ""),
+                rrule=f"FREQ=WEEKLY;BYDAY={_BYDAY[day]}",
+            ))
+        return calendar(events, name=f"{club.cfg.CLUB_NAME} — {name}" if club.cfg.CLUB_NAME else name,
+                        timezone=vtimezone(self.tz, now.year))
+
+    # --- HTTP ---
+    async def handle(self, request) -> Response:
+        """Обработчик маршрута /calendar/<club_id>/ (см. http_server.HttpServer.route)."""
+        if request.path in ("", "/"):
+            self._sync()
+            lines = [f"slot/{slot_id}.ics" for slot_id in self.slots()]
+            lines += [f"trainer/{name}.ics" for name in self.trainers()]
+            return text_response(200, "\n".join(lines) + "\n")
+        kind, _, name = request.path.partition("/")
+        if kind not in ("slot", "trainer") or not name.endswith(".ics"):
+            return text_response(404, "Not Found")
+        cached = self.feed(kind, name[: -len(".ics")])
+        if cached is None:
+            return text_response(404, "Not Found")
+        body, etag = cached
+        headers = (("ETag", etag), ("Cache-Control", "max-age=3600"))
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(304, b"", headers)
+        return Response(200, body, (("Content-Type", "text/calendar; charset=utf-8"),) + headers)
+
+
+def schedule_fingerprint(content) -> str:
+    tables = {name: getattr(content, name) for name in SCHEDULE_KEYS}
+    data = json.dumps(tables, sort_keys=True, ensure_ascii=False, default=dict)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Каталоги сообщений по языкам (см. i18n.py)."""
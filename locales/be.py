@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Каталог сообщений: беларуская мова. Имена — как в ru.py; чего здесь нет, берётся из ru.py.
+
+Контент клуба (расписание, слоты, тексты цен) — перевод значений по умолчанию из bot.py;
+если клуб переопределил ключ в своём пакете, показывается текст клуба.
+"""
+
+LANGUAGE_NAME = "Беларуская"
+
+# --- Кнопки ---
+BTN_START = "🚀 Старт"
+BTN_REGISTER = "📝 Запісацца"
+BTN_REGISTER_PLAIN = "Запісацца"
+BTN_SCHEDULE = "🗓 Расклад"
+BTN_PRICES = "💰 Кошты"
+BTN_LOCATIONS = "📍 Лакацыі"
+BTN_QUESTION = "❓ Задаць пытанне"
+BTN_RESTART = "🔄 Пачаць нанова"
+BTN_BACK_TO_MENU = "⬅️ Назад у меню"
+BTN_ADDRESS = "📍 Адрас"
+BTN_OPEN_LOCATION = "🧭 Адкрыць лакацыю"
+BTN_CONFIRM_YES = "✅ Так"
+BTN_CONFIRM_CHANGE = "Змяніць"
+BTN_PRICE_MAKSIM_DASHA = "Максім | Даша"
+BTN_PRICE_VITALIK = "Віталік"
+BTN_BY_CAR = "На машыне"
+BTN_ON_FOOT = "Пешшу/транспарт"
+BTN_FORM_GYM = "Зала"
+BTN_FORM_MANEGE = "Манеж"
+BTN_FORM_STREET = "Вуліца"
+BTN_TOPIC_FORM = "Што надзець?"
+BTN_TOPIC_WHAT_TO_TAKE = "Што ўзяць з сабой?"
+BTN_TOPIC_HOW = "Як праходзяць трэніроўкі?"
+BTN_TOPIC_CUSTOM = "Задаць сваё пытанне"
+BTN_HOW_RUN = "🏃‍♂️ Бегавыя"
+BTN_HOW_STRENGTH = "🏋️‍♂️ Сілавыя"
+BTN_HOW_LONG = "🏃‍♂️ Працяглыя"
+BTN_LOC_RUN = "🏃‍♂️ Бегавыя трэніроўкі"
+BTN_LOC_GYM = "🏋️‍♂️ Сілавыя трэніроўкі"
+BTN_LOC_LONG = "🏃‍♂️ Працяглая (Раўбічы)"
+
+# --- Подписи по кодам ---
+DAY_LABEL = {
+    "mon": "Панядзелак",
+    "tue": "Аўторак",
+    "wed": "Серада",
+    "thu": "Чацвер",
+    "fri": "Пятніца",
+    "sat": "Субота",
+    "sun": "Нядзеля",
+}
+LEVEL_LABEL = {"newbie": "Пачатковец", "medium": "Сярэдні", "advanced": "Прасунуты", "unknown": "Не ведаю"}
+TRAINER_NAME = {"dasha": "Даша", "maxim": "Максім"}
+WEATHER_LABEL = {"warm": "Цёпла", "cool": "Прахалодна", "cold": "Холадна", "rain": "Дождж"}
+CARD_TRAINING_LABEL = {"run": "Бегавая (вуліца)", "gym": "Сілавая (зала)", "long": "Працяглая"}
+
+# --- Приветствие и меню ---
+WELCOME = (
+    "Прывітанне! 👋\n\n"
+    "Я дапамагу запісацца на трэніроўку і адкажу на пытанні.\n\n"
+    "Націсніце кнопку ніжэй, каб пачаць 👇"
+)
+RESTART_TEXT = (
+    "Прывітанне 👋\n\n"
+    "• Запіс на трэніроўку\n"
+    "• Адказы на пытанні\n\n"
+    "Націсніце кнопку ніжэй 👇"
+)
+MENU_PROMPT = "Чым дапамагчы?\n\nВыберыце 👇"
+NOT_UNDERSTOOD = "Здаецца, я не зразумеў. Давайце працягнем праз меню 👇"
+SESSION_EXPIRED = (
+    "⏳ Сесія скончылася — вы доўга не адказвалі, таму пачатае дзеянне скінута.\n\n"
+    "Выберыце, што зрабіць 👇"
+)
+MYID_TEXT = "Ваш chat_id: <code>{chat_id}</code>.\n\nКалі вы адмін — падстаўце гэты лік у config.ADMIN_CHAT_ID."
+
+# --- Переход по ссылке с меткой ---
+SOURCE_GREETING = {
+    "ref_site": "Бачу, вы прыйшлі з сайта — магу хутка запісаць вас.",
+    "utm_website": "Бачу, вы прыйшлі з сайта — магу хутка запісаць вас.",
+}
+
+# --- Язык (/lang) ---
+LANG_PROMPT = "Выберыце мову 👇"
+LANG_SET = "Мова: беларуская ✅"
+
+# --- Запись ---
+CHOOSE_DAY = "Выберыце дзень тыдня 👇"
+CHOOSE_SLOT = "Выберыце трэніроўку 👇"
+CHOOSE_TRAINER = "Выберыце трэнера 👇"
+ASK_LEVEL = "Ваш узровень?\n\nНацісніце кнопку ніжэй 👇"
+ASK_CONTACT = (
+    "Кантакт для сувязі\n\n"
+    "• Імя і тэлефон або @нік у Telegram\n\n"
+    "Напішыце адным паведамленнем 👇"
+)
+ASK_CONTACT_AGAIN = "Напішыце імя і кантакт адным паведамленнем 👇"
+NAVIGATOR_LINE = '🧭 Навігатар: <a href="{url}">Адкрыць лакацыю</a>'
+CHECK_CARD = (
+    "Праверце, калі ласка, ці правільна запоўнены даныя:\n\n"
+    "📝 Новы запіс на трэніроўку\n\n"
+    "👤 Імя: {name}\n"
+    "📞 Кантакт: {contact}\n"
+    "📅 Дзень: {day}\n"
+    "🏃‍♂️ Трэніроўка: {training}\n"
+    "⏰ Час: {time}\n"
+    "🎯 Узровень: {level}\n"
+    "📍 Лакацыя: {location}\n"
+    "{navigator}\n\n"
+    "Усё правільна? 👇"
+)
+CONFIRMED_CARD = (
+    "Запісалі вас ✅\n\n"
+    "📅 Дзень: {day}\n"
+    "🏃‍♂️ Трэніроўка: {training}\n"
+    "⏰ Час: {time}\n"
+    "🎯 Узровень: {level}\n"
+    "📍 Лакацыя: {location}\n"
+    "{navigator}\n"
+    "👤 Трэнер: {trainer}"
+)
+TIME_RANGE = "з {start} да {end}"
+PAYMENT_LINE = "Аплата: {info}"
+CONTACT_LINE = "Кантакт: {contact}"
+ICS_CAPTION = "📅 Трэніроўка ў каляндар — адкрыйце файл, каб дадаць."
+
+FORM_RUN_AFTER_CONFIRM = (
+    "🏃‍♂️ Што ўзяць з сабой на трэніроўку\n\n"
+    "• Бутэльку вады\n"
+    "• Красоўкі па надвор'і\n"
+    "• Адзенне па надвор'і\n\n"
+    "🚿 Пасля трэніроўкі можна памыцца — вазьміце рэчы для душа: ручнік, шампунь, гель."
+)
+FORM_GYM_AFTER_CONFIRM = (
+    "🏋️‍♂️ Што ўзяць з сабой на трэніроўку\n\n"
+    "• Зручнае спартыўнае адзенне для залы\n"
+    "• Красоўкі для залы\n"
+    "• Бутэльку вады\n\n"
+    "🚿 Пасля трэніроўкі можна памыцца — вазьміце рэчы для душа: ручнік, шампунь, гель."
+)
+
+# --- Расписание ---
+SCHEDULE_CTA = "Запісацца на зручны дзень? 👇"
+SCHEDULE_ERROR = "Расклад\n\nНе атрымалася загрузіць даныя. Паспрабуйце пазней або напішыце ў чат 👇"
+SCHEDULE_UNAVAILABLE = (
+    "Расклад\n\n"
+    "• Даныя часова недаступныя\n"
+    "• Напішыце ў чат — падкажу дні і час\n\n"
+    "Націсніце кнопку ніжэй 👇"
+)
+
+# --- Адрес и локации ---
+ADDRESS_TITLE = "Адрас"
+ADDRESS_MAP = "Карта: {link}"
+ADDRESS_HOW = "На машыне ці пешшу/транспартам? 👇"
+ADDRESS_UNKNOWN = (
+    "Адрас\n\n"
+    "• Пакуль не пазначаны\n"
+    "• Напішыце горад/раён — падкажу кантакт адміна або дашлю геаметку\n\n"
+    "Націсніце кнопку ніжэй 👇"
+)
+ADDRESS_ERROR = "Адрас\n\nНе атрымалася загрузіць даныя. Напішыце ў чат — падкажу 👇"
+ADDRESS_CAR = (
+    "Паркоўка\n\n"
+    "• Каля месца старту\n"
+    "• Геаметку або падказку — напішыце, дашлю або перадам адміну\n\n"
+    "Запісаць на трэніроўку? 👇"
+)
+ADDRESS_WALK = (
+    "Пешшу / транспарт\n\n"
+    "• Маршрут ад метро/прыпынку — у адміна або дашлю геаметку\n"
+    "• Напішыце раён — падкажу\n\n"
+    "Запісаць на трэніроўку? 👇"
+)
+LOCATIONS_PROMPT = "Адрас\n\nВыберыце тып трэніроўкі 👇"
+LOCATION_LINE = "📍 Лакацыя: {address}"
+
+# --- Цены ---
+PRICE_PROMPT = "Выберыце трэнера 👇"
+
+# --- Что надеть ---
+FORM_PROMPT = "Што надзець\n\nВыберыце тып трэніроўкі 👇"
+WEATHER_PROMPT = "Якое ў вас надвор'е? 👇"
+
+FORM_WEAR_GYM = (
+    "🏋️‍♂️ Што надзець у залу (сілавая трэніроўка)\n\n"
+    "• Зручная спартыўная форма\n"
+    "• Красоўкі для залы\n"
+    "• Шкарпэткі\n"
+    "• Бутэлька вады\n"
+    "• Ручнік\n\n"
+    "Па жаданні:\n"
+    "• Пальчаткі для трэніровак\n"
+    "• Пояс або асабістая экіпіроўка"
+)
+
+FORM_WEAR_MANEGE = (
+    "🏃‍♂️ Што надзець у манеж (бегавая трэніроўка)\n\n"
+    "• Лёгкая спартыўная форма\n"
+    "• Красоўкі для бегу па пакрыцці\n"
+    "• Шкарпэткі\n"
+    "• Бутэлька вады\n\n"
+    "Па жаданні:\n"
+    "• Лёгкая кофта для размінкі\n"
+    "• Гадзіннік або трэкер"
+)
+
+FORM_WEAR_STREET_WARM = (
+    "☀️ Што надзець, калі цёпла\n\n"
+    "• Футболка або майка\n"
+    "• Шорты або тайтсы\n"
+    "• Красоўкі для бегу\n"
+    "• Кепка\n"
+    "• Вада абавязкова"
+)
+
+FORM_WEAR_STREET_COOL = (
+    "🧢 Што надзець, калі прахалодна\n\n"
+    "• Лонгсліў або лёгкая кофта\n"
+    "• Тайтсы або лёгкія штаны\n"
+    "• Лёгкая ветроўка\n"
+    "• Красоўкі\n"
+    "• Баф або тонкая шапка — па жаданні"
+)
+
+FORM_WEAR_STREET_COLD = (
+    "🧥 Што надзець, калі холадна\n\n"
+    "• Тэрмабялізна\n"
+    "• Цёплы лонгсліў або кофта\n"
+    "• Ветроўка\n"
+    "• Тайтсы\n"
+    "• Шапка і пальчаткі\n"
+    "• Красоўкі па надвор'і"
+)
+
+FORM_WEAR_STREET_RAIN = (
+    "🌧 Што надзець у дождж\n\n"
+    "• Ветроўка або дажджавік\n"
+    "• Форма, якая хутка сохне\n"
+    "• Тайтсы або штаны\n"
+    "• Красоўкі з добрым счапленнем\n"
+    "• Кепка"
+)
+
+# --- Вопросы ---
+CHOOSE_TOPIC = "Выберыце тэму 👇"
+HOW_PROMPT = "Выберыце тып трэніроўкі 👇"
+
+QUESTION_HOW_RUN = (
+    "🏃‍♂️ БЕГАВЫЯ ТРЭНІРОЎКІ\n"
+    "────────────────────\n\n"
+    "Трэніроўкі праходзяць на стадыёне або на вуліцы і выбудаваны\n"
+    "па поўнай структуры:\n\n"
+    "• размінка\n"
+    "• асноўная частка\n"
+    "• замінка\n\n"
+    "У працэсе ўвага надаецца:\n"
+    "• агульнай фізічнай падрыхтоўцы\n"
+    "• агульнаразвіваючым практыкаванням\n"
+    "• бегавым практыкаванням і тэхніцы\n\n"
+    "Трэніроўкі метадычна структураваныя і адаптуюцца\n"
+    "пад індывідуальныя мэты і ўзровень кожнага ўдзельніка.\n\n"
+    "────────────────────"
+)
+
+QUESTION_HOW_STRENGTH = (
+    "🏋️‍♂️ СІЛАВЫЯ ТРЭНІРОЎКІ\n"
+    "────────────────────\n\n"
+    "Трэніроўкі праходзяць у зале і маюць выразную структуру занятку.\n\n"
+    "Асноўны акцэнт робіцца на:\n"
+    "• развіццё сілы\n"
+    "• развіццё сілавой вынослівасці\n\n"
+    "Дадаткова развіваюцца:\n"
+    "• каардынацыя\n"
+    "• мабільнасць\n"
+    "• агульная фізічная падрыхтоўка\n\n"
+    "Практыкаванні падбіраюцца з улікам узроўню падрыхтоўкі\n"
+    "і індывідуальных мэтаў.\n\n"
+    "────────────────────"
+)
+
+QUESTION_HOW_LONG = (
+    "🏃‍♂️ ПРАЦЯГЛЫЯ ВЫЯЗНЫЯ БЕГАВЫЯ\n"
+    "────────────────────\n\n"
+    "Гэта сумесная працяглая прабежка на прыродзе\n"
+    "(выязныя лакацыі, напрыклад Раўбічы).\n\n"
+    "Мэта трэніроўкі:\n"
+    "• развіццё сардэчна-сасудзістай сістэмы\n"
+    "• павышэнне вынослівасці\n"
+    "• камфортны, спакойны тэмп\n\n"
+    "Пасля трэніроўкі:\n"
+    "☕ гарбата, кава\n"
+    "🥐 сняданкі, пірожныя\n"
+    "і прыемныя зносіны.\n\n"
+    "────────────────────"
+)
+
+QUESTION_WHAT_TO_TAKE_TEXT = (
+    "🎒 Што ўзяць з сабой на трэніроўку\n\n"
+    "✅ Абавязкова:\n"
+    "• Спартыўная форма (па фармаце трэніроўкі)\n"
+    "• Спартыўны абутак:\n"
+    "  — для залы\n"
+    "  — для бегу (вуліца / манеж)\n"
+    "• Бутэлька вады\n"
+    "• Ручнік\n\n"
+    "🚿 Калі плануеце прыняць душ:\n"
+    "• Сланцы\n"
+    "• Сродкі для душа\n"
+    "• Зменнае адзенне\n\n"
+    "➕ Дадаткова (па жаданні):\n"
+    "• Гумка для валасоў\n"
+    "• Асабістая экіпіроўка\n"
+    "• Невялікі заплечнік або сумка\n\n"
+    "ℹ️ Важна:\n"
+    "Форму і абутак падбірайце з улікам надвор'я\n"
+    "і тыпу трэніроўкі: зала / вуліца / манеж"
+)
+
+QUESTION_CUSTOM_PROMPT = (
+    "✍️ Задайце сваё пытанне\n\n"
+    "Напішыце ваша пытанне паведамленнем,\n"
+    "і мы абавязкова вам адкажам."
+)
+QUESTION_THANKS = "Дзякуй, ваша пытанне перададзена. Мы адкажам у бліжэйшы час."
+
+# --- Контент клуба по умолчанию ---
+SLOTS_BY_DAY = {
+    "mon": [("mon_run", "🏃‍♂️ Бегавая 19:20–20:50")],
+    "tue": [
+        ("tue_morning", "🏃‍♂️ Раніца 07:30–09:00 (Віталік)"),
+        ("tue_evening", "🏃‍♂️ Вечар 19:10–20:40 (Віталік)"),
+    ],
+    "wed": [
+        ("wed_gym", "🏋️‍♂️ Сілавая (зала) 07:30–08:40"),
+        ("wed_run", "🏃‍♂️ Бегавая 19:20–20:50"),
+    ],
+    "thu": [
+        ("thu_morning", "🏃‍♂️ Раніца 07:30–09:00 (Віталік)"),
+        ("thu_evening", "🏃‍♂️ Вечар 19:10–20:40 (Віталік)"),
+    ],
+    "fri": [("fri_gym", "🏋️‍♂️ Сілавая (зала) 19:10–20:20")],
+    "sun": [("sun_long", "🏃‍♂️ Працяглая бегавая 09:00–10:30, Раўбічы")],
+}
+
+SLOT_TO_LABEL = {
+    "mon_run": "Панядзелак — Бегавая 19:20–20:50",
+    "tue_morning": "Аўторак — Бегавая раніца 07:30–09:00 (Віталік)",
+    "tue_evening": "Аўторак — Бегавая вечар 19:10–20:40 (Віталік)",
+    "wed_gym": "Серада — Сілавая (зала) 07:30–08:40",
+    "wed_run": "Серада — Бегавая 19:20–20:50",
+    "thu_morning": "Чацвер — Бегавая раніца 07:30–09:00 (Віталік)",
+    "thu_evening": "Чацвер — Бегавая вечар 19:10–20:40 (Віталік)",
+    "fri_gym": "Пятніца — Сілавая (зала) 19:10–20:20",
+    "sun_long": "Нядзеля — Працяглая бегавая 09:00–10:30, Раўбічы",
+}
+
+SLOT_TO_TRAINER = {
+    "tue_morning": "Віталік",
+    "tue_evening": "Віталік",
+    "thu_morning": "Віталік",
+    "thu_evening": "Віталік",
+    "wed_gym": "Віталік",
+    "fri_gym": "Віталік",
+    "sun_long": "—",
+}
+
+SCHEDULE_FULL = (
+    "Расклад\n\n"
+    "🏃‍♂️ БЕГАВЫЯ ТРЭНІРОЎКІ — ВІТАЛІК\n"
+    "📍 Каліноўскага, 111\n"
+    "Манеж-стадыён\n"
+    "• Аўторак — раніца 07:30–09:00, вечар 19:10–20:40\n"
+    "• Чацвер — раніца 07:30–09:00, вечар 19:10–20:40\n\n"
+    "🏃‍♂️ БЕГАВЫЯ ТРЭНІРОЎКІ — ДАША І МАКСІМ\n"
+    "📍 Каліноўскага, 111\n"
+    "Манеж-стадыён\n"
+    "• Панядзелак — 19:20–20:50\n"
+    "• Серада — 19:20–20:50\n\n"
+    "🏋️‍♂️ СІЛАВЫЯ ТРЭНІРОЎКІ (ЗАЛА) — ВІТАЛІК\n"
+    "📍 Старавіленская, 131/1\n"
+    "• Серада — 07:30–08:40\n"
+    "• Пятніца — 19:10–20:20\n\n"
+    "🏃‍♂️ ПРАЦЯГЛАЯ БЕГАВАЯ ТРЭНІРОЎКА\n"
+    "• Нядзеля — 09:00–10:30\n"
+    "📍 Раўбічы\n"
+    "працяглая бегавая трэніроўка (лонг)"
+)
+
+PRICE_TEXT_MAKSIM_DASHA = (
+    "💰 Кошт трэніровак\n\n"
+    "Максім\n"
+    "────────\n"
+    "• Разовы занятак — 30 BYN\n"
+    "• Абанемент на 4 заняткі — 100 BYN\n"
+    "• Абанемент на 8 заняткаў — 180 BYN\n\n"
+    "Даша\n"
+    "────────\n"
+    "• Разовы занятак — 30 BYN\n"
+    "• Абанемент на 4 заняткі — 100 BYN\n"
+    "• Абанемент на 8 заняткаў — 180 BYN"
+)
+
+VITALIK_INFO_TEXT = (
+    "ℹ️ Інфармацыя пра трэніроўкі\n\n"
+    "Кошт і магчымасць запісу на трэніроўкі да Віталіка\n"
+    "удакладняюцца індывідуальна і залежаць ад наяўнасці вольных месцаў.\n\n"
+    "Каб удакладніць актуальную інфармацыю, напішыце ў Telegram:\n"
+    "👉 @coach_pramuk"
+)
+
+FINAL_CONFIRM_FOOTER = "Калі засталіся пытанні — напішыце кіраўніку: @coach_pramuk"
+
+# --- Абонемент ---
+PASS_BALANCE = "🎟 Абанемент: засталося заняткаў — {remaining}."
+PASS_NONE = "🎟 Абанемента пакуль няма. Кошты — у меню «💰 Кошты», аформіць — у адміністратара."
+PASS_CREDITED = "🎟 Абанемент: налічана заняткаў — {sessions}, засталося — {remaining}."
+PASS_DEBITED = "🎟 З абанемента спісаны занятак, засталося — {remaining}."
+
+# --- Мои записи (/mybookings) ---
+MYBOOKINGS_TITLE = "📋 Вашы запісы"
+MYBOOKINGS_EMPTY = "📋 Запісаў на бліжэйшыя трэніроўкі няма.\n\nЗапісацца можна праз меню 👇"
+MYBOOKING_LINE = "📅 {date}, {day} • {training} • {time} • {trainer}"
+BTN_CANCEL_BOOKING = "❌ Адмяніць {date}"
+BTN_MOVE_BOOKING = "🔁 Перанесці {date}"
+BTN_CANCEL_BOOKING_YES = "❌ Так, адмяніць"
+BTN_BACK_TO_BOOKINGS = "⬅️ Мае запісы"
+CANCEL_BOOKING_ASK = "Адмяніць запіс?\n\n{booking}"
+BOOKING_CANCELLED = "Запіс адменены.\n\n{booking}"
+PASS_REFUNDED = "🎟 Занятак вярнуўся на абанемент, засталося — {remaining}."
+MOVE_BOOKING_ASK = "Перанесці запіс\n\n{booking}\n\nНа якую трэніроўку? 👇"
+BOOKING_MOVED = "Запіс перанесены ✅\n\n{booking}"
+BOOKING_UNAVAILABLE = "Гэты запіс ужо нельга змяніць: ён адменены або трэніроўка прайшла."
+SLOT_FULL = "😔 На гэтую трэніроўку месцаў ужо няма. Выберыце іншую 👇"
+BOOKING_SAVE_FAILED = "😔 Не атрымалася захаваць запіс — ён пакуль не пацверджаны. Націсніце «✅ Так» яшчэ раз праз хвіліну 👇"
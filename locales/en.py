@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Каталог сообщений: English. Имена — как в ru.py; чего здесь нет, берётся из ru.py.
+
+Контент клуба (расписание, слоты, тексты цен) — перевод значений по умолчанию из bot.py;
+если клуб переопределил ключ в своём пакете, показывается текст клуба.
+"""
+
+LANGUAGE_NAME = "English"
+
+# --- Кнопки ---
+BTN_START = "🚀 Start"
+BTN_REGISTER = "📝 Sign up"
+BTN_REGISTER_PLAIN = "Sign up"
+BTN_SCHEDULE = "🗓 Schedule"
+BTN_PRICES = "💰 Prices"
+BTN_LOCATIONS = "📍 Locations"
+BTN_QUESTION = "❓ Ask a question"
+BTN_RESTART = "🔄 Start over"
+BTN_BACK_TO_MENU = "⬅️ Back to menu"
+BTN_ADDRESS = "📍 Address"
+BTN_OPEN_LOCATION = "🧭 Open location"
+BTN_CONFIRM_YES = "✅ Yes"
+BTN_CONFIRM_CHANGE = "Change"
+BTN_PRICE_MAKSIM_DASHA = "Maksim | Dasha"
+BTN_PRICE_VITALIK = "Vitalik"
+BTN_BY_CAR = "By car"
+BTN_ON_FOOT = "On foot / public transport"
+BTN_FORM_GYM = "Gym"
+BTN_FORM_MANEGE = "Indoor arena"
+BTN_FORM_STREET = "Outdoors"
+BTN_TOPIC_FORM = "What to wear?"
+BTN_TOPIC_WHAT_TO_TAKE = "What to bring?"
+BTN_TOPIC_HOW = "What are the sessions like?"
+BTN_TOPIC_CUSTOM = "Ask your own question"
+BTN_HOW_RUN = "🏃‍♂️ Running"
+BTN_HOW_STRENGTH = "🏋️‍♂️ Strength"
+BTN_HOW_LONG = "🏃‍♂️ Long runs"
+BTN_LOC_RUN = "🏃‍♂️ Running sessions"
+BTN_LOC_GYM = "🏋️‍♂️ Strength sessions"
+BTN_LOC_LONG = "🏃‍♂️ Long run (Raubichi)"
+
+# --- Подписи по кодам ---
+DAY_LABEL = {
+    "mon": "Monday",
+    "tue": "Tuesday",
+    "wed": "Wednesday",
+    "thu": "Thursday",
+    "fri": "Friday",
+    "sat": "Saturday",
+    "sun": "Sunday",
+}
+LEVEL_LABEL = {"newbie": "Beginner", "medium": "Intermediate", "advanced": "Advanced", "unknown": "Not sure"}
+TRAINER_NAME = {"dasha": "Dasha", "maxim": "Maksim"}
+WEATHER_LABEL = {"warm": "Warm", "cool": "Cool", "cold": "Cold", "rain": "Rain"}
+CARD_TRAINING_LABEL = {"run": "Running (outdoors)", "gym": "Strength (gym)", "long": "Long run"}
+
+# --- Приветствие и меню ---
+WELCOME = (
+    "Hi! 👋\n\n"
+    "I'll help you sign up for a training session and answer your questions.\n\n"
+    "Tap the button below to get started 👇"
+)
+RESTART_TEXT = (
+    "Hi 👋\n\n"
+    "• Sign up for a session\n"
+    "• Answers to your questions\n\n"
+    "Tap the button below 👇"
+)
+MENU_PROMPT = "How can I help?\n\nChoose 👇"
+NOT_UNDERSTOOD = "Sorry, I didn't get that. Let's continue from the menu 👇"
+SESSION_EXPIRED = (
+    "⏳ Your session has expired — there was no reply for a while, so the unfinished action was reset.\n\n"
+    "Choose what to do 👇"
+)
+MYID_TEXT = "Your chat_id: <code>{chat_id}</code>.\n\nIf you are the admin, put this number into config.ADMIN_CHAT_ID."
+
+# --- Переход по ссылке с меткой ---
+SOURCE_GREETING = {
+    "ref_site": "I see you came from our website — I can sign you up right away.",
+    "utm_website": "I see you came from our website — I can sign you up right away.",
+}
+
+# --- Язык (/lang) ---
+LANG_PROMPT = "Choose a language 👇"
+LANG_SET = "Language: English ✅"
+
+# --- Запись ---
+CHOOSE_DAY = "Choose a day of the week 👇"
+CHOOSE_SLOT = "Choose a session 👇"
+CHOOSE_TRAINER = "Choose a coach 👇"
+ASK_LEVEL = "What is your level?\n\nTap a button below 👇"
+ASK_CONTACT = (
+    "Contact details\n\n"
+    "• Name and phone number or Telegram @username\n\n"
+    "Send them in one message 👇"
+)
+ASK_CONTACT_AGAIN = "Send your name and contact in one message 👇"
+NAVIGATOR_LINE = '🧭 Navigation: <a href="{url}">Open location</a>'
+CHECK_CARD = (
+    "Please check that everything is correct:\n\n"
+    "📝 New training sign-up\n\n"
+    "👤 Name: {name}\n"
+    "📞 Contact: {contact}\n"
+    "📅 Day: {day}\n"
+    "🏃‍♂️ Session: {training}\n"
+    "⏰ Time: {time}\n"
+    "🎯 Level: {level}\n"
+    "📍 Location: {location}\n"
+    "{navigator}\n\n"
+    "All correct? 👇"
+)
+CONFIRMED_CARD = (
+    "You're signed up ✅\n\n"
+    "📅 Day: {day}\n"
+    "🏃‍♂️ Session: {training}\n"
+    "⏰ Time: {time}\n"
+    "🎯 Level: {level}\n"
+    "📍 Location: {location}\n"
+    "{navigator}\n"
+    "👤 Coach: {trainer}"
+)
+TIME_RANGE = "from {start} to {end}"
+PAYMENT_LINE = "Payment: {info}"
+CONTACT_LINE = "Contact: {contact}"
+ICS_CAPTION = "📅 Add the session to your calendar — open this file."
+
+FORM_RUN_AFTER_CONFIRM = (
+    "🏃‍♂️ What to bring to the session\n\n"
+    "• A bottle of water\n"
+    "• Running shoes suited to the weather\n"
+    "• Clothes suited to the weather\n\n"
+    "🚿 You can take a shower after the session — bring a towel, shampoo and shower gel."
+)
+FORM_GYM_AFTER_CONFIRM = (
+    "🏋️‍♂️ What to bring to the session\n\n"
+    "• Comfortable gym clothes\n"
+    "• Gym shoes\n"
+    "• A bottle of water\n\n"
+    "🚿 You can take a shower after the session — bring a towel, shampoo and shower gel."
+)
+
+# --- Расписание ---
+SCHEDULE_CTA = "Sign up for a day that suits you? 👇"
+SCHEDULE_ERROR = "Schedule\n\nCouldn't load the data. Try again later or write to us in the chat 👇"
+SCHEDULE_UNAVAILABLE = (
+    "Schedule\n\n"
+    "• The data is temporarily unavailable\n"
+    "• Write to us in the chat — we'll tell you the days and times\n\n"
+    "Tap the button below 👇"
+)
+
+# --- Адрес и локации ---
+ADDRESS_TITLE = "Address"
+ADDRESS_MAP = "Map: {link}"
+ADDRESS_HOW = "By car or on foot / public transport? 👇"
+ADDRESS_UNKNOWN = (
+    "Address\n\n"
+    "• Not specified yet\n"
+    "• Tell us your city/district — we'll share the admin's contact or send a location pin\n\n"
+    "Tap the button below 👇"
+)
+ADDRESS_ERROR = "Address\n\nCouldn't load the data. Write to us in the chat — we'll help 👇"
+ADDRESS_CAR = (
+    "Parking\n\n"
+    "• Right by the start point\n"
+    "• Need a pin or directions? Write to us — we'll send it or pass it to the admin\n\n"
+    "Sign up for a session? 👇"
+)
+ADDRESS_WALK = (
+    "On foot / public transport\n\n"
+    "• Route from the metro/stop — ask the admin or we'll send a pin\n"
+    "• Tell us your district — we'll help\n\n"
+    "Sign up for a session? 👇"
+)
+LOCATIONS_PROMPT = "Address\n\nChoose the type of session 👇"
+LOCATION_LINE = "📍 Location: {address}"
+
+# --- Цены ---
+PRICE_PROMPT = "Choose a coach 👇"
+
+# --- Что надеть ---
+FORM_PROMPT = "What to wear\n\nChoose the type of session 👇"
+WEATHER_PROMPT = "What's the weather like? 👇"
+
+FORM_WEAR_GYM = (
+    "🏋️‍♂️ What to wear to the gym (strength session)\n\n"
+    "• Comfortable sportswear\n"
+    "• Gym shoes\n"
+    "• Socks\n"
+    "• A bottle of water\n"
+    "• A towel\n\n"
+    "Optional:\n"
+    "• Training gloves\n"
+    "• A lifting belt or your own gear"
+)
+
+FORM_WEAR_MANEGE = (
+    "🏃‍♂️ What to wear to the indoor arena (running session)\n\n"
+    "• Light sportswear\n"
+    "• Running shoes for the track surface\n"
+    "• Socks\n"
+    "• A bottle of water\n\n"
+    "Optional:\n"
+    "• A light top for the warm-up\n"
+    "• A watch or fitness tracker"
+)
+
+FORM_WEAR_STREET_WARM = (
+    "☀️ What to wear when it's warm\n\n"
+    "• T-shirt or tank top\n"
+    "• Shorts or tights\n"
+    "• Running shoes\n"
+    "• A cap\n"
+    "• Water is a must"
+)
+
+FORM_WEAR_STREET_COOL = (
+    "🧢 What to wear when it's cool\n\n"
+    "• Long-sleeve top or light jacket\n"
+    "• Tights or light trousers\n"
+    "• A light windbreaker\n"
+    "• Running shoes\n"
+    "• A buff or thin hat — optional"
+)
+
+FORM_WEAR_STREET_COLD = (
+    "🧥 What to wear when it's cold\n\n"
+    "• Thermal underwear\n"
+    "• A warm long-sleeve top or sweater\n"
+    "• A windbreaker\n"
+    "• Tights\n"
+    "• Hat and gloves\n"
+    "• Shoes suited to the weather"
+)
+
+FORM_WEAR_STREET_RAIN = (
+    "🌧 What to wear in the rain\n\n"
+    "• A windbreaker or rain jacket\n"
+    "• Quick-dry sportswear\n"
+    "• Tights or trousers\n"
+    "• Shoes with good grip\n"
+    "• A cap"
+)
+
+# --- Вопросы ---
+CHOOSE_TOPIC = "Choose a topic 👇"
+HOW_PROMPT = "Choose the type of session 👇"
+
+QUESTION_HOW_RUN = (
+    "🏃‍♂️ RUNNING SESSIONS\n"
+    "────────────────────\n\n"
+    "Sessions take place at the stadium or outdoors and follow\n"
+    "a complete structure:\n\n"
+    "• warm-up\n"
+    "• main part\n"
+    "• cool-down\n\n"
+    "Along the way we work on:\n"
+    "• general fitness\n"
+    "• conditioning drills\n"
+    "• running drills and technique\n\n"
+    "The sessions are methodically structured and adapted\n"
+    "to each participant's goals and level.\n\n"
+    "────────────────────"
+)
+
+QUESTION_HOW_STRENGTH = (
+    "🏋️‍♂️ STRENGTH SESSIONS\n"
+    "────────────────────\n\n"
+    "Sessions take place in the gym and follow a clear structure.\n\n"
+    "The main focus is on:\n"
+    "• building strength\n"
+    "• building strength endurance\n\n"
+    "We also develop:\n"
+    "• coordination\n"
+    "• mobility\n"
+    "• general fitness\n\n"
+    "Exercises are chosen according to your fitness level\n"
+    "and personal goals.\n\n"
+    "────────────────────"
+)
+
+QUESTION_HOW_LONG = (
+    "🏃‍♂️ LONG OUT-OF-TOWN RUNS\n"
+    "────────────────────\n\n"
+    "A long group run in nature\n"
+    "(out-of-town locations such as Raubichi).\n\n"
+    "Goals of the session:\n"
+    "• cardiovascular fitness\n"
+    "• better endurance\n"
+    "• a comfortable, easy pace\n\n"
+    "After the run:\n"
+    "☕ tea, coffee\n"
+    "🥐 breakfast, pastries\n"
+    "and good company.\n\n"
+    "────────────────────"
+)
+
+QUESTION_WHAT_TO_TAKE_TEXT = (
+    "🎒 What to bring to the session\n\n"
+    "✅ Essentials:\n"
+    "• Sportswear (suited to the session)\n"
+    "• Sports shoes:\n"
+    "  — for the gym\n"
+    "  — for running (outdoors / indoor arena)\n"
+    "• A bottle of water\n"
+    "• A towel\n\n"
+    "🚿 If you plan to take a shower:\n"
+    "• Flip-flops\n"
+    "• Toiletries\n"
+    "• A change of clothes\n\n"
+    "➕ Optional:\n"
+    "• A hair tie\n"
+    "• Your own gear\n"
+    "• A small backpack or bag\n\n"
+    "ℹ️ Note:\n"
+    "Choose clothes and shoes according to the weather\n"
+    "and the type of session: gym / outdoors / indoor arena"
+)
+
+QUESTION_CUSTOM_PROMPT = (
+    "✍️ Ask your question\n\n"
+    "Send your question in a message,\n"
+    "and we'll be sure to reply."
+)
+QUESTION_THANKS = "Thank you, your question has been passed on. We'll reply soon."
+
+# --- Контент клуба по умолчанию ---
+SLOTS_BY_DAY = {
+    "mon": [("mon_run", "🏃‍♂️ Running 19:20–20:50")],
+    "tue": [
+        ("tue_morning", "🏃‍♂️ Morning 07:30–09:00 (Vitalik)"),
+        ("tue_evening", "🏃‍♂️ Evening 19:10–20:40 (Vitalik)"),
+    ],
+    "wed": [
+        ("wed_gym", "🏋️‍♂️ Strength (gym) 07:30–08:40"),
+        ("wed_run", "🏃‍♂️ Running 19:20–20:50"),
+    ],
+    "thu": [
+        ("thu_morning", "🏃‍♂️ Morning 07:30–09:00 (Vitalik)"),
+        ("thu_evening", "🏃‍♂️ Evening 19:10–20:40 (Vitalik)"),
+    ],
+    "fri": [("fri_gym", "🏋️‍♂️ Strength (gym) 19:10–20:20")],
+    "sun": [("sun_long", "🏃‍♂️ Long run 09:00–10:30, Raubichi")],
+}
+
+SLOT_TO_LABEL = {
+    "mon_run": "Monday — Running 19:20–20:50",
+    "tue_morning": "Tuesday — Morning run 07:30–09:00 (Vitalik)",
+    "tue_evening": "Tuesday — Evening run 19:10–20:40 (Vitalik)",
+    "wed_gym": "Wednesday — Strength (gym) 07:30–08:40",
+    "wed_run": "Wednesday — Running 19:20–20:50",
+    "thu_morning": "Thursday — Morning run 07:30–09:00 (Vitalik)",
+    "thu_evening": "Thursday — Evening run 19:10–20:40 (Vitalik)",
+    "fri_gym": "Friday — Strength (gym) 19:10–20:20",
+    "sun_long": "Sunday — Long run 09:00–10:30, Raubichi",
+}
+
+SLOT_TO_TRAINER = {
+    "tue_morning": "Vitalik",
+    "tue_evening": "Vitalik",
+    "thu_morning": "Vitalik",
+    "thu_evening": "Vitalik",
+    "wed_gym": "Vitalik",
+    "fri_gym": "Vitalik",
+    "sun_long": "—",
+}
+
+SCHEDULE_FULL = (
+    "Schedule\n\n"
+    "🏃‍♂️ RUNNING SESSIONS — VITALIK\n"
+    "📍 Kalinovskogo St, 111\n"
+    "Manege stadium\n"
+    "• Tuesday — morning 07:30–09:00, evening 19:10–20:40\n"
+    "• Thursday — morning 07:30–09:00, evening 19:10–20:40\n\n"
+    "🏃‍♂️ RUNNING SESSIONS — DASHA AND MAKSIM\n"
+    "📍 Kalinovskogo St, 111\n"
+    "Manege stadium\n"
+    "• Monday — 19:20–20:50\n"
+    "• Wednesday — 19:20–20:50\n\n"
+    "🏋️‍♂️ STRENGTH SESSIONS (GYM) — VITALIK\n"
+    "📍 Starovilenskaya St, 131/1\n"
+    "• Wednesday — 07:30–08:40\n"
+    "• Friday — 19:10–20:20\n\n"
+    "🏃‍♂️ LONG RUN\n"
+    "• Sunday — 09:00–10:30\n"
+    "📍 Raubichi\n"
+    "long easy run"
+)
+
+PRICE_TEXT_MAKSIM_DASHA = (
+    "💰 Session prices\n\n"
+    "Maksim\n"
+    "────────\n"
+    "• Single session — 30 BYN\n"
+    "• 4-session pass — 100 BYN\n"
+    "• 8-session pass — 180 BYN\n\n"
+    "Dasha\n"
+    "────────\n"
+    "• Single session — 30 BYN\n"
+    "• 4-session pass — 100 BYN\n"
+    "• 8-session pass — 180 BYN"
+)
+
+VITALIK_INFO_TEXT = (
+    "ℹ️ About the sessions\n\n"
+    "Prices and availability for sessions with Vitalik\n"
+    "are discussed individually and depend on free spots.\n\n"
+    "For up-to-date information, message us on Telegram:\n"
+    "👉 @coach_pramuk"
+)
+
+FINAL_CONFIRM_FOOTER = "If you have any questions, message the head coach: @coach_pramuk"
+
+# --- Абонемент ---
+PASS_BALANCE = "🎟 Pass: {remaining} sessions left."
+PASS_NONE = "🎟 You have no pass yet. Prices are in «💰 Prices»; the admin can issue one."
+PASS_CREDITED = "🎟 Pass: {sessions} sessions added, {remaining} left."
+PASS_DEBITED = "🎟 One session was deducted from your pass, {remaining} left."
+
+# --- Мои записи (/mybookings) ---
+MYBOOKINGS_TITLE = "📋 Your bookings"
+MYBOOKINGS_EMPTY = "📋 You have no upcoming bookings.\n\nYou can sign up via the menu 👇"
+MYBOOKING_LINE = "📅 {date}, {day} • {training} • {time} • {trainer}"
+BTN_CANCEL_BOOKING = "❌ Cancel {date}"
+BTN_MOVE_BOOKING = "🔁 Reschedule {date}"
+BTN_CANCEL_BOOKING_YES = "❌ Yes, cancel"
+BTN_BACK_TO_BOOKINGS = "⬅️ My bookings"
+CANCEL_BOOKING_ASK = "Cancel this booking?\n\n{booking}"
+BOOKING_CANCELLED = "Booking cancelled.\n\n{booking}"
+PASS_REFUNDED = "🎟 The session was returned to your pass, {remaining} left."
+MOVE_BOOKING_ASK = "Reschedule\n\n{booking}\n\nWhich session would you like instead? 👇"
+BOOKING_MOVED = "Booking rescheduled ✅\n\n{booking}"
+BOOKING_UNAVAILABLE = "This booking can no longer be changed: it was cancelled or the session has passed."
+SLOT_FULL = "😔 This session is already full. Please choose another one 👇"
+BOOKING_SAVE_FAILED = "😔 We couldn't save your booking, so it isn't confirmed yet. Please tap «✅ Yes» again in a minute 👇"
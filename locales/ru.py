@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+Каталог сообщений: русский — основной язык бота. Полный набор имён; остальные каталоги переводят те же имена.
+
+Подстановки — str.format с именованными полями ({day}, {time} и т.д.); набор полей во всех языках одинаковый.
+"""
+
+LANGUAGE_NAME = "Русский"
+
+# --- Кнопки ---
+BTN_START = "🚀 Старт"
+BTN_REGISTER = "📝 Записаться"
+BTN_REGISTER_PLAIN = "Записаться"
+BTN_SCHEDULE = "🗓 Расписание"
+BTN_PRICES = "💰 Цены"
+BTN_LOCATIONS = "📍 Локации"
+BTN_QUESTION = "❓ Задать вопрос"
+BTN_RESTART = "🔄 Начать заново"
+BTN_BACK_TO_MENU = "⬅️ Назад в меню"
+BTN_ADDRESS = "📍 Адрес"
+BTN_OPEN_LOCATION = "🧭 Открыть локацию"
+BTN_CONFIRM_YES = "✅ Да"
+BTN_CONFIRM_CHANGE = "Изменить"
+BTN_PRICE_MAKSIM_DASHA = "Максим | Даша"
+BTN_PRICE_VITALIK = "Виталик"
+BTN_BY_CAR = "На машине"
+BTN_ON_FOOT = "Пешком/транспорт"
+BTN_FORM_GYM = "Зал"
+BTN_FORM_MANEGE = "Манеж"
+BTN_FORM_STREET = "Улица"
+BTN_TOPIC_FORM = "Что надеть?"
+BTN_TOPIC_WHAT_TO_TAKE = "Что взять с собой?"
+BTN_TOPIC_HOW = "Как проходят тренировки?"
+BTN_TOPIC_CUSTOM = "Задать свой вопрос"
+BTN_HOW_RUN = "🏃‍♂️ Беговые"
+BTN_HOW_STRENGTH = "🏋️‍♂️ Силовые"
+BTN_HOW_LONG = "🏃‍♂️ Длительные"
+BTN_LOC_RUN = "🏃‍♂️ Беговые тренировки"
+BTN_LOC_GYM = "🏋️‍♂️ Силовые тренировки"
+BTN_LOC_LONG = "🏃‍♂️ Длительная (Раубичи)"
+
+# --- Подписи по кодам (дни, уровни, тренеры, погода, тип тренировки) ---
+DAY_LABEL = {
+    "mon": "Понедельник",
+    "tue": "Вторник",
+    "wed": "Среда",
+    "thu": "Четверг",
+    "fri": "Пятница",
+    "sat": "Суббота",
+    "sun": "Воскресенье",
+}
+LEVEL_LABEL = {"newbie": "Новичок", "medium": "Средний", "advanced": "Продвинутый", "unknown": "Не знаю"}
+TRAINER_NAME = {"dasha": "Даша", "maxim": "Максим"}
+WEATHER_LABEL = {"warm": "Тепло", "cool": "Прохладно", "cold": "Холодно", "rain": "Дождь"}
+# Тип (формат/место) для карточки и однострочного подтверждения
+CARD_TRAINING_LABEL = {"run": "Беговая (улица)", "gym": "Силовая (зал)", "long": "Длительная"}
+
+# --- Приветствие и меню ---
+WELCOME = (
+    "Привет! 👋\n\n"
+    "Я помогу записаться на тренировку и отвечу на вопросы.\n\n"
+    "Нажмите кнопку ниже, чтобы начать 👇"
+)
+RESTART_TEXT = (
+    "Привет 👋\n\n"
+    "• Запись на тренировку\n"
+    "• Ответы на вопросы\n\n"
+    "Нажмите кнопку ниже 👇"
+)
+MENU_PROMPT = "Чем помочь?\n\nВыберите 👇"
+NOT_UNDERSTOOD = "Похоже, я не понял. Давайте продолжим через меню 👇"
+SESSION_EXPIRED = (
+    "⏳ Сессия истекла — вы долго не отвечали, поэтому начатое действие сброшено.\n\n"
+    "Выберите, что сделать 👇"
+)
+MYID_TEXT = "Ваш chat_id: <code>{chat_id}</code>.\n\nЕсли вы админ — подставьте это число в config.ADMIN_CHAT_ID."
+
+# --- Переход по ссылке с меткой (t.me/<бот>?start=<метка>): метка → строка в приветствии ---
+SOURCE_GREETING = {
+    "ref_site": "Вижу, вы пришли с сайта — могу быстро записать вас.",
+    "utm_website": "Вижу, вы пришли с сайта — могу быстро записать вас.",
+}
+
+# --- Язык (/lang) ---
+LANG_PROMPT = "Выберите язык 👇"
+LANG_SET = "Язык: русский ✅"
+
+# --- Запись: день → слот → [тренер] → уровень → контакт → подтверждение ---
+CHOOSE_DAY = "Выберите день недели 👇"
+CHOOSE_SLOT = "Выберите тренировку 👇"
+CHOOSE_TRAINER = "Выберите тренера 👇"
+ASK_LEVEL = "Ваш уровень?\n\nНажмите кнопку ниже 👇"
+ASK_CONTACT = (
+    "Контакт для связи\n\n"
+    "• Имя и телефон или @ник в Telegram\n\n"
+    "Напишите одним сообщением 👇"
+)
+ASK_CONTACT_AGAIN = "Напишите имя и контакт одним сообщением 👇"
+NAVIGATOR_LINE = '🧭 Навигатор: <a href="{url}">Открыть локацию</a>'
+# Карточка проверки перед подтверждением (HTML; значения экранируются)
+CHECK_CARD = (
+    "Проверьте, пожалуйста, правильно ли заполнены данные:\n\n"
+    "📝 Новая запись на тренировку\n\n"
+    "👤 Имя: {name}\n"
+    "📞 Контакт: {contact}\n"
+    "📅 День: {day}\n"
+    "🏃‍♂️ Тренировка: {training}\n"
+    "⏰ Время: {time}\n"
+    "🎯 Уровень: {level}\n"
+    "📍 Локация: {location}\n"
+    "{navigator}\n\n"
+    "Всё верно? 👇"
+)
+# Финальное подтверждение (HTML); дальше — «что взять» и подвал клуба
+CONFIRMED_CARD = (
+    "Записали вас ✅\n\n"
+    "📅 День: {day}\n"
+    "🏃‍♂️ Тренировка: {training}\n"
+    "⏰ Время: {time}\n"
+    "🎯 Уровень: {level}\n"
+    "📍 Локация: {location}\n"
+    "{navigator}\n"
+    "👤 Тренер: {trainer}"
+)
+TIME_RANGE = "с {start} до {end}"
+PAYMENT_LINE = "Оплата: {info}"
+CONTACT_LINE = "Контакт: {contact}"
+ICS_CAPTION = "📅 Тренировка в календарь — откройте файл, чтобы добавить."
+
+# --- Финальные рекомендации ПОСЛЕ подтверждения записи (только после «✅ Да») ---
+# Беговые (пн/вт/ср/чт): что взять с собой + душ
+FORM_RUN_AFTER_CONFIRM = (
+    "🏃‍♂️ Что взять с собой на тренировку\n\n"
+    "• Бутылку воды\n"
+    "• Кроссовки по погоде\n"
+    "• Одежду по погоде\n\n"
+    "🚿 После тренировки можно помыться — возьмите вещи для душа: полотенце, шампунь, гель."
+)
+# Силовые (зал): что взять + душ
+FORM_GYM_AFTER_CONFIRM = (
+    "🏋️‍♂️ Что взять с собой на тренировку\n\n"
+    "• Удобную спортивную одежду для зала\n"
+    "• Кроссовки для зала\n"
+    "• Бутылку воды\n\n"
+    "🚿 После тренировки можно помыться — возьмите вещи для душа: полотенце, шампунь, гель."
+)
+
+# --- Расписание ---
+SCHEDULE_CTA = "Записаться на удобный день? 👇"
+SCHEDULE_ERROR = "Расписание\n\nНе удалось загрузить данные. Попробуйте позже или напишите в чат 👇"
+SCHEDULE_UNAVAILABLE = (
+    "Расписание\n\n"
+    "• Данные временно недоступны\n"
+    "• Напишите в чат — подскажу дни и время\n\n"
+    "Нажмите кнопку ниже 👇"
+)
+
+# --- Адрес и локации ---
+ADDRESS_TITLE = "Адрес"
+ADDRESS_MAP = "Карта: {link}"
+ADDRESS_HOW = "На машине или пешком/транспорт? 👇"
+ADDRESS_UNKNOWN = (
+    "Адрес\n\n"
+    "• Пока не указан\n"
+    "• Напишите город/район — подскажу контакт админа или скину гео\n\n"
+    "Нажмите кнопку ниже 👇"
+)
+ADDRESS_ERROR = "Адрес\n\nНе удалось загрузить данные. Напишите в чат — подскажу 👇"
+ADDRESS_CAR = (
+    "Парковка\n\n"
+    "• У места старта\n"
+    "• Геоточку или подсказку — напишите, скину или передам админу\n\n"
+    "Записать на тренировку? 👇"
+)
+ADDRESS_WALK = (
+    "Пешком / транспорт\n\n"
+    "• Маршрут от метро/остановки — у админа или скину гео\n"
+    "• Напишите район — подскажу\n\n"
+    "Записать на тренировку? 👇"
+)
+LOCATIONS_PROMPT = "Адрес\n\nВыберите тип тренировки 👇"
+LOCATION_LINE = "📍 Локация: {address}"
+
+# --- Цены ---
+PRICE_PROMPT = "Выберите тренера 👇"
+
+# --- Что надеть: Зал / Манеж / Улица ---
+FORM_PROMPT = "Что надеть\n\nВыберите тип тренировки 👇"
+WEATHER_PROMPT = "Погода у вас? 👇"
+
+FORM_WEAR_GYM = (
+    "🏋️‍♂️ Что надеть в зал (силовая тренировка)\n\n"
+    "• Удобная спортивная форма\n"
+    "• Кроссовки для зала\n"
+    "• Носки\n"
+    "• Бутылка воды\n"
+    "• Полотенце\n\n"
+    "По желанию:\n"
+    "• Перчатки для тренировок\n"
+    "• Ремень или личная экипировка"
+)
+
+FORM_WEAR_MANEGE = (
+    "🏃‍♂️ Что надеть в манеж (беговая тренировка)\n\n"
+    "• Лёгкая спортивная форма\n"
+    "• Кроссовки для бега по покрытию\n"
+    "• Носки\n"
+    "• Бутылка воды\n\n"
+    "По желанию:\n"
+    "• Лёгкая кофта для разминки\n"
+    "• Часы или трекер"
+)
+
+FORM_WEAR_STREET_WARM = (
+    "☀️ Что надеть, когда тепло\n\n"
+    "• Футболка или майка\n"
+    "• Шорты или тайтсы\n"
+    "• Кроссовки для бега\n"
+    "• Кепка\n"
+    "• Вода обязательно"
+)
+
+FORM_WEAR_STREET_COOL = (
+    "🧢 Что надеть, когда прохладно\n\n"
+    "• Лонгслив или лёгкая кофта\n"
+    "• Тайтсы или лёгкие штаны\n"
+    "• Лёгкая ветровка\n"
+    "• Кроссовки\n"
+    "• Бафф или тонкая шапка — по желанию"
+)
+
+FORM_WEAR_STREET_COLD = (
+    "🧥 Что надеть, когда холодно\n\n"
+    "• Термобельё\n"
+    "• Тёплый лонгслив или кофта\n"
+    "• Ветровка\n"
+    "• Тайтсы\n"
+    "• Шапка и перчатки\n"
+    "• Кроссовки по погоде"
+)
+
+FORM_WEAR_STREET_RAIN = (
+    "🌧 Что надеть в дождь\n\n"
+    "• Ветровка или дождевик\n"
+    "• Быстросохнущая форма\n"
+    "• Тайтсы или штаны\n"
+    "• Кроссовки с хорошим сцеплением\n"
+    "• Кепка"
+)
+
+# --- Вопросы: темы, «Как проходят тренировки», «Что взять с собой», свой вопрос ---
+CHOOSE_TOPIC = "Выберите тему 👇"
+HOW_PROMPT = "Выберите тип тренировки 👇"
+
+QUESTION_HOW_RUN = (
+    "🏃‍♂️ БЕГОВЫЕ ТРЕНИРОВКИ\n"
+    "────────────────────\n\n"
+    "Тренировки проходят на стадионе или на улице и выстроены\n"
+    "по полной структуре:\n\n"
+    "• разминка\n"
+    "• основная часть\n"
+    "• заминка\n\n"
+    "В процессе уделяется внимание:\n"
+    "• общей физической подготовке\n"
+    "• общеразвивающим упражнениям\n"
+    "• беговым упражнениям и технике\n\n"
+    "Тренировки методически структурированы и адаптируются\n"
+    "под индивидуальные цели и уровень каждого участника.\n\n"
+    "────────────────────"
+)
+
+QUESTION_HOW_STRENGTH = (
+    "🏋️‍♂️ СИЛОВЫЕ ТРЕНИРОВКИ\n"
+    "────────────────────\n\n"
+    "Тренировки проходят в зале и имеют чёткую структуру занятия.\n\n"
+    "Основной акцент делается на:\n"
+    "• развитие силы\n"
+    "• развитие силовой выносливости\n\n"
+    "Дополнительно развиваются:\n"
+    "• координация\n"
+    "• мобильность\n"
+    "• общая физическая подготовка\n\n"
+    "Упражнения подбираются с учётом уровня подготовки\n"
+    "и индивидуальных целей.\n\n"
+    "────────────────────"
+)
+
+QUESTION_HOW_LONG = (
+    "🏃‍♂️ ДЛИТЕЛЬНЫЕ ВЫЕЗДНЫЕ БЕГОВЫЕ\n"
+    "────────────────────\n\n"
+    "Это совместная длительная пробежка на природе\n"
+    "(выездные локации, например Раубичи).\n\n"
+    "Цель тренировки:\n"
+    "• развитие сердечно-сосудистой системы\n"
+    "• повышение выносливости\n"
+    "• комфортный, спокойный темп\n\n"
+    "После тренировки:\n"
+    "☕ чай, кофе\n"
+    "🥐 завтраки, пирожные\n"
+    "и приятное общение.\n\n"
+    "────────────────────"
+)
+
+QUESTION_WHAT_TO_TAKE_TEXT = (
+    "🎒 Что взять с собой на тренировку\n\n"
+    "✅ Обязательно:\n"
+    "• Спортивная форма (по формату тренировки)\n"
+    "• Спортивная обувь:\n"
+    "  — для зала\n"
+    "  — для бега (улица / манеж)\n"
+    "• Бутылка воды\n"
+    "• Полотенце\n\n"
+    "🚿 Если планируете принять душ:\n"
+    "• Сланцы\n"
+    "• Средства для душа\n"
+    "• Сменная одежда\n\n"
+    "➕ Дополнительно (по желанию):\n"
+    "• Резинка для волос\n"
+    "• Личная экипировка\n"
+    "• Небольшой рюкзак или сумка\n\n"
+    "ℹ️ Важно:\n"
+    "Форму и обувь подбирайте с учётом погодных условий\n"
+    "и типа тренировки: зал / улица / манеж"
+)
+
+QUESTION_CUSTOM_PROMPT = (
+    "✍️ Задайте свой вопрос\n\n"
+    "Напишите ваш вопрос сообщением,\n"
+    "и мы обязательно вам ответим."
+)
+QUESTION_THANKS = "Спасибо, ваш вопрос передан. Мы ответим в ближайшее время."
+
+# --- Абонемент ---
+PASS_BALANCE = "🎟 Абонемент: осталось занятий — {remaining}."
+PASS_NONE = "🎟 Абонемента пока нет. Цены — в меню «💰 Цены», оформить — у администратора."
+PASS_CREDITED = "🎟 Абонемент: начислено занятий — {sessions}, осталось — {remaining}."
+PASS_DEBITED = "🎟 С абонемента списано занятие, осталось — {remaining}."
+
+# --- Мои записи (/mybookings): отмена и перенос ---
+MYBOOKINGS_TITLE = "📋 Ваши записи"
+MYBOOKINGS_EMPTY = "📋 Записей на ближайшие тренировки нет.\n\nЗаписаться можно через меню 👇"
+MYBOOKING_LINE = "📅 {date}, {day} • {training} • {time} • {trainer}"
+BTN_CANCEL_BOOKING = "❌ Отменить {date}"
+BTN_MOVE_BOOKING = "🔁 Перенести {date}"
+BTN_CANCEL_BOOKING_YES = "❌ Да, отменить"
+BTN_BACK_TO_BOOKINGS = "⬅️ Мои записи"
+CANCEL_BOOKING_ASK = "Отменить запись?\n\n{booking}"
+BOOKING_CANCELLED = "Запись отменена.\n\n{booking}"
+PASS_REFUNDED = "🎟 Занятие вернулось на абонемент, осталось — {remaining}."
+MOVE_BOOKING_ASK = "Перенести запись\n\n{booking}\n\nНа какую тренировку? 👇"
+BOOKING_MOVED = "Запись перенесена ✅\n\n{booking}"
+BOOKING_UNAVAILABLE = "Эту запись уже нельзя изменить: она отменена или тренировка прошла."
+SLOT_FULL = "😔 На эту тренировку мест уже нет. Выберите другую 👇"
+BOOKING_SAVE_FAILED = "😔 Не получилось сохранить запись — она пока не подтверждена. Нажмите «✅ Да» ещё раз через минуту 👇"
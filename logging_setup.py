@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Неблокирующее логирование: в цикле событий запись только кладётся в очередь (QueueHandler),
+а в stderr и файл пишет отдельный поток (QueueListener). Формат — JSON, одна запись на строку.
+
+Поля контекста (update_id, user_id, handler, conversation, state, latency_ms) подставляются
+из contextvars — их заполняет logging_middleware на время обработки апдейта.
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from contextvars import ContextVar
+
+# Контекст текущего апдейта для записей лога (dict; копия на каждый bind)
+_log_context: ContextVar = ContextVar("log_context", default={})
+
+CONTEXT_FIELDS = ("update_id", "user_id", "handler", "conversation", "state", "latency_ms")
+
+
+def bind(**fields):
+    """Добавить поля в контекст лога. Возвращает токен для unbind()."""
+    return _log_context.set({**_log_context.get(), **fields})
+
+
+def unbind(token) -> None:
+    _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Переносит поля контекста в запись. Работает в потоке цикла событий — до постановки в очередь."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает только долю записей INFO и ниже (rate от 0 до 1). WARNING и выше — всегда."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+_plain_formatter = logging.Formatter()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler с ограниченной очередью: если поток записи не успевает — запись отбрасывается, а не ждёт."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Сообщение собираем здесь (аргументы могут измениться), трассировку сохраняем в exc_text —
+        # форматирование в JSON или текст делает уже поток записи
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _plain_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение, поля контекста, исключение."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                data[key] = value
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    json_format: bool = True,
+    log_file: str = "",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    info_sample_rate: float = 1.0,
+    queue_size: int = 10_000,
+) -> logging.handlers.QueueListener:
+    """Настроить корневой логгер: очередь в цикле событий, запись в stderr (и файл с ротацией) в потоке.
+
+    Возвращает запущенный QueueListener — остановить его при выходе (listener.stop()), чтобы дописать хвост очереди.
+    """
+    if json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    outputs = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        outputs.append(
+            logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        )
+    for handler in outputs:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(SamplingFilter(info_sample_rate))
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    listener = logging.handlers.QueueListener(log_queue, *outputs, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+_handler_logger = logging.getLogger("bot.handlers")
+
+
+async def logging_middleware(info, update, context, call_next):
+    """Прослойка (см. middleware.install): контекст лога на время обработчика + запись с задержкой и новым состоянием."""
+    user = getattr(update, "effective_user", None)
+    token = bind(
+        update_id=getattr(update, "update_id", None),
+        user_id=user.id if user else None,
+        handler=info.name,
+        conversation=info.conversation,
+    )
+    start = time.perf_counter()
+    state = None
+    try:
+        state = await call_next()
+        return state
+    finally:
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        _handler_logger.info("handled", extra={"state": state, "latency_ms": latency_ms})
+        unbind(token)
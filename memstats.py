@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Память живого процесса для админа: /memstats — что держит бот и сколько занимает процесс.
+
+Сводка — из готовых счётчиков, без обхода кучи: RSS процесса (/proc/self/statm; где его нет — пик по
+getrusage), пользователи с user_data и их примерный объём, записи ConversationHandler по именам диалогов
+(register, ask_question), размеры кэшей и окон (кэш отрисовки, окно повторов, таблица адресатов, подписки
+.ics, языки, трассы, подключения к панели записей).
+
+Утечки — снимками tracemalloc: /memstats start включает трассировку выделений и снимает базовый снимок,
+/memstats diff — новый снимок против базового: места выделения (файл:строка; со «start N» — цепочка из N
+вызовов), где памяти стало больше всего. /memstats stop выключает трассировку. Пока трассировка не включена,
+она ничего не стоит; включённая видит только выделения после start, замедляет их (в разы на горячих путях)
+и сама занимает память — её включают на время поиска утечки. Сравнение снимков — проход Python по всем
+выделениям (секунды на сотнях тысяч), поэтому оно идёт в потоке, а ответ приходит отдельным сообщением.
+"""
+
+import datetime
+import linecache
+import os
+import tracemalloc
+
+import render_cache
+import tracing
+from sessions import SessionTracker
+
+# Выделения самой трассировки и импорта модулей в снимках — шум
+_NOISE = (tracemalloc.__file__, linecache.__file__, "<frozen importlib._bootstrap>",
+          "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def rss_bytes() -> tuple:
+    """(байт, текущий ли) — RSS процесса сейчас; без /proc (macOS) — пиковый по getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"), True
+    except (OSError, ValueError, IndexError):
+        import resource  # только Unix; /proc нет, например, на macOS
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux — КБ, macOS — байты
+        return (peak if os.uname().sysname == "Darwin" else peak * 1024), False
+
+
+def app_stats(app) -> list:
+    """[(подпись, значение)] для одного бота (клуба): пользователи, диалоги, кэши."""
+    bot_data = app.bot_data
+    sessions: SessionTracker = bot_data["sessions"]
+    s = sessions.stats(app)
+    rows = [
+        ("пользователей (user_data)", f"{s['user_data']} (~{s['user_data_bytes'] / 1024:.1f} KiB)"),
+        ("chat_data", s["chat_data"]),
+        ("активных сессий", s["sessions"]),
+    ]
+    rows += [(f"диалог {name}", count) for name, count in s["conversations"].items()]
+    locales = bot_data["i18n"]
+    rows += [
+        ("кэш отрисовки", f"{len(render_cache.render_cache)} / {render_cache.render_cache.maxsize}"),
+        ("окно повторов", len(bot_data["dedup"])),
+        ("адресаты персонала", len(bot_data["admin_router"])),
+        ("подписки .ics", len(bot_data["calendar"])),
+        ("выбор языка (/lang)", len(locales.preferences)),
+        ("трассы", f"{len(tracing.store.recent)} + медленных {len(tracing.store.slow)}"),
+    ]
+    attendance = bot_data.get("attendance")
+    if attendance is not None:
+        rows.append(("отметки /roster в очереди", len(attendance.pending)))
+    board = bot_data.get("board")
+    if board is not None:
+        rows.append(("подключений к ленте панели", len(board)))
+    return rows
+
+
+def report(app) -> str:
+    rss, current = rss_bytes()
+    lines = [f"RSS процесса: {rss / 1024 / 1024:.1f} MiB" + ("" if current else " (пик)")]
+    if tracer.started_at is not None:
+        traced, peak = tracemalloc.get_traced_memory()
+        lines.append(f"tracemalloc: {traced / 1024 / 1024:.1f} MiB (пик {peak / 1024 / 1024:.1f}), "
+                     f"включён {tracer.started_at:%H:%M:%S}")
+    lines.append("")
+    lines += [f"{label + ':':<28}{value}" for label, value in app_stats(app)]
+    return "\n".join(lines)
+
+
+class MemoryTracer:
+    """tracemalloc на весь процесс (все клубы): базовый снимок и сравнение с ним."""
+
+    def __init__(self):
+        self.started_at = None
+        self.frames = 1
+        self._baseline = None
+
+    def start(self, frames: int = 1) -> None:
+        """Включить трассировку (frames — глубина стека у каждого выделения) и снять базовый снимок."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.frames = frames
+        tracemalloc.start(frames)
+        self.started_at = datetime.datetime.now()
+        self._baseline = _snapshot()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self.started_at = None
+        self._baseline = None
+
+    def rebase(self) -> None:
+        """Текущее состояние — новый базовый снимок (следующий diff — рост с этого момента)."""
+        self.require()
+        self._baseline = _snapshot()
+
+    def diff(self, top: int = 10) -> str:
+        """Рост памяти с базового снимка: top мест выделения. Тяжело — вызывать в потоке (to_thread)."""
+        self.require()
+        stats = _without_noise(_snapshot().compare_to(self._baseline, self._group))
+        grown = sum(stat.size_diff for stat in stats)
+        minutes = (datetime.datetime.now() - self.started_at).total_seconds() / 60
+        lines = [f"С базового снимка (трассировка {minutes:.0f} мин): {_kib(grown)} всего", ""]
+        for stat in stats[:top]:
+            lines.append(f"{_kib(stat.size_diff):>12} {stat.count_diff:>+8} блоков  (всего {stat.size / 1024:.1f} KiB)")
+            lines += _where(stat.traceback)
+        return "\n".join(lines)
+
+    def top(self, top: int = 10) -> str:
+        """Где сейчас больше всего памяти (без сравнения)."""
+        self.require()
+        stats = _without_noise(_snapshot().statistics(self._group))
+        lines = [f"Выделено (трассируется): {sum(stat.size for stat in stats) / 1024 / 1024:.1f} MiB", ""]
+        for stat in stats[:top]:
+            lines.append(f"{stat.size / 1024:>10.1f} KiB {stat.count:>8} блоков")
+            lines += _where(stat.traceback)
+        return "\n".join(lines)
+
+    @property
+    def _group(self) -> str:
+        return "traceback" if self.frames > 1 else "lineno"
+
+    def require(self) -> None:
+        """Трассировка включена и базовый снимок есть — иначе RuntimeError."""
+        if self._baseline is None or not tracemalloc.is_tracing():
+            raise RuntimeError("трассировка не включена: /memstats start")
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot()
+
+
+def _without_noise(stats: list) -> list:
+    """Без выделений самой трассировки и импорта (фильтр по готовой статистике — filter_traces по всем
+    выделениям медленнее самого сравнения)."""
+    return [stat for stat in stats if stat.traceback[-1].filename not in _NOISE]
+
+
+def _where(traceback) -> list:
+    """Место выделения: до трёх кадров, самый внутренний первым, с текстом строки."""
+    lines = []
+    for frame in list(reversed(traceback))[:3]:
+        code = linecache.getline(frame.filename, frame.lineno).strip()
+        lines.append(f"    {_short(frame.filename)}:{frame.lineno}  {code[:60]}")
+    return lines
+
+
+def _short(filename: str) -> str:
+    """Путь без каталога site-packages / проекта: telegram/_bot.py, bot.py."""
+    parts = filename.replace("\\", "/").split("/")
+    if "site-packages" in parts:
+        return "/".join(parts[parts.index("site-packages") + 1:])
+    return parts[-1]
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:+.1f} KiB"
+
+
+tracer = MemoryTracer()
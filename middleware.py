@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Прослойки (middleware) вокруг колбэков обработчиков.
+
+install(app, mw1, mw2, ...) оборачивает callback каждого обработчика приложения, включая
+обработчики внутри ConversationHandler. Прослойка — корутина вида:
+
+    async def mw(info: HandlerInfo, update, context, call_next):
+        ...
+        return await call_next()
+
+Вызывать после регистрации всех обработчиков (в main()).
+"""
+
+import functools
+import inspect
+from typing import NamedTuple, Optional
+
+from telegram.ext import ConversationHandler
+
+
+class HandlerInfo(NamedTuple):
+    """Что вызывается: имя колбэка, имя ConversationHandler и сам ConversationHandler (если обработчик внутри диалога)."""
+
+    name: str
+    conversation: Optional[str] = None
+    conv_handler: Optional[ConversationHandler] = None
+
+
+def conversation_state(info: HandlerInfo, update):
+    """Текущее (до вызова обработчика) состояние диалога для апдейта; None — диалог не начат.
+
+    У PTB нет публичного API для чтения состояния, поэтому используются _get_key и _conversations.
+    """
+    conv = info.conv_handler
+    if conv is None:
+        return None
+    try:
+        return conv._conversations.get(conv._get_key(update))
+    except RuntimeError:  # апдейт без чата/пользователя
+        return None
+
+
+def _chain(middleware, info: HandlerInfo, inner):
+    @functools.wraps(inner)
+    async def wrapped(update, context):
+        return await middleware(info, update, context, lambda: inner(update, context))
+
+    return wrapped
+
+
+def wrap_callback(callback, info: HandlerInfo, middlewares):
+    """Обернуть один колбэк цепочкой прослоек (первая в списке — внешняя)."""
+    wrapped = callback
+    for middleware in reversed(middlewares):
+        wrapped = _chain(middleware, info, wrapped)
+    return wrapped
+
+
+def _walk(handler, conv_handler: Optional[ConversationHandler], seen: set):
+    """Обработчики с колбэками (с вложенными в ConversationHandler) → (обработчик, его ConversationHandler)."""
+    if id(handler) in seen:
+        return
+    seen.add(id(handler))
+    if isinstance(handler, ConversationHandler):
+        nested = list(handler.entry_points) + list(handler.fallbacks)
+        for state_handlers in handler.states.values():
+            nested.extend(state_handlers)
+        for h in nested:
+            yield from _walk(h, handler, seen)
+        return
+    yield handler, conv_handler
+
+
+def _handlers(app):
+    seen: set = set()
+    for handlers in app.handlers.values():
+        for handler in handlers:
+            yield from _walk(handler, None, seen)
+
+
+def install(app, *middlewares) -> None:
+    """Обернуть колбэки всех зарегистрированных обработчиков приложения."""
+    if not middlewares:
+        return
+    for handler, conv_handler in _handlers(app):
+        callback = handler.callback
+        info = HandlerInfo(
+            getattr(callback, "__name__", repr(callback)),
+            conv_handler.name if conv_handler is not None else None,
+            conv_handler,
+        )
+        handler.callback = wrap_callback(callback, info, middlewares)
+
+
+def callbacks(app) -> list:
+    """Исходные колбэки всех обработчиков приложения — без прослоек (обёртки хранят их в __wrapped__)."""
+    return [inspect.unwrap(handler.callback) for handler, _ in _handlers(app)]
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Профилирование живого процесса по команде: /profile <секунд> — выборки стеков всех потоков на это окно.
+
+Пока профилирование выключено, его нет вовсе: ни таймера, ни трассировки, ни прослойки вокруг обработчиков.
+На время окна взводится таймер SIGALRM: раз в interval секунд обработчик сигнала снимает стеки всех потоков
+(прерванный кадр цикла событий и sys._current_frames для остальных) и считает одинаковые. Код не
+трассируется (в отличие от cProfile), поэтому замедление — только время самого снимка, сотни выборок в
+секунду процесс не замечают.
+
+Отчёт:
+  - цикл событий — доля выборок, когда он был занят, и на какие обработчики (handle_text, reg_confirm, …)
+    пришлось это время: выборка относится к самому внешнему колбэку обработчика в стеке
+    (middleware.callbacks), остальное — PTB, polling и фоновые задачи;
+  - функции — где чаще всего стоял сам стек (собственное время), по всем потокам;
+  - потоки to_thread и прочие — сколько они были заняты (запись в SQLite, выгрузки, копии).
+Стеки целиком — файлом в формате collapsed stacks («поток;функция;…;функция число»): flamegraph.pl,
+speedscope, inferno. Ожидание (select цикла событий, простаивающие потоки) в файл и в топы не входит.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+# Листовые функции, в которых поток ждёт, а не работает: (файл, функция)
+_IDLE = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),  # concurrent.futures: поток to_thread ждёт задачу
+}
+# Больше уровней стека не разбираем (рекурсия)
+_MAX_DEPTH = 128
+OUTSIDE_HANDLERS = "(вне обработчиков)"
+
+
+class Profile:
+    """Результат одного окна: стеки (кортежи кодов, от внешнего к внутреннему) по потокам и их число."""
+
+    def __init__(self, stacks: Counter, idle: Counter, threads: dict, loop_thread: int, handler_codes: set,
+                 seconds: float, interval: float):
+        self.stacks = stacks  # (thread_id, (code, …)) → выборок
+        self.idle = idle  # thread_id → выборок в ожидании
+        self.threads = threads  # thread_id → имя потока
+        self.loop_thread = loop_thread
+        self.handler_codes = handler_codes
+        self.seconds = seconds
+        self.interval = interval
+
+    @property
+    def samples(self) -> int:
+        """Выборок цикла событий (занят + ждёт) — по ним считаются доли."""
+        return self.idle[self.loop_thread] + sum(n for (tid, _), n in self.stacks.items() if tid == self.loop_thread)
+
+    def by_handler(self) -> Counter:
+        """Обработчик → выборок, когда цикл событий был занят его кодом (со всем, что он вызвал)."""
+        counts = Counter()
+        for (tid, stack), n in self.stacks.items():
+            if tid != self.loop_thread:
+                continue
+            handler = next((code.co_name for code in stack if code in self.handler_codes), OUTSIDE_HANDLERS)
+            counts[handler] += n
+        return counts
+
+    def by_function(self) -> Counter:
+        """Функция (листовая в стеке) → выборок, все потоки."""
+        counts = Counter()
+        for (tid, stack), n in self.stacks.items():
+            counts[_label(stack[-1])] += n
+        return counts
+
+    def by_thread(self) -> Counter:
+        counts = Counter()
+        for (tid, stack), n in self.stacks.items():
+            counts[tid] += n
+        return counts
+
+    def report(self, top: int = 15) -> str:
+        total = self.samples or 1
+        busy = self.by_thread()
+        loop_busy = busy.get(self.loop_thread, 0)
+        lines = [
+            f"Окно {self.seconds:.1f} с, выборка раз в {self.interval * 1000:.0f} ms: {total} выборок цикла событий",
+            f"Цикл событий занят: {loop_busy / total:.1%}",
+            "",
+            "Обработчики (доля всех выборок цикла):",
+        ]
+        for name, n in self.by_handler().most_common(top):
+            lines.append(f"{n / total:>7.1%}  {n:>6}  {name}")
+        lines += ["", "Функции (собственное время, все потоки):"]
+        for name, n in self.by_function().most_common(top):
+            lines.append(f"{n / total:>7.1%}  {n:>6}  {name}")
+        others = [(tid, n) for tid, n in busy.most_common() if tid != self.loop_thread]
+        if others:
+            lines += ["", "Другие потоки (занят, доля окна):"]
+            for tid, n in others[:top]:
+                samples = n + self.idle.get(tid, 0)
+                lines.append(f"{n / samples:>7.1%}  {n:>6}  {self.threads.get(tid, tid)}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Стеки в формате collapsed stacks (flamegraph.pl / speedscope): «поток;f1;f2 число» на строку."""
+        folded = Counter()
+        for (tid, stack), n in self.stacks.items():
+            thread = str(self.threads.get(tid, tid)).replace(";", ",").replace(" ", "_")
+            folded[";".join([thread, *(_label(code).replace(" ", "_") for code in stack)])] += n
+        return "".join(f"{line} {n}\n" for line, n in sorted(folded.items()))
+
+
+class SamplingProfiler:
+    """Одно окно профилирования за раз на весь процесс (все клубы)."""
+
+    def __init__(self, interval: float = 0.005, max_seconds: float = 300.0):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.running = False
+
+    def configure(self, interval: float, max_seconds: float) -> None:
+        self.interval = interval
+        self.max_seconds = max_seconds
+
+    async def profile(self, seconds: float, handlers=(), app=None) -> Profile:
+        """Снимать выборки seconds секунд (не больше max_seconds) из цикла событий, в котором вызвано.
+
+        handlers — колбэки обработчиков (middleware.callbacks) для разбивки по ним. С app окно
+        заканчивается раньше, если бот останавливается (app.stopping) — остановку профиль не задерживает.
+        """
+        if self.running:
+            raise RuntimeError("профилирование уже идёт")
+        seconds = min(seconds, self.max_seconds)
+        self.running = True
+        recorder = _Recorder(threading.get_ident())
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, "setitimer"):
+            sampler = _SignalSampler(recorder, self.interval)
+        else:
+            sampler = _ThreadSampler(recorder, self.interval)
+        started = time.monotonic()
+        try:
+            sampler.start()
+            deadline = started + seconds
+            while time.monotonic() < deadline and not (app is not None and app.stopping):
+                await asyncio.sleep(min(deadline - time.monotonic(), 0.5))
+        finally:
+            await sampler.stop()
+            self.running = False
+        threads = {thread.ident: thread.name for thread in threading.enumerate()}
+        threads.update(recorder.thread_names)
+        return Profile(
+            recorder.stacks, recorder.idle, threads, recorder.loop_thread,
+            {callback.__code__ for callback in handlers if hasattr(callback, "__code__")},
+            time.monotonic() - started, self.interval,
+        )
+
+
+class _Recorder:
+    def __init__(self, loop_thread: int):
+        self.loop_thread = loop_thread
+        self.stacks = Counter()
+        self.idle = Counter()
+        self.thread_names = {}
+
+    def record(self, frames: dict) -> None:
+        for tid, frame in frames.items():
+            stack = []
+            while frame is not None and len(stack) < _MAX_DEPTH:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            leaf = stack[0]
+            if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE:
+                self.idle[tid] += 1
+                continue
+            stack.reverse()
+            self.stacks[(tid, tuple(stack))] += 1
+            if tid not in self.thread_names:
+                # Потоки to_thread могут завершиться до конца окна — имя запоминаем сразу
+                self.thread_names.update((t.ident, t.name) for t in threading.enumerate())
+
+
+class _SignalSampler:
+    """Таймер SIGALRM: обработчик сигнала выполняется в главном потоке (цикл событий) между инструкциями
+    и получает прерванный кадр — видно, чем цикл был занят, а не только где он отпустил GIL."""
+
+    def __init__(self, recorder: _Recorder, interval: float):
+        self.recorder = recorder
+        self.interval = interval
+        self._previous = None
+
+    def _on_alarm(self, signum, frame) -> None:
+        frames = sys._current_frames()
+        frames[self.recorder.loop_thread] = frame
+        self.recorder.record(frames)
+
+    def start(self) -> None:
+        self._previous = signal.signal(signal.SIGALRM, self._on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+
+    async def stop(self) -> None:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous)
+
+
+class _ThreadSampler(threading.Thread):
+    """Запасной вариант, когда цикл событий не в главном потоке (сигналов там нет): поток-сэмплер.
+    Он получает GIL там, где цикл его отпускает, — занятость цикла в отчёте занижена."""
+
+    def __init__(self, recorder: _Recorder, interval: float):
+        super().__init__(name="profiler", daemon=True)
+        self.recorder = recorder
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            del frames[own]
+            self.recorder.record(frames)
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        await asyncio.to_thread(self.join)
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+profiler = SamplingProfiler()
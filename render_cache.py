@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Кэш отрисовки: не вызываем edit_message_text, если текст и клавиатура сообщения не изменились.
+Повторное нажатие той же кнопки больше не тратит запрос к Bot API и не ловит «message is not modified».
+"""
+
+import logging
+from collections import OrderedDict
+
+from telegram.error import BadRequest
+
+logger = logging.getLogger(__name__)
+
+# Сколько сообщений (bot_id, chat_id, message_id) помним; самые старые вытесняются
+RENDER_CACHE_MAXSIZE = 10_000
+
+
+class RenderStats:
+    """Счётчики: реальные правки, пропущенные (одинаковые) правки, ответы Telegram «not modified»."""
+
+    __slots__ = ("edits", "suppressed", "not_modified")
+
+    def __init__(self):
+        self.edits = 0
+        self.suppressed = 0
+        self.not_modified = 0
+
+    def as_dict(self) -> dict:
+        return {"edits": self.edits, "suppressed": self.suppressed, "not_modified": self.not_modified}
+
+
+class RenderCache:
+    """Ограниченный LRU: (bot_id, chat_id, message_id) → отпечаток последнего текста и клавиатуры."""
+
+    def __init__(self, maxsize: int = RENDER_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self.stats = RenderStats()
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def is_same(self, key, fingerprint: int) -> bool:
+        return key is not None and self._data.get(key) == fingerprint
+
+    def remember(self, key, fingerprint: int) -> None:
+        if key is None:
+            return
+        self._data[key] = fingerprint
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def forget(self, key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+render_cache = RenderCache()
+
+
+def message_key(query):
+    """Ключ сообщения под кнопкой: (bot_id, chat_id, message_id) или (bot_id, inline_message_id).
+
+    Кэш общий для всех ботов процесса (клубов), а в личном чате chat_id — это пользователь, и номера
+    сообщений у каждого бота свои: без bot_id правки разных ботов одному пользователю совпали бы по ключу.
+    """
+    bot_id = query.get_bot().id
+    message = query.message
+    if message is not None:
+        return (bot_id, message.chat.id, message.message_id)
+    if query.inline_message_id is None:
+        return None
+    return (bot_id, query.inline_message_id)
+
+
+def render_fingerprint(text: str, reply_markup=None, parse_mode=None) -> int:
+    """Отпечаток содержимого. InlineKeyboardMarkup хэшируется по кнопкам — без сериализации в JSON."""
+    return hash((text, parse_mode, reply_markup))
+
+
+async def edit_message_text(query, text: str, reply_markup=None, **kwargs):
+    """Правка сообщения под кнопкой с пропуском одинаковых правок.
+
+    Если содержимое совпадает с последним отрисованным — запрос не отправляется (возвращает None),
+    колбэк при этом отвечает сам обработчик. Ошибка «message is not modified» считается пропуском.
+    """
+    key = message_key(query)
+    fingerprint = render_fingerprint(text, reply_markup, kwargs.get("parse_mode"))
+    if render_cache.is_same(key, fingerprint):
+        render_cache.stats.suppressed += 1
+        return None
+    try:
+        result = await query.edit_message_text(text, reply_markup=reply_markup, **kwargs)
+    except BadRequest as e:
+        if "message is not modified" not in str(e).lower():
+            render_cache.forget(key)
+            raise
+        render_cache.stats.not_modified += 1
+        result = None
+    else:
+        render_cache.stats.edits += 1
+    render_cache.remember(key, fingerprint)
+    return result
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Ответ на нажатие кнопки: answer() и правка сообщения идут параллельно, а не друг за другом.
+Экономит один полный запрос к Bot API на каждое нажатие.
+"""
+
+import asyncio
+import logging
+
+from telegram.error import TelegramError
+
+from render_cache import edit_message_text
+
+logger = logging.getLogger(__name__)
+
+
+async def safe_answer(query, text: str = None) -> bool:
+    """query.answer() без исключений: устаревший или уже отвеченный колбэк — только предупреждение в лог."""
+    try:
+        await query.answer(text)
+        return True
+    except TelegramError as e:
+        logger.warning("Не удалось ответить на колбэк %s: %s", query.data, e)
+        return False
+
+
+class CallbackReply:
+    """Ответ на один колбэк. ack() — оптимистичный answer в фоне, edit() — правка + ожидание answer.
+
+    Нужен обработчикам, которые перед правкой делают что-то долгое (например, reg_confirm
+    отправляет форму админу): кнопка перестаёт «крутиться» сразу, а не после всей работы.
+    """
+
+    __slots__ = ("query", "_ack")
+
+    def __init__(self, query):
+        self.query = query
+        self._ack = None
+
+    def ack(self, text: str = None) -> None:
+        if self._ack is None:
+            self._ack = asyncio.ensure_future(safe_answer(self.query, text))
+
+    async def edit(self, text: str, reply_markup=None, answer_text: str = None, **kwargs):
+        ack = self._ack if self._ack is not None else safe_answer(self.query, answer_text)
+        self._ack = ack = asyncio.ensure_future(ack)
+        _, edited = await asyncio.gather(
+            ack,
+            edit_message_text(self.query, text, reply_markup=reply_markup, **kwargs),
+            return_exceptions=True,
+        )
+        if isinstance(edited, BaseException):
+            raise edited
+        return edited
+
+
+async def answer_and_edit(query, text: str, reply_markup=None, answer_text: str = None, **kwargs):
+    """answer() и edit_message_text одновременно. Ошибка answer — в лог, ошибка правки — наверх.
+
+    Если содержимое не изменилось (см. render_cache), уходит только answer().
+    """
+    return await CallbackReply(query).edit(text, reply_markup=reply_markup, answer_text=answer_text, **kwargs)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Отметка посещаемости тренером (/roster): список записавшихся на тренировку — инлайн-клавиатура по
+страницам, нажатие на имя переключает «пришёл / не пришёл».
+
+Тренер отмечает подряд десяток человек, и запись в базу на каждое нажатие не нужна. Отметки копятся
+в AttendanceBuffer и уходят одной транзакцией (storage.BookingStore.apply_attendance), когда нажатия
+стихли на debounce секунд (но не позже max_delay после первой). Пока отметка не записана, список
+показывается с её учётом. При остановке бота несохранённое записывается. С debit_pass (PASS_DEBIT_ON =
+"attendance") в той же транзакции «пришёл» списывает занятие с абонемента, снятая отметка — возвращает.
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 8
+# Какие тренировки предлагать в /roster: от DAYS_BACK дней назад до DAYS_AHEAD вперёд
+DAYS_BACK = 3
+DAYS_AHEAD = 1
+
+_MARKS = {1: "✅", 0: "❌", None: "▫️"}
+
+
+class AttendanceBuffer:
+    """Несохранённые отметки одного бота (клуба): booking_id → 1 | 0 | None."""
+
+    def __init__(self, store, debounce: float = 2.0, max_delay: float = 10.0, debit_pass: bool = False):
+        self.store = store
+        self.debounce = debounce
+        self.debit_pass = debit_pass
+        self.max_delay = max_delay
+        self.pending = {}
+        # Отметки, которые сейчас записываются (до конца транзакции список показывается с их учётом)
+        self._inflight = {}
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._task = None
+        self.flushes = 0
+
+    def set(self, booking_id: int, value) -> None:
+        now = time.monotonic()
+        if not self.pending:
+            self._first_change = now
+        self._last_change = now
+        self.pending[booking_id] = value
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later(), name="attendance:flush")
+
+    def overlay(self, rows: list) -> list:
+        """Строки storage.BookingStore.roster с учётом несохранённых отметок."""
+        if not self.pending and not self._inflight:
+            return rows
+        pending = {**self._inflight, **self.pending}
+        return [row[:4] + (pending.get(row[0], row[4]),) + row[5:] for row in rows]
+
+    async def _flush_later(self) -> None:
+        while self.pending:
+            now = time.monotonic()
+            wake = min(self._last_change + self.debounce, self._first_change + self.max_delay)
+            if now < wake:
+                await asyncio.sleep(wake - now)
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                # Уже в логе; следующая попытка — через max_delay
+                await asyncio.sleep(self.max_delay)
+
+    async def flush(self) -> None:
+        """Записать накопленные отметки одной транзакцией (в потоке)."""
+        if not self.pending:
+            return
+        marks, self.pending = self.pending, {}
+        self._inflight = marks
+        try:
+            await asyncio.to_thread(self.store.apply_attendance, marks, self.debit_pass)
+            self.flushes += 1
+        except Exception:
+            logger.exception("Не удалось сохранить отметки посещаемости (%s)", len(marks))
+            # Вернуть в очередь, не затирая более новые нажатия
+            self.pending = {**marks, **self.pending}
+            raise
+        finally:
+            self._inflight = {}
+
+    async def flush_on_stop(self, app) -> None:
+        await self.flush()
+
+
+def toggled(value):
+    """Следующее состояние по нажатию: пришёл → не пришёл, иначе → пришёл."""
+    return 0 if value == 1 else 1
+
+
+def session_window(today: datetime.date) -> tuple:
+    return (today - datetime.timedelta(days=DAYS_BACK)).isoformat(), (today + datetime.timedelta(days=DAYS_AHEAD)).isoformat()
+
+
+# --- Экраны (тексты для тренеров — на языке бота по умолчанию, как у команд админа) ---
+def sessions_screen(sessions: list, slot_labels) -> tuple:
+    """Выбор тренировки: sessions — [(дата, slot_id, записей, отмечено)]."""
+    if not sessions:
+        return "Записей на ближайшие тренировки нет.", None
+    buttons = [
+        [InlineKeyboardButton(
+            f"{session_date[5:]} · {slot_labels.get(slot_id, slot_id)} · {marked}/{count}",
+            callback_data=f"roster:s:{slot_id}:{session_date}:0",
+        )]
+        for session_date, slot_id, count, marked in sessions
+    ]
+    return "Отметка посещаемости — выберите тренировку 👇", InlineKeyboardMarkup(buttons)
+
+
+def roster_screen(rows: list, slot_id: str, session_date: str, page: int, slot_label: str) -> tuple:
+    """Страница списка: rows — [(id, user_id, name, username, attended, пропусков)]."""
+    pages = max(1, -(-len(rows) // PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+    present = sum(1 for row in rows if row[4] == 1)
+    absent = sum(1 for row in rows if row[4] == 0)
+    text = (
+        f"{slot_label}\n{session_date}\n\n"
+        f"Пришли: {present} · не пришли: {absent} · не отмечены: {len(rows) - present - absent}\n"
+        "Нажмите на имя, чтобы отметить 👇"
+    )
+    suffix = f"{slot_id}:{session_date}"
+    buttons = []
+    for booking_id, _user_id, name, username, attended, no_show in rows[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
+        label = f"{_MARKS[attended]} {name}"
+        if username != "—":
+            label += f" ({username})"
+        if no_show:
+            label += f" · пропусков: {no_show}"
+        buttons.append([InlineKeyboardButton(label, callback_data=f"roster:t:{booking_id}:{suffix}:{page}")])
+    if pages > 1:
+        nav = []
+        if page > 0:
+            nav.append(InlineKeyboardButton("◀️", callback_data=f"roster:s:{suffix}:{page - 1}"))
+        nav.append(InlineKeyboardButton(f"{page + 1}/{pages}", callback_data=f"roster:s:{suffix}:{page}"))
+        if page < pages - 1:
+            nav.append(InlineKeyboardButton("▶️", callback_data=f"roster:s:{suffix}:{page + 1}"))
+        buttons.append(nav)
+    buttons.append([
+        InlineKeyboardButton("🏁 Завершить: остальные не пришли", callback_data=f"roster:close:{suffix}"),
+    ])
+    buttons.append([InlineKeyboardButton("⬅️ Все тренировки", callback_data="roster:list")])
+    return text, InlineKeyboardMarkup(buttons)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Куда слать сообщения для персонала: таблица ADMIN_ROUTES вместо одного ADMIN_CHAT_ID.
+
+Правило — словарь: условия kind / slot_id / trainer (значение или список; условия нет — подходит любое)
+и chats — адресаты: chat_id или [chat_id, message_thread_id] (тема форума). Сообщению достаются адресаты
+всех подошедших правил; не подошло ни одно — ADMIN_CHAT_ID. Виды сообщений — KINDS.
+
+Таблица (вид, слот, тренер) → адресаты собирается один раз при старте для всех слотов и тренеров клуба;
+в обработчике — один поиск в словаре. Отправка всем адресатам идёт параллельно, ошибка у одного (бот
+удалён из чата, тема закрыта) пишется в лог и не мешает остальным.
+"""
+
+import asyncio
+import itertools
+import logging
+
+from telegram.error import TelegramError
+
+logger = logging.getLogger(__name__)
+
+# booking — новая запись, cancel / move — отмена и перенос (/mybookings), question — вопрос из меню,
+# message — текст, написанный боту
+KINDS = ("booking", "cancel", "move", "question", "message")
+_CONDITIONS = ("kind", "slot_id", "trainer")
+
+
+class AdminRouter:
+    def __init__(self, routes: list, fallback_chat, slot_ids=(), trainers=()):
+        self._rules = [parse_rule(rule) for rule in routes]
+        self._fallback = ((fallback_chat, None),) if fallback_chat else ()
+        self._table = {}
+        for key in itertools.product(KINDS, (None, *slot_ids), (None, *trainers)):
+            self._table[key] = self._match(*key)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def _match(self, kind: str, slot_id, trainer) -> tuple:
+        values = {"kind": kind, "slot_id": slot_id, "trainer": trainer}
+        found = []
+        for conditions, destinations in self._rules:
+            if all(values[name] in allowed for name, allowed in conditions.items()):
+                found.extend(d for d in destinations if d not in found)
+        return tuple(found) or self._fallback
+
+    def resolve(self, kind: str, slot_id: str = None, trainer: str = None) -> tuple:
+        """Адресаты [(chat_id, thread_id | None)] для сообщения такого вида о таком слоте и тренере."""
+        key = (kind, slot_id, trainer)
+        destinations = self._table.get(key)
+        if destinations is None:
+            # Слот или тренер не из расписания (старая запись) — считаем и запоминаем
+            destinations = self._table[key] = self._match(*key)
+        return destinations
+
+    async def send(self, bot, destinations, text: str, **kwargs) -> int:
+        """Отправить text всем адресатам параллельно. Возвращает число доставленных."""
+        results = await asyncio.gather(*(_send_one(bot, d, text, kwargs) for d in destinations))
+        return sum(results)
+
+
+async def _send_one(bot, destination: tuple, text: str, kwargs: dict) -> bool:
+    chat_id, thread_id = destination
+    try:
+        await bot.send_message(chat_id=chat_id, text=text, message_thread_id=thread_id, **kwargs)
+        return True
+    except TelegramError as e:
+        logger.warning("Не удалось отправить сообщение персоналу в %s: %s", chat_id, e)
+        return False
+
+
+def uncovered_kinds(routes: list) -> list:
+    """Виды сообщений, которые без ADMIN_CHAT_ID не получит никто: нет правила с адресатами для любого
+    слота и тренера (без условий slot_id и trainer)."""
+    covered = set()
+    for conditions, destinations in map(parse_rule, routes):
+        if destinations and "slot_id" not in conditions and "trainer" not in conditions:
+            covered |= conditions.get("kind", frozenset(KINDS))
+    return [kind for kind in KINDS if kind not in covered]
+
+
+def parse_rule(rule) -> tuple:
+    """Правило ADMIN_ROUTES → (условия, адресаты). Ошибка в правиле — ValueError (проверяется и в settings)."""
+    unknown = set(rule) - set(_CONDITIONS) - {"chats"}
+    if unknown:
+        raise ValueError(f"ADMIN_ROUTES: неизвестные поля {sorted(unknown)} (есть: kind, slot_id, trainer, chats)")
+    conditions = {}
+    for name in _CONDITIONS:
+        if name in rule:
+            value = rule[name]
+            conditions[name] = frozenset(value if isinstance(value, (list, tuple)) else [value])
+    unknown_kinds = conditions.get("kind", frozenset()) - set(KINDS)
+    if unknown_kinds:
+        raise ValueError(f"ADMIN_ROUTES: неизвестный вид сообщения {sorted(unknown_kinds)} (есть: {', '.join(KINDS)})")
+    destinations = []
+    for chat in rule.get("chats", []):
+        chat_id, thread_id = (chat[0], chat[1]) if isinstance(chat, (list, tuple)) else (chat, None)
+        destinations.append((int(chat_id), int(thread_id) if thread_id is not None else None))
+    return conditions, tuple(destinations)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Application бота: общие действия вокруг обработки каждого апдейта (трассировка и т.п.).
+Подключается через Application.builder().application_class(BotApplication).
+
+run_polling_all — запуск одного или нескольких ботов (клубов) на одном цикле событий.
+
+Остановка (SIGTERM при выкатке, SIGINT) идёт по шагам, чтобы перезапуск ничего не терял:
+  1. polling всех ботов останавливается — новых апдейтов нет; уже полученные остаются в очереди
+     (Telegram их больше не пришлёт, поэтому их надо дообработать);
+  2. очередь дообрабатывается, обработчики в работе и задачи create_task (уведомления админу)
+     доводятся до конца — не дольше shutdown_timeout секунд; повторный сигнал — не ждать;
+  3. сервисы отменяются, stop_hooks сбрасывают воронку, отметки и закрывают базу записей —
+     только теперь, когда их уже никто не использует.
+"""
+
+import asyncio
+import logging
+import signal
+import warnings
+
+from telegram.ext import Application
+from telegram.warnings import PTBUserWarning
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class BotApplication(Application):
+    """Application с корневым спаном трассировки на каждый апдейт и фоновыми сервисами.
+
+    services — корутинные функции service(app), работают в фоне, пока бот запущен (периодический сброс
+    счётчиков и т.п.); при остановке отменяются. stop_hooks — корутинные функции hook(app), вызываются
+    при остановке после отмены сервисов (финальный сброс на диск). update_filters — корутинные функции
+    drop(app, update), вызываются до обработчиков; True — апдейт не обрабатывать (повтор и т.п.).
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.services = []
+        self.stop_hooks = []
+        self.update_filters = []
+        self._service_tasks = []
+        # Апдейты, обработка которых идёт прямо сейчас (для журнала при остановке)
+        self.inflight = 0
+        # Задачи create_task, ещё не завершённые: Application.stop ждёт только созданные до его вызова,
+        # а обработчик, который дообрабатывается при остановке, тоже отправляет уведомления
+        self._pending_tasks = set()
+        # Идёт остановка (_drain): polling не перезапускать, /health/ready — не готов
+        self.stopping = False
+        self._allowed_updates = None
+
+    async def start_services(self) -> None:
+        for service in self.services:
+            self._service_tasks.append(asyncio.create_task(service(self), name=f"service:{service.__qualname__}"))
+
+    async def stop_services(self) -> None:
+        for task in self._service_tasks:
+            task.cancel()
+        await asyncio.gather(*self._service_tasks, return_exceptions=True)
+        self._service_tasks.clear()
+        for hook in self.stop_hooks:
+            try:
+                await hook(self)
+            except Exception:
+                logger.exception("Ошибка при остановке: %s", hook.__qualname__)
+
+    async def start_polling(self, allowed_updates=None) -> None:
+        self._allowed_updates = allowed_updates
+        await self.updater.start_polling(allowed_updates=allowed_updates)
+
+    async def restart_polling(self, stop_timeout: float = 10.0) -> None:
+        """Перезапустить long polling (сторож health.HealthMonitor): зависший get_updates отменяется."""
+        if self.updater.running:
+            try:
+                await asyncio.wait_for(self.updater.stop(), stop_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("get_updates не завершился за %s с — отменён", stop_timeout)
+        if not self.stopping:
+            await self.updater.start_polling(allowed_updates=self._allowed_updates)
+
+    def create_task(self, coroutine, update=None, *, name=None):
+        with warnings.catch_warnings():
+            if not self.running:
+                # При остановке задачу дождётся _drain — предупреждение PTB об этом не нужно
+                warnings.simplefilter("ignore", PTBUserWarning)
+            task = super().create_task(coroutine, update, name=name)
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+        return task
+
+    async def wait_pending_tasks(self) -> None:
+        """Дождаться задач create_task, в том числе созданных после начала остановки."""
+        while self._pending_tasks:
+            await asyncio.gather(*self._pending_tasks, return_exceptions=True)
+
+    async def process_update(self, update: object) -> None:
+        self.inflight += 1
+        try:
+            for drop in self.update_filters:
+                if await drop(self, update):
+                    return
+            with tracing.update_span(update):
+                await super().process_update(update)
+        finally:
+            self.inflight -= 1
+
+
+async def _stop_app(app) -> None:
+    # Application.stop дообрабатывает очередь и ждёт задачи create_task, созданные до остановки
+    await app.stop()
+    await app.wait_pending_tasks()
+
+
+async def _drain(apps: list, timeout: float, force: asyncio.Event) -> None:
+    """Шаги 1–2 остановки: не принимать новые апдейты и дообработать полученные (не дольше timeout)."""
+    for app in apps:
+        app.stopping = True
+        if app.updater.running:
+            await app.updater.stop()
+    pending = sum(app.update_queue.qsize() + app.inflight for app in apps)
+    if pending:
+        logger.info("Остановка: дообрабатываем апдейтов — %s (не дольше %s с)", pending, timeout)
+    stopping = [asyncio.create_task(_stop_app(app), name="stop:" + app.bot.username) for app in apps if app.running]
+    if not stopping:
+        return
+    stopped = asyncio.gather(*stopping, return_exceptions=True)
+    forced = asyncio.create_task(force.wait())
+    await asyncio.wait([stopped, forced], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    forced.cancel()
+    unfinished = [task for task in stopping if not task.done()]
+    if unfinished:
+        # В очереди остановленного Application — ещё и его метка остановки
+        left = sum(max(app.update_queue.qsize() - 1, 0) + app.inflight for app in apps)
+        logger.warning(
+            "Остановка: не дождались %s бот(ов) (%s), не дообработано апдейтов — %s, задач (уведомлений) — %s",
+            len(unfinished), "повторный сигнал" if force.is_set() else f"прошло {timeout} с", left,
+            sum(len(app._pending_tasks) for app in apps),
+        )
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+    for task in stopping:
+        if task.done() and not task.cancelled() and task.exception():
+            logger.error("Ошибка при остановке бота", exc_info=task.exception())
+
+
+async def _serve(apps: list, allowed_updates, shutdown_timeout: float) -> None:
+    started = []
+    stop, force = asyncio.Event(), asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def on_signal():
+        # Первый сигнал — штатная остановка, повторный — не ждать дообработки
+        (force if stop.is_set() else stop).set()
+
+    try:
+        for app in apps:
+            await app.initialize()
+            await app.start()
+            await app.start_polling(allowed_updates)
+            started.append(app)
+            await app.start_services()
+            logger.info("Бот @%s запущен", app.bot.username)
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, on_signal)
+            except NotImplementedError:  # Windows
+                pass
+        await stop.wait()
+    finally:
+        stop.set()
+        await _drain(started, shutdown_timeout, force)
+        for app in reversed(started):
+            await app.stop_services()
+        for app in apps:
+            await app.shutdown()
+        logger.info("Боты остановлены")
+
+
+def run_polling_all(apps: list, allowed_updates=None, shutdown_timeout: float = 25.0) -> None:
+    """Long polling для всех приложений на одном цикле событий; остановка — по SIGINT/SIGTERM (см. начало модуля)."""
+    try:
+        asyncio.run(_serve(apps, allowed_updates, shutdown_timeout))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Вытеснение простаивающих сессий: context.user_data и состояния ConversationHandler.
+
+PTB хранит user_data и состояние диалога каждого, кто когда-либо писал боту, — за сезон это растёт без
+границ (брошенные reg, висящие диалоги записи). SessionTracker помнит время последней активности
+пользователя и держит кучу сроков (heapq) — не больше одной записи на пользователя, без полных проходов:
+прослойка только обновляет время, а фоновый сервис раз в SESSION_SWEEP_SECONDS снимает с вершины кучи
+истёкшие сроки. Если пользователь с тех пор был активен, срок просто переносится (ленивое удаление).
+
+При вытеснении удаляются user_data и состояния диалогов; если диалог был не завершён, вызывается
+on_expired — бот вежливо сообщает, что сессия истекла.
+"""
+
+import asyncio
+import heapq
+import logging
+import sys
+import time
+from collections.abc import Mapping
+
+from telegram.error import TelegramError
+from telegram.ext import ConversationHandler
+
+logger = logging.getLogger(__name__)
+
+
+class SessionTracker:
+    """Сессии одного бота (клуба).
+
+    on_expired — корутинная функция on_expired(app, user_id, chat_id, states, language_code), states — {имя диалога:
+    состояние} для диалогов, которые были не завершены; language_code — язык клиента для текста уведомления. max_batch — сколько сессий вытесняется за один проход.
+    """
+
+    def __init__(self, ttl: float, sweep_interval: float = 60.0, on_expired=None, max_batch: int = 1000):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.on_expired = on_expired
+        self.max_batch = max_batch
+        # user_id → (время последней активности, chat_id, language_code)
+        self._sessions = {}
+        # (срок, user_id); на каждого пользователя из _sessions — ровно одна запись
+        self._deadlines = []
+        self.evicted = 0
+        self.expired_notices = 0
+
+    # --- Активность (в цикле событий, на каждый апдейт) ---
+    def touch(self, user_id: int, chat_id, language_code: str = None, now: float = None) -> None:
+        now = time.monotonic() if now is None else now
+        if user_id not in self._sessions:
+            heapq.heappush(self._deadlines, (now + self.ttl, user_id))
+        self._sessions[user_id] = (now, chat_id, language_code)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # --- Вытеснение ---
+    def pop_expired(self, now: float = None) -> list:
+        """Снять с кучи истёкшие сессии (не больше max_batch): список (user_id, chat_id, language_code)."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now and len(expired) < self.max_batch:
+            _deadline, user_id = heapq.heappop(deadlines)
+            last_seen, chat_id, language_code = self._sessions[user_id]
+            if last_seen + self.ttl > now:
+                # Был активен после постановки срока — переносим
+                heapq.heappush(deadlines, (last_seen + self.ttl, user_id))
+                continue
+            del self._sessions[user_id]
+            expired.append((user_id, chat_id, language_code))
+        return expired
+
+    async def sweep(self, app, now: float = None) -> int:
+        """Один проход: вытеснить истёкшие сессии приложения, уведомить прерванные диалоги. Возвращает число вытесненных."""
+        expired = self.pop_expired(now)
+        if not expired:
+            return 0
+        conversations = _conversation_handlers(app)
+        notices = []
+        for user_id, chat_id, language_code in expired:
+            states = {}
+            for conv in conversations:
+                key = _conversation_key(conv, chat_id, user_id)
+                state = conv._conversations.pop(key, None) if key is not None else None
+                if state is not None and state != ConversationHandler.END:
+                    states[conv.name] = state
+            app.drop_user_data(user_id)
+            if chat_id == user_id:
+                # Личный чат: chat_data принадлежит этому же пользователю
+                app.drop_chat_data(chat_id)
+            if states and self.on_expired is not None and chat_id is not None:
+                notices.append(self.on_expired(app, user_id, chat_id, states, language_code))
+        self.evicted += len(expired)
+        if notices:
+            results = await asyncio.gather(*notices, return_exceptions=True)
+            for result in results:
+                if isinstance(result, TelegramError):
+                    logger.warning("Не удалось отправить сообщение об истёкшей сессии: %s", result)
+                elif isinstance(result, BaseException):
+                    logger.error("Ошибка в on_expired", exc_info=result)
+                else:
+                    self.expired_notices += 1
+        logger.info(
+            "Вытеснено сессий: %s (прерванных диалогов: %s), активных: %s", len(expired), len(notices), len(self._sessions)
+        )
+        return len(expired)
+
+    async def run_sweeper(self, app) -> None:
+        """Фоновый сервис (см. BotApplication.services): проход раз в sweep_interval секунд."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            while await self.sweep(app) >= self.max_batch:
+                # Накопилось больше пачки — следующую пачку сразу, но отдавая цикл событий апдейтам
+                await asyncio.sleep(0)
+
+    # --- Телеметрия ---
+    def stats(self, app) -> dict:
+        conversations = {conv.name: len(conv._conversations) for conv in _conversation_handlers(app)}
+        return {
+            "sessions": len(self._sessions),
+            "heap": len(self._deadlines),
+            "user_data": len(app.user_data),
+            "chat_data": len(app.chat_data),
+            "user_data_bytes": _approx_size(app.user_data),
+            "conversations": conversations,
+            "evicted": self.evicted,
+            "expired_notices": self.expired_notices,
+        }
+
+    def report(self, app) -> str:
+        s = self.stats(app)
+        rows = [
+            ("активных", s["sessions"]),
+            ("user_data", f"{s['user_data']} (~{s['user_data_bytes'] / 1024:.1f} KiB)"),
+            ("chat_data", s["chat_data"]),
+        ]
+        rows += [(f"диалог {name}", count) for name, count in s["conversations"].items()]
+        rows += [
+            ("сроков в куче", s["heap"]),
+            ("вытеснено всего", s["evicted"]),
+            ("«сессия истекла»", s["expired_notices"]),
+        ]
+        lines = [f"Сессии (TTL {self.ttl / 60:.0f} мин)", ""]
+        lines += [f"{label + ':':<21}{value}" for label, value in rows]
+        return "\n".join(lines)
+
+
+def _conversation_handlers(app) -> list:
+    return [h for handlers in app.handlers.values() for h in handlers if isinstance(h, ConversationHandler)]
+
+
+def _conversation_key(conv: ConversationHandler, chat_id, user_id):
+    """Ключ как у ConversationHandler._get_key; None — ключ зависит от сообщения (per_message), не вытесняем."""
+    if conv.per_message:
+        return None
+    key = []
+    if conv.per_chat:
+        if chat_id is None:
+            return None
+        key.append(chat_id)
+    if conv.per_user:
+        key.append(user_id)
+    return tuple(key)
+
+
+def _approx_size(obj, _depth: int = 0) -> int:
+    """Примерный размер словаря с вложенными dict/list/tuple/str (для телеметрии, не точный учёт)."""
+    size = sys.getsizeof(obj)
+    if _depth > 4:
+        return size
+    if isinstance(obj, Mapping):
+        size += sum(_approx_size(k, _depth + 1) + _approx_size(v, _depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_approx_size(v, _depth + 1) for v in obj)
+    return size
+
+
+async def session_middleware(info, update, context, call_next):
+    """Прослойка (см. middleware.install): отметить активность пользователя перед обработчиком."""
+    sessions = context.bot_data.get("sessions")
+    user = update.effective_user if sessions is not None else None
+    if user is not None:
+        chat = update.effective_chat
+        sessions.touch(user.id, chat.id if chat is not None else None, user.language_code)
+    return await call_next()
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+Настройки процесса: значения по умолчанию (поля Settings) ← config.py ← переменные окружения с теми же
+именами (BOT_TOKEN, HTTP_SERVER_PORT=8080, SLOT_CAPACITY='{"wed_gym": 12}' — JSON для словарей и списков).
+
+load() собирает их один раз в неизменяемый объект (словари — только для чтения, списки — кортежи) и
+проверяет все поля сразу: ошибки — SettingsError со списком всех проблем, а не первая попавшаяся.
+Импорт config.py и этого модуля ничего не проверяет и не читает окружение — bot.py можно импортировать
+в инструментах и бенчмарках; проверка — в main() (и в load(**overrides) у тестов и бенчмарков).
+У клубов — replace(): общие настройки + переопределения из пакета (см. tenants.make_club).
+"""
+
+import dataclasses
+import importlib
+import json
+import os
+import re
+import zoneinfo
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+import routing
+
+_TOKEN_RE = re.compile(r"^\d+:[\w-]{5,}$")
+_PASS_DEBIT_ON = ("booking", "attendance")
+
+
+def _frozen(value: dict):
+    return field(default_factory=lambda: MappingProxyType(dict(value)))
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Все настройки; имена и смысл — как в config.py (там же описания)."""
+
+    # Клуб
+    CLUB_NAME: str = ""
+    CITY: str = ""
+    ADDRESS: str = ""
+    MAP_LINK: str = ""
+    PRICE_SINGLE: str = ""
+    PRICE_TRIAL: str = ""
+    PRICE_PASS: str = ""
+    CONTACT_ADMIN: str = ""
+    SCHEDULE: str = ""
+    PAYMENT_INFO: str = ""
+    MEETING_PLACE: str = ""
+    BOT_TOKEN: str = ""
+    ADMIN_CHAT_ID: int = 0
+    ADMIN_ROUTES: tuple = ()
+    # Логи и трассировка
+    LOG_JSON: bool = True
+    LOG_FILE: str = ""
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    LOG_INFO_SAMPLE_RATE: float = 1.0
+    TRACE_SLOW_MS: float = 1500.0
+    TRACE_BUFFER_SIZE: int = 200
+    TRACE_SLOW_BUFFER_SIZE: int = 50
+    PROFILE_INTERVAL_SECONDS: float = 0.005
+    PROFILE_MAX_SECONDS: float = 300.0
+    # HTTP-клиент Bot API
+    HTTP_POOL_SIZE: int = 32
+    HTTP_POLL_POOL_SIZE: int = 2
+    HTTP_KEEPALIVE_CONNECTIONS: int = 16
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_WRITE_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 3.0
+    HTTP2: bool = False
+    # Данные и фоновые задачи
+    CLUBS_DIR: str = ""
+    FUNNEL_FILE: str = "funnel.json"
+    FUNNEL_FLUSH_SECONDS: float = 60.0
+    SESSION_TTL_SECONDS: float = 3 * 60 * 60.0
+    SESSION_SWEEP_SECONDS: float = 60.0
+    DEDUP_FILE: str = "dedup.json"
+    DEDUP_UPDATE_SECONDS: float = 3600.0
+    DEDUP_CALLBACK_SECONDS: float = 2.0
+    DEDUP_MAX_ENTRIES: int = 5000
+    SHUTDOWN_TIMEOUT_SECONDS: float = 25.0
+    BOOKINGS_DB: str = "bookings.db"
+    BACKUP_DIR: str = "backups"
+    BACKUP_INTERVAL_SECONDS: float = 6 * 60 * 60.0
+    BACKUP_KEEP: int = 28
+    BACKUP_PAGES_PER_STEP: int = 64
+    BACKUP_STEP_PAUSE_SECONDS: float = 0.005
+    ICS_ON_CONFIRM: bool = True
+    ICS_TIMEZONE: str = "Europe/Minsk"
+    HTTP_SERVER_HOST: str = "127.0.0.1"
+    HTTP_SERVER_PORT: int = 0
+    DASHBOARD_DAYS: int = 7
+    DASHBOARD_FEED_SIZE: int = 50
+    POLL_STALL_SECONDS: float = 90.0
+    LOOP_LAG_PROBE_SECONDS: float = 1.0
+    LOOP_LAG_MAX_SECONDS: float = 2.0
+    # Записи, абонементы, посещаемость
+    PASS_SESSIONS: int = 8
+    PASS_DEBIT_ON: str = "booking"
+    START_SOURCES: dict = _frozen({"ref_site": "Сайт", "utm_website": "Сайт (UTM)"})
+    SLOT_CAPACITY: dict = _frozen({})
+    TRAINER_CHAT_IDS: dict = _frozen({})
+    ROSTER_DEBOUNCE_SECONDS: float = 2.0
+
+
+_FIELDS = {f.name: f for f in dataclasses.fields(Settings)}
+
+
+class SettingsError(ValueError):
+    """Ошибки настроек — все сразу (errors), по строке на ошибку."""
+
+    def __init__(self, errors: list):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def load(module: str = "config", environ=None, **overrides) -> Settings:
+    """Собрать настройки: по умолчанию ← module (config.py) ← окружение ← overrides. Ошибки — SettingsError."""
+    environ = os.environ if environ is None else environ
+    values, errors = {}, []
+    try:
+        source = importlib.import_module(module) if module else None
+    except ModuleNotFoundError:
+        source = None
+    for name in dir(source) if source is not None else ():
+        if not name.isupper():
+            continue
+        if name in _FIELDS:
+            values[name] = getattr(source, name)
+        else:
+            errors.append(f"{name}: неизвестная настройка в {module}.py")
+    for name in _FIELDS:
+        if name in environ:
+            try:
+                values[name] = _from_env(_FIELDS[name].type, environ[name])
+            except ValueError:
+                errors.append(f"{name}: не удалось разобрать значение из окружения {environ[name]!r}")
+    values.update(overrides)
+    return _build(values, errors)
+
+
+def replace(base: Settings, **overrides) -> Settings:
+    """Копия base с переопределениями (пакет клуба), с той же проверкой — SettingsError со всеми ошибками."""
+    values = {name: getattr(base, name) for name in _FIELDS}
+    values.update(overrides)
+    return _build(values, [])
+
+
+def _build(values: dict, errors: list) -> Settings:
+    coerced = {}
+    for name, value in values.items():
+        if name not in _FIELDS:
+            errors.append(f"{name}: неизвестная настройка")
+            continue
+        try:
+            coerced[name] = _coerce(_FIELDS[name].type, value)
+        except (TypeError, ValueError):
+            # Дальше проверяется со значением по умолчанию — чтобы показать и остальные ошибки
+            errors.append(f"{name}: ожидается {_FIELDS[name].type.__name__}, получено {value!r}")
+    try:
+        coerced["TRAINER_CHAT_IDS"] = MappingProxyType(
+            {int(chat_id): name for chat_id, name in coerced.get("TRAINER_CHAT_IDS", {}).items()}
+        )
+    except ValueError:
+        errors.append("TRAINER_CHAT_IDS: ключи — chat_id (числа)")
+    settings = Settings(**coerced)
+    errors.extend(validate(settings))
+    if errors:
+        raise SettingsError(errors)
+    return settings
+
+
+def _coerce(kind: type, value):
+    """Значение из config.py, пакета клуба (JSON) или окружения → тип поля (словари и списки — неизменяемые)."""
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise TypeError
+        return value
+    if kind is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError
+        return value
+    if kind is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError
+        return float(value)
+    if kind is str:
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            raise TypeError
+        return value
+    if kind is dict:
+        if not isinstance(value, (dict, MappingProxyType)):
+            raise TypeError
+        return MappingProxyType(dict(value))
+    if kind is tuple:
+        if not isinstance(value, (list, tuple)):
+            raise TypeError
+        return tuple(MappingProxyType(dict(item)) if isinstance(item, dict) else item for item in value)
+    raise TypeError
+
+
+def _from_env(kind: type, raw: str):
+    """Строка из окружения → значение (словари и списки — JSON). Не разбирается — ValueError."""
+    if kind is str:
+        return raw
+    if kind is bool:
+        if raw.strip().lower() in ("1", "true", "yes", "on"):
+            return True
+        if raw.strip().lower() in ("0", "false", "no", "off", ""):
+            return False
+        raise ValueError(raw)
+    if kind is int:
+        return int(raw)
+    if kind is float:
+        return float(raw)
+    return json.loads(raw)
+
+
+# --- Проверка значений (типы уже приведены) ---
+def validate(s: Settings) -> list:
+    errors = []
+
+    def check(ok: bool, message: str) -> None:
+        if not ok:
+            errors.append(message)
+
+    if not s.CLUBS_DIR:
+        check(bool(s.BOT_TOKEN), "BOT_TOKEN: не задан (переменная окружения BOT_TOKEN или config.py)")
+    if s.BOT_TOKEN:
+        check(bool(_TOKEN_RE.match(s.BOT_TOKEN)), "BOT_TOKEN: не похож на токен от @BotFather (число:строка)")
+    check(not s.MAP_LINK or s.MAP_LINK.startswith(("http://", "https://")), "MAP_LINK: нужна ссылка http(s)://")
+    routes_ok = True
+    for rule in s.ADMIN_ROUTES:
+        if not isinstance(rule, MappingProxyType):
+            errors.append(f"ADMIN_ROUTES: правило — словарь, получено {rule!r}")
+            routes_ok = False
+            continue
+        try:
+            routing.parse_rule(rule)
+        except (TypeError, ValueError) as e:
+            errors.append(str(e) if str(e).startswith("ADMIN_ROUTES") else f"ADMIN_ROUTES: {e}")
+            routes_ok = False
+    # У нескольких клубов адресаты — свои в каждом пакете (проверяет tenants.make_club)
+    if routes_ok and not s.CLUBS_DIR:
+        errors.extend(staff_errors(s))
+
+    check(0.0 <= s.LOG_INFO_SAMPLE_RATE <= 1.0, "LOG_INFO_SAMPLE_RATE: доля от 0 до 1")
+    for name in ("LOG_MAX_BYTES", "TRACE_BUFFER_SIZE", "TRACE_SLOW_BUFFER_SIZE", "HTTP_POOL_SIZE",
+                 "HTTP_POLL_POOL_SIZE", "DEDUP_MAX_ENTRIES", "BACKUP_KEEP", "BACKUP_PAGES_PER_STEP", "PASS_SESSIONS",
+                 "DASHBOARD_DAYS", "DASHBOARD_FEED_SIZE"):
+        check(getattr(s, name) > 0, f"{name}: должно быть больше 0")
+    for name in ("LOG_BACKUP_COUNT", "HTTP_KEEPALIVE_CONNECTIONS"):
+        check(getattr(s, name) >= 0, f"{name}: не может быть отрицательным")
+    for name, field_ in _FIELDS.items():
+        if field_.type is float and (name.endswith(("_SECONDS", "_TIMEOUT", "_EXPIRY")) or name == "TRACE_SLOW_MS"):
+            check(getattr(s, name) > 0, f"{name}: должно быть больше 0")
+    check(0 <= s.HTTP_SERVER_PORT <= 65535, "HTTP_SERVER_PORT: порт от 0 до 65535")
+    check(s.POLL_STALL_SECONDS > 10, "POLL_STALL_SECONDS: должно быть больше таймаута long polling (10 с)")
+    check(s.PASS_DEBIT_ON in _PASS_DEBIT_ON, f"PASS_DEBIT_ON: одно из {', '.join(_PASS_DEBIT_ON)}")
+    check(_known_timezone(s.ICS_TIMEZONE), f"ICS_TIMEZONE: неизвестный часовой пояс {s.ICS_TIMEZONE!r} (вида Europe/Minsk)")
+
+    check(all(isinstance(k, str) and isinstance(v, str) and v for k, v in s.START_SOURCES.items()),
+          "START_SOURCES: метка → подпись (строки)")
+    check(all(isinstance(k, str) and isinstance(v, int) and not isinstance(v, bool) and v > 0
+              for k, v in s.SLOT_CAPACITY.items()),
+          "SLOT_CAPACITY: slot_id → число мест больше 0")
+    check(all(isinstance(v, str) and v for v in s.TRAINER_CHAT_IDS.values()),
+          "TRAINER_CHAT_IDS: chat_id → имя тренера, как в записи")
+    return errors
+
+
+def staff_errors(s: Settings) -> list:
+    """Без ADMIN_CHAT_ID сообщение персоналу, не подошедшее ни к одному правилу ADMIN_ROUTES, молча никуда
+    не уходит: ошибка, если так будет хотя бы с одним видом сообщений."""
+    if s.ADMIN_CHAT_ID:
+        return []
+    lost = routing.uncovered_kinds(s.ADMIN_ROUTES)
+    if not lost:
+        return []
+    return [f"ADMIN_CHAT_ID: не задан (узнать — /myid), а ADMIN_ROUTES не покрывают {', '.join(lost)} "
+            "для всех слотов и тренеров — эти сообщения персоналу никто не получит"]
+
+
+def _known_timezone(name: str) -> bool:
+    try:
+        zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Источники переходов: метка из ссылки t.me/<бот>?start=<метка> (deep link).
+
+Метки — реестр START_SOURCES в config.py (метка → подпись для админа). Неизвестная метка учитывается как
+OTHER (сырые значения не копятся — их может прислать кто угодно), /start без метки — DIRECT.
+Метка хранится у пользователя и попадает в запись и форму админу; счётчики «запуски → записи» ведёт
+storage.BookingStore (source_stats), здесь — разбор и отчёт /sources.
+"""
+
+import re
+
+DIRECT = "direct"
+OTHER = "other"
+
+# Что Telegram допускает в параметре start
+_PAYLOAD = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_LABELS = {DIRECT: "без метки", OTHER: "неизвестная метка"}
+
+
+def parse_start(args, registry) -> str:
+    """Аргументы /start (context.args) → метка из реестра, DIRECT или OTHER."""
+    if not args:
+        return DIRECT
+    payload = args[0]
+    if not _PAYLOAD.match(payload):
+        return OTHER
+    return payload if payload in registry else OTHER
+
+
+def label(source, registry) -> str:
+    if source is None:
+        return "—"
+    return registry.get(source) or _LABELS.get(source, source)
+
+
+def report(rows: list, registry) -> str:
+    """Отчёт /sources: rows — storage.BookingStore.source_stats."""
+    lines = ["Источники (/start → записи)", "", "Метка                  запуски  польз.  записи   конв."]
+    total_starts = total_bookings = 0
+    for source, starts, users, bookings in rows:
+        conversion = f"{bookings * 100 // users}%" if users else "—"
+        lines.append(f"{label(source, registry)[:22]:<22} {starts:>7} {users:>7} {bookings:>7} {conversion:>6}")
+        total_starts += starts
+        total_bookings += bookings
+    lines += ["", f"Всего: запусков {total_starts}, записей {total_bookings}"]
+    lines.append("Конверсия — записи на пользователя, пришедшего по метке.")
+    return "\n".join(lines)
@@ -0,0 +1,535 @@
+# -*- coding: utf-8 -*-
+"""
+Хранилище подтверждённых записей на тренировки (SQLite, модуль sqlite3 из стандартной библиотеки).
+
+Одна строка — одно нажатие «✅ Да» в reg_confirm: кто, на какой слот, к какому тренеру и на какую дату
+(ближайший день недели слота). Запись в базу идёт в отдельном потоке (asyncio.to_thread), чтобы не
+задерживать цикл событий. Чтение для выгрузки (export.py) — отдельным соединением и курсором, который
+отдаёт строки пачками: в памяти одновременно не больше одной пачки, сколько бы записей ни было за сезон.
+Журнал WAL: выгрузка не блокирует новые записи.
+
+Абонементы: остаток занятий хранится готовым числом в строке пользователя (passes), а каждое
+начисление и списание — строкой журнала (pass_ledger). Остаток меняется в той же транзакции, что и
+журнал (и запись на тренировку, если занятие списывается при записи), и не бывает меньше нуля (CHECK).
+
+Посещаемость: bookings.attended (NULL — не отмечено, 1 — пришёл, 0 — не пришёл) и готовые счётчики
+по пользователю (attendance_stats) — меняются вместе одной транзакцией на пачку отметок (см. roster.py).
+
+Записи пользователя (/mybookings): индекс bookings (user_id, session_date) — ближайшие тренировки
+находятся поиском по индексу, сколько бы записей ни было в истории. Отмена (bookings.cancelled_at)
+освобождает место и возвращает занятие на абонемент; перенос проверяет свободные места на новой
+тренировке (capacity) и меняет запись — каждое действие одной транзакцией под блокировкой записи.
+
+Источники (/start с меткой, см. sources.py): метка пользователя — user_sources, она же попадает в запись
+(bookings.source). Счётчики по меткам (source_stats: запуски, пользователи, записи) увеличиваются в тех же
+транзакциях, что и сами события, — отчёт читает готовые числа, а не пересчитывает историю.
+"""
+
+import asyncio
+import datetime
+import logging
+import pathlib
+import sqlite3
+import threading
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    session_date TEXT NOT NULL,
+    day TEXT NOT NULL,
+    slot_id TEXT NOT NULL,
+    time TEXT NOT NULL,
+    trainer TEXT NOT NULL,
+    level TEXT NOT NULL,
+    location TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    name TEXT NOT NULL,
+    contact TEXT NOT NULL,
+    lang TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bookings_session_date ON bookings (session_date);
+CREATE INDEX IF NOT EXISTS bookings_slot ON bookings (slot_id, session_date);
+CREATE INDEX IF NOT EXISTS bookings_trainer ON bookings (trainer, session_date);
+CREATE INDEX IF NOT EXISTS bookings_user ON bookings (user_id, session_date);
+CREATE TABLE IF NOT EXISTS passes (
+    user_id INTEGER PRIMARY KEY,
+    remaining INTEGER NOT NULL CHECK (remaining >= 0),
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pass_ledger (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    delta INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    booking_id INTEGER,
+    admin_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS pass_ledger_user ON pass_ledger (user_id, id);
+CREATE TABLE IF NOT EXISTS user_sources (
+    user_id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_stats (
+    source TEXT PRIMARY KEY,
+    starts INTEGER NOT NULL DEFAULT 0,
+    users INTEGER NOT NULL DEFAULT 0,
+    bookings INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS attendance_stats (
+    user_id INTEGER PRIMARY KEY,
+    attended INTEGER NOT NULL DEFAULT 0,
+    no_show INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Столбцы, добавленные в bookings после первой версии схемы: имя → определение (ALTER TABLE при открытии)
+_BOOKINGS_ADDED_COLUMNS = {"attended": "INTEGER", "cancelled_at": "TEXT", "source": "TEXT"}
+
+# Причины движения по абонементу (pass_ledger.reason)
+PASS_PURCHASE, PASS_BOOKING, PASS_ATTENDANCE, PASS_ADJUST, PASS_REFUND = (
+    "purchase", "booking", "attendance", "adjust", "refund",
+)
+
+
+class PassError(Exception):
+    """Операция с абонементом невозможна (нет абонемента или не хватает занятий)."""
+
+
+class BookingError(Exception):
+    """Запись не найдена, чужая, уже отменена или тренировка уже прошла."""
+
+
+class SlotFullError(BookingError):
+    """На тренировке не осталось свободных мест."""
+
+
+class Booking(NamedTuple):
+    """Подтверждённая запись. Подписи (тренер, уровень) — на языке бота по умолчанию, как в форме админу."""
+
+    created_at: str
+    session_date: str
+    day: str
+    slot_id: str
+    time: str
+    trainer: str
+    level: str
+    location: str
+    user_id: int
+    username: str
+    name: str
+    contact: str
+    lang: str
+
+
+COLUMNS = ("id",) + Booking._fields + tuple(_BOOKINGS_ADDED_COLUMNS)
+
+
+def next_session_date(day: str, time_range: str, now: datetime.datetime) -> datetime.date:
+    """Ближайшая дата тренировки в этот день недели; сегодняшняя — если она ещё не началась."""
+    days_ahead = (WEEKDAYS[day] - now.weekday()) % 7
+    if days_ahead == 0:
+        try:
+            start = datetime.datetime.strptime(time_range.split("–", 1)[0].strip(), "%H:%M").time()
+        except ValueError:
+            start = datetime.time.max
+        if now.time() >= start:
+            days_ahead = 7
+    return now.date() + datetime.timedelta(days=days_ahead)
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+class BookingStore:
+    """Записи одного бота (клуба) в файле path.
+
+    Запись — одно соединение на весь процесс, вызовы сериализуются блокировкой (к ним обращаются из потоков
+    to_thread). Выгрузка — своё соединение на каждый вызов iter_bookings.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(bookings)")}
+        for column, definition in _BOOKINGS_ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE bookings ADD COLUMN {column} {definition}")
+        conn.commit()
+        self._conn = conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def close_on_stop(self, app) -> None:
+        await asyncio.to_thread(self.close)
+
+    # --- Запись ---
+    def insert(self, booking: Booking, debit_pass: bool = False, capacity: int = None, source: str = None) -> tuple:
+        """Сохранить запись; с debit_pass — в той же транзакции списать занятие, если есть абонемент.
+
+        capacity — мест на тренировке (None — без ограничения); мест нет — SlotFullError.
+        source — метка, с которой пришёл пользователь (в запись и в счётчик записей source_stats).
+        Возвращает (id записи, остаток абонемента после списания или None — не списывали).
+        """
+        columns = Booking._fields + ("source",)
+        placeholders = ", ".join("?" * len(columns))
+        with self._lock, self._conn:
+            self._check_capacity(booking.slot_id, booking.session_date, capacity)
+            booking_id = self._conn.execute(
+                f"INSERT INTO bookings ({', '.join(columns)}) VALUES ({placeholders})", (*booking, source)
+            ).lastrowid
+            if source is not None:
+                self._count_source(source, bookings=1)
+            remaining = None
+            if debit_pass:
+                remaining = self._change_pass(booking.user_id, -1, PASS_BOOKING, booking_id=booking_id, required=False)
+        return booking_id, remaining
+
+    async def add(self, booking: Booking, debit_pass: bool = False, capacity: int = None, source: str = None) -> tuple:
+        """Сохранить запись (в потоке), см. insert."""
+        return await asyncio.to_thread(self.insert, booking, debit_pass, capacity, source)
+
+    def _check_capacity(self, slot_id: str, session_date: str, capacity) -> None:
+        """Внутри открытой транзакции: мест не осталось — SlotFullError (подсчёт — по индексу слота)."""
+        if capacity is None:
+            return
+        taken = self._conn.execute(
+            "SELECT COUNT(*) FROM bookings WHERE slot_id = ? AND session_date = ? AND cancelled_at IS NULL",
+            (slot_id, session_date),
+        ).fetchone()[0]
+        if taken >= capacity:
+            raise SlotFullError(f"Нет мест: {slot_id} {session_date}")
+
+    # --- Записи пользователя: список, отмена, перенос (вызывать в потоке) ---
+    def upcoming(self, user_id: int, date_from: str, limit: int = 10) -> list:
+        """Действующие записи пользователя с даты date_from: [(id, Booking)], ближайшие первыми."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(Booking._fields)} FROM bookings "
+                "WHERE user_id = ? AND session_date >= ? AND cancelled_at IS NULL ORDER BY session_date, id LIMIT ?",
+                (user_id, date_from, limit),
+            ).fetchall()
+        return [(row[0], Booking(*row[1:])) for row in rows]
+
+    def _active_booking(self, booking_id: int, user_id: int, date_from: str) -> Booking:
+        """Внутри открытой транзакции: запись пользователя, которую ещё можно отменить или перенести."""
+        row = self._conn.execute(
+            f"SELECT {', '.join(Booking._fields)} FROM bookings "
+            "WHERE id = ? AND user_id = ? AND session_date >= ? AND cancelled_at IS NULL",
+            (booking_id, user_id, date_from),
+        ).fetchone()
+        if row is None:
+            raise BookingError(f"Запись {booking_id} пользователя {user_id} недоступна")
+        return Booking(*row)
+
+    def cancel(self, booking_id: int, user_id: int, date_from: str) -> tuple:
+        """Отменить запись: место освобождается, списанное при записи занятие возвращается на абонемент.
+
+        Возвращает (отменённая Booking, остаток абонемента после возврата или None — не списывали).
+        """
+        with self._lock, self._conn:
+            booking = self._active_booking(booking_id, user_id, date_from)
+            self._conn.execute("UPDATE bookings SET cancelled_at = ? WHERE id = ?", (_now(), booking_id))
+            remaining = None
+            if self._debited(booking_id):
+                remaining = self._change_pass(user_id, 1, PASS_REFUND, booking_id=booking_id)
+        return booking, remaining
+
+    def reschedule(self, booking_id: int, user_id: int, date_from: str, capacity: int = None, **changes) -> tuple:
+        """Перенести запись на другую тренировку: changes — новые session_date, day, slot_id, time, trainer, location.
+
+        Место на новой тренировке занимается в той же транзакции (мест нет — SlotFullError, запись не меняется).
+        Возвращает (Booking до переноса, Booking после).
+        """
+        unknown = set(changes) - {"session_date", "day", "slot_id", "time", "trainer", "location"}
+        if unknown:
+            raise ValueError(f"Нельзя изменить при переносе: {', '.join(sorted(unknown))}")
+        with self._lock, self._conn:
+            old = self._active_booking(booking_id, user_id, date_from)
+            new = old._replace(**changes)
+            if (new.slot_id, new.session_date) != (old.slot_id, old.session_date):
+                self._check_capacity(new.slot_id, new.session_date, capacity)
+            self._conn.execute(
+                f"UPDATE bookings SET {', '.join(f'{column} = ?' for column in changes)} WHERE id = ?",
+                (*changes.values(), booking_id),
+            )
+        return old, new
+
+    # --- Абонементы (вызывать в потоке: asyncio.to_thread) ---
+    def credit(self, user_id: int, sessions: int, reason: str = PASS_PURCHASE, admin_id: int = None) -> int:
+        """Начислить (или при sessions < 0 — снять) занятия. Возвращает новый остаток; ниже нуля — PassError."""
+        with self._lock, self._conn:
+            return self._change_pass(user_id, sessions, reason, admin_id=admin_id)
+
+    def balance(self, user_id: int):
+        """Остаток занятий или None — абонемента не было."""
+        with self._lock:
+            row = self._conn.execute("SELECT remaining FROM passes WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def _change_pass(self, user_id: int, delta: int, reason: str, booking_id: int = None, admin_id: int = None,
+                     required: bool = True):
+        """Изменить остаток и записать журнал (внутри уже открытой транзакции).
+
+        required=False — нет абонемента или занятий не осталось: ничего не менять, вернуть None.
+        """
+        now = _now()
+        if delta > 0:
+            self._conn.execute(
+                "INSERT INTO passes (user_id, remaining, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET remaining = remaining + excluded.remaining, "
+                "updated_at = excluded.updated_at",
+                (user_id, delta, now),
+            )
+        else:
+            cursor = self._conn.execute(
+                "UPDATE passes SET remaining = remaining + ?, updated_at = ? WHERE user_id = ? AND remaining + ? >= 0",
+                (delta, now, user_id, delta),
+            )
+            if cursor.rowcount == 0:
+                if not required:
+                    return None
+                raise PassError(f"Недостаточно занятий на абонементе у {user_id}")
+        remaining = self._conn.execute("SELECT remaining FROM passes WHERE user_id = ?", (user_id,)).fetchone()[0]
+        self._conn.execute(
+            "INSERT INTO pass_ledger (created_at, user_id, delta, reason, booking_id, admin_id) VALUES (?, ?, ?, ?, ?, ?)",
+            (now, user_id, delta, reason, booking_id, admin_id),
+        )
+        return remaining
+
+    def _debited(self, booking_id: int) -> int:
+        """Внутри открытой транзакции: сколько занятий списано за запись (за вычетом возвратов)."""
+        return -self._conn.execute(
+            "SELECT COALESCE(SUM(delta), 0) FROM pass_ledger WHERE booking_id = ?", (booking_id,)
+        ).fetchone()[0]
+
+    # --- Источники (вызывать в потоке) ---
+    def record_start(self, user_id: int, source: str, direct: str) -> str:
+        """Учесть /start с меткой source; direct — метка «без метки», она не перезаписывает прежнюю.
+
+        Возвращает метку пользователя после учёта (её и переносить в запись).
+        """
+        with self._lock, self._conn:
+            self._count_source(source, starts=1)
+            row = self._conn.execute("SELECT source FROM user_sources WHERE user_id = ?", (user_id,)).fetchone()
+            current = row[0] if row else None
+            if current == source or (source == direct and current is not None):
+                return current
+            self._conn.execute(
+                "INSERT INTO user_sources (user_id, source, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET source = excluded.source, updated_at = excluded.updated_at",
+                (user_id, source, _now()),
+            )
+            self._count_source(source, users=1)
+        return source
+
+    def user_source(self, user_id: int):
+        """Метка пользователя или None — /start с учётом меток он не нажимал."""
+        with self._lock:
+            row = self._conn.execute("SELECT source FROM user_sources WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def source_stats(self) -> list:
+        """Счётчики по меткам: [(source, запусков, пользователей, записей)], больше записей — первыми."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source, starts, users, bookings FROM source_stats ORDER BY bookings DESC, starts DESC, source"
+            ).fetchall()
+
+    def _count_source(self, source: str, starts: int = 0, users: int = 0, bookings: int = 0) -> None:
+        """Внутри открытой транзакции: прибавить к счётчикам метки."""
+        self._conn.execute(
+            "INSERT INTO source_stats (source, starts, users, bookings) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (source) DO UPDATE SET starts = starts + excluded.starts, users = users + excluded.users, "
+            "bookings = bookings + excluded.bookings",
+            (source, starts, users, bookings),
+        )
+
+    # --- Посещаемость (вызывать в потоке) ---
+    def sessions_between(self, date_from: str, date_to: str, trainer: str = None) -> list:
+        """Тренировки с записями за период: [(session_date, slot_id, записей, отмечено)], по дате и слоту."""
+        sql = (
+            "SELECT session_date, slot_id, COUNT(*), COUNT(attended) FROM bookings "
+            "WHERE session_date BETWEEN ? AND ? AND cancelled_at IS NULL"
+        )
+        params = [date_from, date_to]
+        if trainer is not None:
+            sql += " AND trainer = ?"
+            params.append(trainer)
+        sql += " GROUP BY session_date, slot_id ORDER BY session_date, slot_id"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def session_counts(self, date_from: str, date_to: str) -> list:
+        """Записи на тренировки периода по тренеру и уровню: [(session_date, slot_id, trainer, level, записей)]."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT session_date, slot_id, trainer, level, COUNT(*) FROM bookings "
+                "WHERE session_date BETWEEN ? AND ? AND cancelled_at IS NULL "
+                "GROUP BY session_date, slot_id, trainer, level ORDER BY session_date, slot_id",
+                (date_from, date_to),
+            ).fetchall()
+
+    def roster(self, slot_id: str, session_date: str) -> list:
+        """Записавшиеся на тренировку: [(id, user_id, name, username, attended, пропусков всего)], по имени."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT b.id, b.user_id, b.name, b.username, b.attended, COALESCE(s.no_show, 0) "
+                "FROM bookings b LEFT JOIN attendance_stats s ON s.user_id = b.user_id "
+                "WHERE b.slot_id = ? AND b.session_date = ? AND b.cancelled_at IS NULL ORDER BY b.name, b.id",
+                (slot_id, session_date),
+            ).fetchall()
+
+    def apply_attendance(self, marks: dict, debit_pass: bool = False) -> int:
+        """Пачка отметок {booking_id: 1 | 0 | None} одной транзакцией, со счётчиками пользователей.
+
+        debit_pass (PASS_DEBIT_ON = "attendance") — в той же транзакции списать занятие за «пришёл» и вернуть
+        его, если отметку сняли. Возвращает число изменённых записей.
+        """
+        if not marks:
+            return 0
+        with self._lock, self._conn:
+            ids = list(marks)
+            placeholders = ", ".join("?" * len(ids))
+            rows = self._conn.execute(
+                f"SELECT id, user_id, attended FROM bookings WHERE id IN ({placeholders})", ids
+            ).fetchall()
+            changes = [(booking_id, user_id, old, marks[booking_id]) for booking_id, user_id, old in rows]
+            return self._set_attendance(changes, debit_pass)
+
+    def mark_attended(self, user_id: int, session_date: str, debit_pass: bool = False, admin_id: int = None) -> tuple:
+        """Отметить «пришёл» запись пользователя на дату (/attended; как нажатие в /roster, с тем же списанием).
+
+        Отмечается первая действующая запись этой даты, ещё не отмеченная «пришёл». Возвращает (её id или
+        None — все записи этой даты уже отмечены, остаток абонемента после списания или None — не списано).
+        Записи нет — BookingError.
+        """
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, attended FROM bookings WHERE user_id = ? AND session_date = ? AND cancelled_at IS NULL "
+                "ORDER BY id",
+                (user_id, session_date),
+            ).fetchall()
+            if not rows:
+                raise BookingError(f"Нет записи {user_id} на {session_date}")
+            booking_id, old = next(((booking_id, old) for booking_id, old in rows if old != 1), (None, None))
+            if booking_id is None:
+                return None, None
+            self._set_attendance([(booking_id, user_id, old, 1)], debit_pass, admin_id)
+            if not (debit_pass and self._debited(booking_id)):
+                return booking_id, None
+            return booking_id, self._conn.execute("SELECT remaining FROM passes WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def close_session(self, slot_id: str, session_date: str) -> int:
+        """Завершить отметку: всех неотмеченных на тренировке считать не пришедшими. Возвращает их число."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, user_id FROM bookings "
+                "WHERE slot_id = ? AND session_date = ? AND attended IS NULL AND cancelled_at IS NULL",
+                (slot_id, session_date),
+            ).fetchall()
+            return self._set_attendance([(booking_id, user_id, None, 0) for booking_id, user_id in rows])
+
+    def no_show_stats(self, limit: int = 20) -> list:
+        """Пользователи с пропусками: [(user_id, имя, пришёл, не пришёл)], больше всего пропусков — первыми."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT s.user_id, (SELECT name FROM bookings WHERE user_id = s.user_id ORDER BY id DESC LIMIT 1), "
+                "s.attended, s.no_show FROM attendance_stats s WHERE s.no_show > 0 "
+                "ORDER BY s.no_show DESC, s.attended LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def _set_attendance(self, changes: list, debit_pass: bool = False, admin_id: int = None) -> int:
+        """changes — [(booking_id, user_id, было, стало)]; внутри открытой транзакции.
+
+        debit_pass — «пришёл» списывает занятие (если есть абонемент и за запись ещё не списано), снятая
+        отметка «пришёл» его возвращает: журнал абонемента всегда совпадает с отметками.
+        """
+        changes = [change for change in changes if change[2] != change[3]]
+        if not changes:
+            return 0
+        if debit_pass:
+            for booking_id, user_id, old, new in changes:
+                if new == 1 and not self._debited(booking_id):
+                    self._change_pass(user_id, -1, PASS_ATTENDANCE, booking_id=booking_id, admin_id=admin_id,
+                                      required=False)
+                elif old == 1 and self._debited(booking_id):
+                    self._change_pass(user_id, 1, PASS_REFUND, booking_id=booking_id, admin_id=admin_id)
+        self._conn.executemany(
+            "UPDATE bookings SET attended = ? WHERE id = ?", [(new, booking_id) for booking_id, _, _, new in changes]
+        )
+        # Счётчики меняются на разницу «было → стало», без пересчёта по истории
+        deltas = {}
+        for _booking_id, user_id, old, new in changes:
+            attended, no_show = deltas.get(user_id, (0, 0))
+            deltas[user_id] = (attended + (new == 1) - (old == 1), no_show + (new == 0) - (old == 0))
+        self._conn.executemany(
+            "INSERT INTO attendance_stats (user_id, attended, no_show) VALUES (?, ?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET attended = attended + excluded.attended, "
+            "no_show = no_show + excluded.no_show",
+            [(user_id, attended, no_show) for user_id, (attended, no_show) in deltas.items()],
+        )
+        return len(changes)
+
+    # --- Чтение ---
+    def recent(self, limit: int = 50) -> list:
+        """Последние limit записей (и отменённые): [(Booking, отменена ли)], от старой к новой."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(Booking._fields)}, cancelled_at IS NOT NULL FROM bookings ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [(Booking(*row[:-1]), bool(row[-1])) for row in reversed(rows)]
+
+    def iter_bookings(self, slot_id=None, trainer=None, date_from=None, date_to=None, cancelled: bool = False,
+                      batch_size: int = 500):
+        """Записи по фильтрам (даты — session_date включительно, ГГГГ-ММ-ДД), по порядку даты тренировки.
+
+        Только действующие; cancelled=True — и отменённые (для сверки, столбец cancelled_at).
+        Генератор кортежей в порядке COLUMNS; строки читаются курсором пачками по batch_size.
+        """
+        where, params = ([], []) if cancelled else (["cancelled_at IS NULL"], [])
+        for column, op, value in (
+            ("slot_id", "=", slot_id),
+            ("trainer", "=", trainer),
+            ("session_date", ">=", date_from),
+            ("session_date", "<=", date_to),
+        ):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(str(value))
+        sql = f"SELECT {', '.join(COLUMNS)} FROM bookings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY session_date, slot_id, id"
+        conn = sqlite3.connect(pathlib.Path(self.path).absolute().as_uri() + "?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Несколько клубов (ботов) в одном процессе.
+
+Клуб = токен + настройки (settings.Settings с переопределениями) + контент (расписание, слоты, тексты цен).
+Пакеты клубов — JSON-файлы в каталоге config.CLUBS_DIR, по одному на клуб:
+
+    {
+        "bot_token_env": "BOT_TOKEN_CADENCE",
+        "config": {"CLUB_NAME": "Беговой клуб CADENCE", "ADMIN_CHAT_ID": 265416708},
+        "content": {"PRICE_TEXT_MAKSIM_DASHA": "💰 Цены ..."}
+    }
+
+Токен в файл не пишется — только имя переменной окружения. Всё, что не переопределено, берётся из общих
+значений по умолчанию по ссылке: одинаковые тексты и таблицы у разных клубов — один объект в памяти.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from types import MappingProxyType, SimpleNamespace
+
+import settings
+import storage
+
+# Что клуб может переопределить в настройках (остальное — общее для процесса: логи, HTTP и т.п.)
+CONFIG_KEYS = (
+    "CLUB_NAME",
+    "CITY",
+    "ADDRESS",
+    "MAP_LINK",
+    "PRICE_SINGLE",
+    "PRICE_TRIAL",
+    "PRICE_PASS",
+    "CONTACT_ADMIN",
+    "SCHEDULE",
+    "ADMIN_CHAT_ID",
+    "ADMIN_ROUTES",
+    "PAYMENT_INFO",
+    "MEETING_PLACE",
+    "ICS_TIMEZONE",
+    "PASS_SESSIONS",
+    "PASS_DEBIT_ON",
+    "SLOT_CAPACITY",
+    "START_SOURCES",
+    "TRAINER_CHAT_IDS",
+)
+
+# Контент клуба: сетка слотов и тексты
+CONTENT_KEYS = (
+    "SLOTS_BY_DAY",
+    "SLOT_TO_LABEL",
+    "SLOT_TO_ADDRESS_TYPE",
+    "SLOT_TO_TIME",
+    "SLOT_TO_TRAINER",
+    "LOCATION_SHORT",
+    "SCHEDULE_FULL",
+    "PRICE_TEXT_MAKSIM_DASHA",
+    "VITALIK_INFO_TEXT",
+    "FINAL_CONFIRM_FOOTER",
+)
+
+# Тексты (строки); остальные ключи контента — таблицы (словари)
+_TEXT_KEYS = ("SCHEDULE_FULL", "PRICE_TEXT_MAKSIM_DASHA", "VITALIK_INFO_TEXT", "FINAL_CONFIRM_FOOTER")
+
+_SLOT_ID_RE = re.compile(r"^[a-z_]+$")
+
+# Таблицы slot_id → значение: каждый слот из SLOTS_BY_DAY должен в них быть
+_SLOT_TABLES = ("SLOT_TO_LABEL", "SLOT_TO_ADDRESS_TYPE", "SLOT_TO_TIME")
+
+
+@dataclass(frozen=True)
+class Club:
+    """Один клуб: id (имя файла пакета), токен бота, настройки и контент (атрибуты с именами как в config.py / bot.py).
+
+    overridden — ключи контента, заданные в пакете клуба (их не заменяет перевод по умолчанию, см. localized_content).
+    """
+
+    club_id: str
+    token: str
+    cfg: settings.Settings
+    content: SimpleNamespace
+    overridden: frozenset = frozenset()
+
+
+class _SharedValues:
+    """Пул неизменяемых значений: равные тексты/таблицы разных клубов хранятся одним объектом."""
+
+    def __init__(self):
+        self._by_key = {}
+
+    def share(self, value):
+        key = json.dumps(value, ensure_ascii=False, sort_keys=True, default=dict)
+        return self._by_key.setdefault(key, value)
+
+
+_shared = _SharedValues()
+
+
+def _freeze_content(name: str, value):
+    """JSON → те же типы, что у констант в bot.py: словари только для чтения, слоты — кортежи."""
+    if name == "SLOTS_BY_DAY" and isinstance(value, dict):
+        value = {day: [tuple(slot) for slot in slots] for day, slots in value.items()}
+    if isinstance(value, dict):
+        return MappingProxyType(value)
+    return value
+
+
+def _content_errors(content: dict) -> tuple:
+    """Ошибки контента (все сразу) и slot_id сетки (None — SLOTS_BY_DAY не разобрать)."""
+    errors = []
+    for name in CONTENT_KEYS:
+        value = content[name]
+        expected = str if name in _TEXT_KEYS else (dict, MappingProxyType)
+        if not isinstance(value, expected):
+            errors.append(f"{name} — неверный тип ({type(value).__name__})")
+    if not isinstance(content["SLOTS_BY_DAY"], (dict, MappingProxyType)):
+        return errors, None
+    try:
+        slot_ids = [slot_id for slots in content["SLOTS_BY_DAY"].values() for slot_id, _label in slots]
+    except (TypeError, ValueError):
+        errors.append("SLOTS_BY_DAY: день → [[slot_id, подпись], …]")
+        return errors, None
+    # Дни и slot_id приходят обратно в callback_data (reg:day:<день>, reg:slot:<slot_id>)
+    unknown_days = [day for day in content["SLOTS_BY_DAY"] if day not in storage.WEEKDAYS]
+    if unknown_days:
+        errors.append(f"SLOTS_BY_DAY: неизвестные дни {', '.join(map(str, unknown_days))} "
+                      f"(дни — {', '.join(storage.WEEKDAYS)})")
+    if not slot_ids:
+        errors.append("SLOTS_BY_DAY: нет ни одного слота")
+    bad_ids = [str(slot_id) for slot_id in slot_ids if not isinstance(slot_id, str) or not _SLOT_ID_RE.match(slot_id)]
+    if bad_ids:
+        errors.append(f"SLOTS_BY_DAY: slot_id — латиница в нижнем регистре и «_»: {', '.join(bad_ids)}")
+        return errors, None
+    repeated = sorted({slot_id for slot_id in slot_ids if slot_ids.count(slot_id) > 1})
+    if repeated:
+        errors.append(f"SLOTS_BY_DAY: слоты в нескольких днях {', '.join(repeated)}")
+    for table in _SLOT_TABLES:
+        if not isinstance(content[table], (dict, MappingProxyType)):
+            continue
+        missing = [slot_id for slot_id in slot_ids if slot_id not in content[table]]
+        if missing:
+            errors.append(f"в {table} нет слотов {', '.join(missing)}")
+    return errors, slot_ids
+
+
+def _validate_content(club_id: str, content: dict) -> None:
+    errors, _slot_ids = _content_errors(content)
+    if errors:
+        raise settings.SettingsError([f"Клуб {club_id}: {error}" for error in errors])
+
+
+def _cfg_errors(cfg: settings.Settings, slot_ids) -> list:
+    """Настройки, которые ссылаются на слоты, — против сетки слотов клуба; адресаты персонала."""
+    errors = settings.staff_errors(cfg)
+    if slot_ids is None:
+        return errors
+    errors += [f"SLOT_CAPACITY: нет слота {slot_id}" for slot_id in cfg.SLOT_CAPACITY if slot_id not in slot_ids]
+    for rule in cfg.ADMIN_ROUTES:
+        value = rule.get("slot_id", ())
+        errors += [f"ADMIN_ROUTES: нет слота {slot_id}" for slot_id in (value if isinstance(value, (list, tuple)) else [value])
+                   if slot_id not in slot_ids]
+    return errors
+
+
+def make_club(club_id: str, token: str, base_cfg: settings.Settings, base_content: dict, cfg_overrides=None,
+              content_overrides=None) -> Club:
+    """Собрать клуб: общие настройки и контент + переопределения.
+
+    Неизвестные ключи и неверные значения — settings.SettingsError со всеми ошибками пакета сразу.
+    """
+    cfg_overrides = cfg_overrides or {}
+    content_overrides = content_overrides or {}
+    errors = []
+    unknown = sorted(set(cfg_overrides) - set(CONFIG_KEYS)) + sorted(set(content_overrides) - set(CONTENT_KEYS))
+    if unknown:
+        errors.append(f"неизвестные ключи {', '.join(unknown)}")
+
+    try:
+        cfg = settings.replace(base_cfg, BOT_TOKEN=token,
+                               **{name: value for name, value in cfg_overrides.items() if name in CONFIG_KEYS})
+    except settings.SettingsError as e:
+        errors += e.errors
+        cfg = None
+
+    content = {name: _shared.share(base_content[name]) for name in CONTENT_KEYS}
+    for name, value in content_overrides.items():
+        if name in CONTENT_KEYS:
+            content[name] = _shared.share(_freeze_content(name, value))
+    content_errors, slot_ids = _content_errors(content)
+    errors += content_errors
+    if cfg is not None:
+        errors += _cfg_errors(cfg, slot_ids)
+    if errors:
+        raise settings.SettingsError([f"Клуб {club_id}: {error}" for error in errors])
+    return Club(
+        club_id=club_id,
+        token=token,
+        cfg=cfg,
+        content=SimpleNamespace(**content),
+        overridden=frozenset(content_overrides),
+    )
+
+
+def localized_content(club: Club, translated: dict) -> SimpleNamespace:
+    """Контент клуба на другом языке: переведённые значения по умолчанию там, где клуб их не переопределял."""
+    content = dict(vars(club.content))
+    for name, value in translated.items():
+        if name not in club.overridden:
+            content[name] = _shared.share(_freeze_content(name, value))
+    _validate_content(club.club_id, content)
+    return SimpleNamespace(**content)
+
+
+def club_path(path: str, club: Club) -> str:
+    """Файл данных клуба: funnel.json → funnel.<club_id>.json (у клуба по умолчанию — без изменений)."""
+    if not path or club.club_id == "default":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{club.club_id}{ext}"
+
+
+def load_clubs(clubs_dir: str, base_cfg: settings.Settings, base_content: dict) -> list:
+    """Все пакеты *.json из каталога (по имени файла). Ошибки всех пакетов — одна settings.SettingsError."""
+    for value in base_content.values():
+        _shared.share(value)
+    clubs, errors = [], []
+    for filename in sorted(os.listdir(clubs_dir)):
+        if not filename.endswith(".json"):
+            continue
+        club_id = filename[: -len(".json")]
+        try:
+            with open(os.path.join(clubs_dir, filename), encoding="utf-8") as f:
+                bundle = json.load(f)
+        except ValueError as e:
+            errors.append(f"Клуб {club_id}: {filename} — не JSON ({e})")
+            continue
+        token_env = bundle.get("bot_token_env", "")
+        token = os.getenv(token_env) if token_env else None
+        if not token:
+            errors.append(f"Клуб {club_id}: не найден токен в переменной окружения {token_env or '(bot_token_env не задан)'}")
+            continue
+        try:
+            clubs.append(make_club(club_id, token, base_cfg, base_content, bundle.get("config"), bundle.get("content")))
+        except settings.SettingsError as e:
+            errors += e.errors
+    if errors:
+        raise settings.SettingsError(errors)
+    return clubs
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Лёгкая трассировка апдейтов: корневой спан на апдейт, дочерние — на обработчик и на каждый запрос к Bot API.
+
+Готовые трассы лежат в кольцевом буфере в памяти. Апдейт дольше порога (TRACE_SLOW_MS) пишется в лог
+целиком, с деревом спанов, и попадает в отдельный буфер медленных — его отдаёт админ-команда /slow.
+"""
+
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from telegram.request import HTTPXRequest
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar = ContextVar("current_span", default=None)
+
+
+class Span:
+    """Участок работы: имя, время начала/конца (perf_counter), атрибуты и дочерние спаны."""
+
+    __slots__ = ("name", "attrs", "start", "end", "children", "error")
+
+    def __init__(self, name: str, /, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+        self.error = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def render(self, indent: int = 0) -> str:
+        """Дерево спанов текстом: отступ — вложенность, справа — длительность."""
+        attrs = " ".join(f"{k}={v}" for k, v in self.attrs.items() if v is not None)
+        line = f"{'  ' * indent}{self.name}"
+        if attrs:
+            line += f" {attrs}"
+        line += f" — {self.duration_ms:.1f} ms"
+        if self.error:
+            line += f" ! {self.error}"
+        return "\n".join([line] + [child.render(indent + 1) for child in self.children])
+
+
+class TraceStore:
+    """Кольцевые буферы: последние трассы и последние медленные трассы."""
+
+    def __init__(self, size: int = 200, slow_size: int = 50, slow_ms: float = 1500.0):
+        self.slow_ms = slow_ms
+        self.recent = deque(maxlen=size)
+        self.slow = deque(maxlen=slow_size)
+
+    def configure(self, size: int, slow_size: int, slow_ms: float) -> None:
+        self.slow_ms = slow_ms
+        self.recent = deque(self.recent, maxlen=size)
+        self.slow = deque(self.slow, maxlen=slow_size)
+
+    def add(self, root: Span) -> None:
+        self.recent.append(root)
+        if root.duration_ms >= self.slow_ms:
+            self.slow.append(root)
+            logger.warning("Медленный апдейт (%.0f ms):\n%s", root.duration_ms, root.render())
+
+    def last_slow(self, n: int) -> list:
+        return list(self.slow)[-n:] if n > 0 else []
+
+
+store = TraceStore()
+
+
+@contextmanager
+def span(name: str, /, **attrs):
+    """Дочерний спан текущего. Вне апдейта (нет корневого спана) ничего не записывает."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, **attrs)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        child.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+@contextmanager
+def update_span(update):
+    """Корневой спан апдейта. По завершении трасса уходит в store."""
+    user = getattr(update, "effective_user", None)
+    root = Span("update", update_id=getattr(update, "update_id", None), user_id=user.id if user else None)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = type(e).__name__
+        raise
+    finally:
+        root.end = time.perf_counter()
+        _current_span.reset(token)
+        store.add(root)
+
+
+async def tracing_middleware(info, update, context, call_next):
+    """Прослойка (см. middleware.install): спан на вызов обработчика."""
+    with span("handler", name=info.name, conversation=info.conversation):
+        return await call_next()
+
+
+class TracedRequest(HTTPXRequest):
+    """HTTPXRequest, который открывает спан на каждый запрос к Bot API (имя метода — из URL)."""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs):
+        with span("api", method=url.rsplit("/", 1)[-1]):
+            return await super().do_request(url, method, *args, **kwargs)